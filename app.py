@@ -1,18 +1,33 @@
-from flask import Flask, render_template, request, jsonify, session, g
+from flask import Flask, render_template, request, jsonify, session, g, redirect, url_for, Response
 from flask_cors import CORS
-from sudoku_solver import SudokuSolver
-import json
-import socket
+from sudoku_solver import BOARD_SIZES, SearchLimitReached, get_solver
+from sudoku_variants import VARIANTS, get_variant_solver, generate_variant_puzzle, generate_variant_puzzle_with_seed
+from request_profiler import RequestProfiler
+from leaderboard import create_leaderboard
+from serializers import board_response, wants_compact, dumps
+from realtime import RaceHub, Subscriber
+from puzzle_packs import PuzzlePacks, MAX_PACK_SIZE
+from daily_calendar import DailyCalendar
+from solve_cache import SolveCache
+from stats_rollup import StatsRollup
+from static_assets import StaticAssets
+
+from event_log import (EventLog, claim_worker_directory, EVENT_NEW_GAME, EVENT_MOVE, EVENT_UNDO,
+                       EVENT_REDO, EVENT_HINT, EVENT_COMPLETION, EVENT_STATS)
 import os
+import hmac
+import json
 from datetime import timedelta, datetime, date
 import time
 import logging
+import threading
 import uuid
 from functools import wraps
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (dotenv is only imported when there is a .env to read)
+if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')) or os.path.exists('.env'):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 app = Flask(__name__)
 
@@ -34,6 +49,9 @@ def add_security_headers(response):
 CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
 CORS(app, origins=CORS_ORIGINS)
 
+# Fingerprinted, precompressed static files (built by python static_assets.py)
+static_assets = StaticAssets(app)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,13 +59,76 @@ logger = logging.getLogger(__name__)
 # Game state storage (in production, use Redis or database)
 game_states = {}
 user_stats = {}
-daily_puzzles = {}
+
+# Held around each logged change and its log_event(), and by the event log
+# while it snapshots game_states and user_stats, so no change is both in a
+# snapshot and replayed from the log after it
+state_lock = threading.Lock()
 
 # Initialize solver
-sudoku_solver = SudokuSolver()
+sudoku_solver = get_solver(9)
+
+# Node cap for /api/solve on 9x9 boards that stray from the stored solution
+SOLVE_MAX_NODES = int(os.environ.get('SOLVE_MAX_NODES', 50000))
+
+def solve_node_budget(size):
+    """Nodes per solve for a board size; a node costs about cells / 81 times a 9x9 one"""
+    return SOLVE_MAX_NODES * 81 // (size * size)
+
+# Solutions keyed by canonical board, shared by symmetric copies of a puzzle
+solve_cache = SolveCache(max_entries=int(os.environ.get('SOLVE_CACHE_SIZE', 4096)))
+
+# Streaming completion stats: percentile sketches and hourly rollups (per worker)
+stats_rollup = StatsRollup(retention_hours=int(os.environ.get('STATS_RETENTION_HOURS', 48)))
+
+# Leaderboard index (LEADERBOARD_BACKEND=redis shares it across workers)
+leaderboard = create_leaderboard()
+
+# Daily puzzles prepared ahead (DAILY_CALENDAR_DIR shares them across workers)
+daily_calendar = DailyCalendar(
+    sudoku_solver,
+    days_ahead=int(os.environ.get('DAILY_DAYS_AHEAD', 7)),
+    archive_days=int(os.environ.get('DAILY_ARCHIVE_DAYS', 365)),
+    directory=os.environ.get('DAILY_CALENDAR_DIR') or None
+)
+
+# Offline puzzle packs
+puzzle_packs = PuzzlePacks(sudoku_solver, pool_size=int(os.environ.get('PUZZLE_PACK_POOL', 100)))
+
+# Multiplayer race rooms (per worker)
+race_hub = RaceHub(tick=float(os.environ.get('RACE_BROADCAST_INTERVAL', 0.1)))
+
+# Sampling profiler (disabled unless PROFILE_SAMPLE_RATE or PROFILE_SLOW_MS is set)
+request_profiler = RequestProfiler.from_env()
+
+@app.before_request
+def start_request_profile():
+    g.profile, g.profile_sampled = request_profiler.start()
+    g.profile_start = time.perf_counter()
+
+@app.after_request
+def finish_request_profile(response):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        route = request.url_rule.rule if request.url_rule else request.path
+        request_profiler.finish(profile, g.profile_sampled, route, time.perf_counter() - g.profile_start)
+    return response
+
+def require_admin(f):
+    """Require the ADMIN_TOKEN in the X-Admin-Token header"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        admin_token = os.environ.get('ADMIN_TOKEN')
+        supplied = request.headers.get('X-Admin-Token', '')
+        if not admin_token or not hmac.compare_digest(supplied.encode(), admin_token.encode()):
+            return jsonify({'success': False, 'error': 'Forbidden'}), 403
+        return f(*args, **kwargs)
+    return decorated
 
 def get_local_ip():
     """Get the local IP address of this computer"""
+    import socket  # Only used by the __main__ banner
+    
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
@@ -82,19 +163,348 @@ def get_user_stats(user_id):
 
 def save_user_stats(user_id, stats):
     """Save user statistics"""
-    user_stats[user_id] = stats
+    with state_lock:
+        user_stats[user_id] = stats
+        log_event(EVENT_STATS, {'user_id': user_id, 'stats': stats})
 
-def get_daily_puzzle(date_str):
-    """Get or generate daily puzzle for a specific date"""
-    if date_str not in daily_puzzles:
-        # Generate puzzle with consistent seed based on date
-        puzzle, solution = sudoku_solver.generate_puzzle_with_seed(date_str, 'medium')
-        daily_puzzles[date_str] = {
-            'puzzle': puzzle,
-            'solution': solution,
-            'difficulty': 'medium'
+def difficulty_key(difficulty, size=9, variant=None):
+    """Key for per-difficulty times; other board sizes and variants are ranked separately"""
+    key = difficulty if size == 9 else f'{difficulty}:{size}x{size}'
+    return f'{key}:{variant}' if variant else key
+
+def game_difficulty_key(game_state):
+    """difficulty_key() of a game"""
+    variant = game_state.get('variant')
+    return difficulty_key(game_state['difficulty'], len(game_state['puzzle']),
+                          variant['name'] if variant else None)
+
+def get_game_solver(game_state):
+    """The solver for a game's board size, or its variant's rules"""
+    variant = game_state.get('variant')
+    return get_variant_solver(variant) if variant else get_solver(len(game_state['puzzle']))
+
+def record_leaderboard_time(game_state, time_taken):
+    """Add a completed game to its difficulty board (and daily board)"""
+    user_id = game_state['user_id']
+    name = f"Player {user_id[:8]}"
+    key = game_difficulty_key(game_state)
+    leaderboard.submit(f"difficulty:{key}", user_id, time_taken, name)
+    if game_state['game_mode'] == 'daily':
+        leaderboard.submit(f"daily:{game_state['daily_date']}", user_id, time_taken, name)
+
+def record_completion_stats(game_state, time_taken):
+    """Feed a completed game into the streaming stats"""
+    stats_rollup.record_completion(
+        game_difficulty_key(game_state),
+        time_taken,
+        hints_used=game_state['hints_used'],
+        notes_used=game_state['notes_used'],
+        timestamp=game_state['start_time'] + time_taken
+    )
+
+def create_game_state(game_id, user_id, game_mode, difficulty, puzzle, solution, start_time,
+                      daily_date=None, race_id=None, variant=None):
+    """Create the in-memory state for a new game"""
+    game_state = {
+        'game_id': game_id,
+        'user_id': user_id,
+        'game_mode': game_mode,
+        'difficulty': difficulty,
+        'puzzle': puzzle,
+        'solution': solution,
+        'current_board': [row[:] for row in puzzle],
+        'notes': [[[] for _ in puzzle] for _ in puzzle],
+        'moves_history': [],
+        'redo_stack': [],
+        'start_time': start_time,
+        'hints_used': 0,
+        'notes_used': 0,
+        'is_completed': False
+    }
+    if daily_date:
+        game_state['daily_date'] = daily_date
+    if race_id:
+        game_state['race_id'] = race_id
+    if variant:
+        game_state['variant'] = variant
+    return game_state
+
+def apply_move(game_state, row, col, value, move_type, timestamp):
+    """Apply a move to the board and record it in the history"""
+    old_value = game_state['current_board'][row][col]
+    old_notes = game_state['notes'][row][col][:] if move_type == 'note' else []
+    
+    move = {
+        'row': row,
+        'col': col,
+        'old_value': old_value,
+        'new_value': value,
+        'old_notes': old_notes,
+        'move_type': move_type,
+        'timestamp': timestamp
+    }
+    
+    game_state['moves_history'].append(move)
+    game_state['redo_stack'].clear()  # Clear redo stack on new move
+    
+    if move_type == 'number':
+        game_state['current_board'][row][col] = value
+    elif move_type == 'note':
+        game_state['notes_used'] += 1
+        if value in game_state['notes'][row][col]:
+            game_state['notes'][row][col].remove(value)
+        else:
+            game_state['notes'][row][col].append(value)
+            game_state['notes'][row][col].sort()
+    
+    return move
+
+def apply_undo(game_state):
+    """Revert the last move and push it on the redo stack"""
+    last_move = game_state['moves_history'].pop()
+    game_state['redo_stack'].append(last_move)
+    
+    row, col = last_move['row'], last_move['col']
+    if last_move['move_type'] == 'number':
+        game_state['current_board'][row][col] = last_move['old_value']
+    elif last_move['move_type'] == 'note':
+        game_state['notes'][row][col] = last_move['old_notes'][:]
+    
+    return last_move
+
+def apply_redo(game_state):
+    """Re-apply the last undone move"""
+    move_to_redo = game_state['redo_stack'].pop()
+    game_state['moves_history'].append(move_to_redo)
+    
+    row, col = move_to_redo['row'], move_to_redo['col']
+    if move_to_redo['move_type'] == 'number':
+        game_state['current_board'][row][col] = move_to_redo['new_value']
+    elif move_to_redo['move_type'] == 'note':
+        game_state['notes'][row][col] = move_to_redo['new_notes'] if 'new_notes' in move_to_redo else [move_to_redo['new_value']]
+    
+    return move_to_redo
+
+def apply_event(state, event_type, data, timestamp):
+    """Replay one logged event onto a recovered state"""
+    if event_type == EVENT_NEW_GAME:
+        state['game_states'][data['game_id']] = create_game_state(**data)
+        return
+    if event_type == EVENT_STATS:
+        state['user_stats'][data['user_id']] = data['stats']
+        return
+    
+    game_state = state['game_states'].get(data['game_id'])
+    if game_state is None:
+        return
+    
+    if event_type == EVENT_MOVE:
+        apply_move(game_state, data['row'], data['col'], data['value'], data['move_type'], timestamp)
+    elif event_type == EVENT_UNDO and game_state['moves_history']:
+        apply_undo(game_state)
+    elif event_type == EVENT_REDO and game_state['redo_stack']:
+        apply_redo(game_state)
+    elif event_type == EVENT_HINT:
+        game_state['hints_used'] += 1
+    elif event_type == EVENT_COMPLETION:
+        game_state['is_completed'] = True
+        game_state['completion_time'] = data['time_taken']
+
+# Durable event log (disabled unless EVENT_LOG_DIR is set)
+event_log = None
+
+def log_event(event_type, data, timestamp=None):
+    """Queue an event for the write-behind log"""
+    if event_log is not None:
+        event_log.append(event_type, data, timestamp)
+
+def init_event_log():
+    """Recover state from the event log and start the background writer"""
+    global event_log
+    log_dir = os.environ.get('EVENT_LOG_DIR')
+    if not log_dir:
+        return
+    
+    # Each worker owns one worker-<n> subdirectory, so a restart restores
+    # every game into exactly one process instead of copying it into all
+    event_log = EventLog(
+        claim_worker_directory(log_dir),
+        apply_event,
+        flush_interval=float(os.environ.get('EVENT_LOG_FLUSH_INTERVAL', 1.0)),
+        snapshot_interval=float(os.environ.get('EVENT_LOG_SNAPSHOT_INTERVAL', 300)),
+        capture_state=lambda: dumps({'game_states': game_states, 'user_stats': user_stats}),
+        state_lock=state_lock
+    )
+    state, recovery = event_log.recover()
+    game_states.update(state['game_states'])
+    user_stats.update(state['user_stats'])
+    for game_state in game_states.values():
+        if game_state.get('completion_time') is not None:
+            record_leaderboard_time(game_state, game_state['completion_time'])
+            record_completion_stats(game_state, game_state['completion_time'])
+    logger.info(f"Recovered {len(game_states)} games and {len(user_stats)} users "
+                f"from {recovery['events_replayed']} events in {recovery['seconds']}s")
+    event_log.start()
+
+def start_game(game_mode, difficulty, puzzle, solution, daily_date=None, race_id=None, variant=None):
+    """Register a new game for the current user and build the new-game response"""
+    game_data = {
+        'game_id': str(uuid.uuid4()),
+        'user_id': get_user_id(),
+        'game_mode': game_mode,
+        'difficulty': difficulty,
+        'puzzle': puzzle,
+        'solution': solution,
+        'start_time': time.time(),
+        'daily_date': daily_date,
+        'race_id': race_id,
+        'variant': variant
+    }
+    game_id = game_data['game_id']
+    with state_lock:
+        game_states[game_id] = create_game_state(**game_data)
+        log_event(EVENT_NEW_GAME, game_data)
+    
+    # Calculate puzzle statistics
+    empty_cells = sum(1 for row in puzzle for cell in row if cell == 0)
+    total_cells = len(puzzle) * len(puzzle)
+    
+    response = {
+        'success': True,
+        'game_id': game_id,
+        'puzzle': puzzle,
+        'solution': solution,
+        'difficulty': difficulty,
+        'size': len(puzzle),
+        'game_mode': game_mode,
+        'stats': {
+            'empty_cells': empty_cells,
+            'filled_cells': total_cells - empty_cells,
+            'completion_percentage': round(((total_cells - empty_cells) / total_cells) * 100, 1)
         }
-    return daily_puzzles[date_str]
+    }
+    if variant:
+        # Jigsaw regions and killer cages the client needs to draw the board
+        response['variant'] = variant
+    return response
+
+def update_race_progress(game_state, is_complete=False):
+    """Report a race player's board to their race room"""
+    if game_state.get('race_id'):
+        race_hub.update_progress(game_state['race_id'], game_state['user_id'],
+                                 game_state['current_board'], is_complete)
+
+def is_int(*values):
+    """True if every value is a plain int (JSON floats and booleans are not)"""
+    return all(type(value) is int for value in values)
+
+def process_move(game_id, row, col, value, move_type):
+    """
+    Validate and apply a move, then handle completion
+    Returns: (result, error) where error is a message for rejected moves
+    """
+    if not game_id or game_id not in game_states:
+        return None, 'Invalid game ID'
+    
+    game_state = game_states[game_id]
+    size = len(game_state['puzzle'])
+    
+    # Validate move (before anything touches the board or the event log,
+    # whose records pack these as small integers)
+    if not is_int(row, col) or row < 0 or row >= size or col < 0 or col >= size:
+        return None, 'Invalid cell position'
+    
+    if not is_int(value) or value < 0 or value > size:
+        return None, 'Invalid value'
+    
+    # Check if cell is original
+    if game_state['puzzle'][row][col] != 0:
+        return None, 'Cannot modify original cells'
+    
+    if move_type not in ('number', 'note'):
+        return None, 'Invalid move type'
+    
+    # Apply move and save it to history
+    timestamp = time.time()
+    with state_lock:
+        move = apply_move(game_state, row, col, value, move_type, timestamp)
+        log_event(EVENT_MOVE, {'game_id': game_id, 'row': row, 'col': col,
+                               'value': value, 'move_type': move_type}, timestamp)
+    
+    # Check for completion
+    solver = get_game_solver(game_state)
+    is_complete = solver.is_complete(game_state['current_board'])
+    is_valid = solver.is_valid_board(game_state['current_board'])
+    
+    if is_complete and is_valid:
+        if not game_state['is_completed']:
+            time_taken = round(time.time() - game_state['start_time'], 2)
+            with state_lock:
+                game_state['completion_time'] = time_taken
+                log_event(EVENT_COMPLETION, {'game_id': game_id, 'time_taken': time_taken})
+            record_leaderboard_time(game_state, time_taken)
+            record_completion_stats(game_state, time_taken)
+        game_state['is_completed'] = True
+        # Update user stats
+        user_id = game_state['user_id']
+        stats = get_user_stats(user_id)
+        stats['total_games'] += 1
+        stats['completed_games'] += 1
+        stats['last_played'] = datetime.now().isoformat()
+        save_user_stats(user_id, stats)
+    
+    update_race_progress(game_state, is_complete and is_valid)
+    
+    return {'game_state': game_state, 'move': move, 'is_complete': is_complete, 'is_valid': is_valid}, None
+
+def process_undo(game_id):
+    """
+    Undo the last move of a game
+    Returns: (result, error)
+    """
+    if not game_id or game_id not in game_states:
+        return None, 'Invalid game ID'
+    
+    game_state = game_states[game_id]
+    
+    if not game_state['moves_history']:
+        return None, 'No moves to undo'
+    
+    with state_lock:
+        last_move = apply_undo(game_state)
+        log_event(EVENT_UNDO, {'game_id': game_id})
+    update_race_progress(game_state)
+    
+    return {'game_state': game_state, 'move': last_move}, None
+
+def process_redo(game_id):
+    """
+    Redo the last undone move of a game
+    Returns: (result, error)
+    """
+    if not game_id or game_id not in game_states:
+        return None, 'Invalid game ID'
+    
+    game_state = game_states[game_id]
+    
+    if not game_state['redo_stack']:
+        return None, 'No moves to redo'
+    
+    with state_lock:
+        move_to_redo = apply_redo(game_state)
+        log_event(EVENT_REDO, {'game_id': game_id})
+    update_race_progress(game_state)
+    
+    return {'game_state': game_state, 'move': move_to_redo}, None
+
+def get_daily_puzzle(date_str):
+    """Get the daily puzzle for a specific date from the calendar"""
+    puzzle, solution, difficulty = daily_calendar.get_puzzle(date_str)
+    return {
+        'puzzle': puzzle,
+        'solution': solution,
+        'difficulty': difficulty
+    }
 
 @app.route('/')
 def index():
@@ -112,8 +522,10 @@ def new_game():
         game_mode = data.get('game_mode', 'classic')
         difficulty = data.get('difficulty', 'medium')
         seed = data.get('seed', None)
+        pack_id = data.get('pack_id')
+        size = data.get('size', 9)
         
-        valid_modes = ['classic', 'time_attack', 'zen', 'daily']
+        valid_modes = ['classic', 'time_attack', 'zen', 'daily', *VARIANTS]
         valid_difficulties = ['easy', 'medium', 'hard', 'expert']
         
         if game_mode not in valid_modes:
@@ -122,58 +534,41 @@ def new_game():
         if difficulty not in valid_difficulties:
             return jsonify({'success': False, 'error': 'Invalid difficulty level'}), 400
         
+        if size not in BOARD_SIZES:
+            return jsonify({'success': False, 'error': f'Size must be one of {sorted(BOARD_SIZES)}'}), 400
+        
+        if game_mode in VARIANTS and size != 9:
+            return jsonify({'success': False, 'error': 'Variants are only played on 9x9 boards'}), 400
+        
         # Generate puzzle based on mode
+        today = None
+        variant = None
         if game_mode == 'daily':
             today = date.today().isoformat()
             puzzle_data = get_daily_puzzle(today)
             puzzle = puzzle_data['puzzle']
             solution = puzzle_data['solution']
             difficulty = puzzle_data['difficulty']
+        elif game_mode in VARIANTS:
+            if seed:
+                puzzle, solution, variant = generate_variant_puzzle_with_seed(game_mode, seed, difficulty)
+            else:
+                puzzle, solution, variant = generate_variant_puzzle(game_mode, difficulty)
+        elif pack_id:
+            # Puzzle dealt by the client from a prefetched pack
+            pack_puzzle = puzzle_packs.get_puzzle(pack_id, data.get('pack_index'))
+            if pack_puzzle is None:
+                return jsonify({'success': False, 'error': 'Invalid puzzle pack'}), 400
+            puzzle, solution, difficulty = pack_puzzle
         else:
+            solver = get_solver(size)
             if seed:
-                puzzle, solution = sudoku_solver.generate_puzzle_with_seed(seed, difficulty)
+                puzzle, solution = solver.generate_puzzle_with_seed(seed, difficulty)
             else:
-                puzzle, solution = sudoku_solver.generate_puzzle(difficulty)
+                # Isomorphic copy of a graded seed puzzle (constant time for 9x9)
+                puzzle, solution = solver.generate_from_seeds(difficulty)
         
-        # Calculate puzzle statistics
-        empty_cells = sum(1 for row in puzzle for cell in row if cell == 0)
-        total_cells = 81
-        
-        # Create game state
-        user_id = get_user_id()
-        game_id = str(uuid.uuid4())
-        game_state = {
-            'game_id': game_id,
-            'user_id': user_id,
-            'game_mode': game_mode,
-            'difficulty': difficulty,
-            'puzzle': puzzle,
-            'solution': solution,
-            'current_board': [row[:] for row in puzzle],
-            'notes': [[[] for _ in range(9)] for _ in range(9)],
-            'moves_history': [],
-            'redo_stack': [],
-            'start_time': time.time(),
-            'hints_used': 0,
-            'notes_used': 0,
-            'is_completed': False
-        }
-        
-        game_states[game_id] = game_state
-        
-        return jsonify({
-            'success': True,
-            'game_id': game_id,
-            'puzzle': puzzle,
-            'solution': solution,
-            'difficulty': difficulty,
-            'game_mode': game_mode,
-            'stats': {
-                'empty_cells': empty_cells,
-                'filled_cells': total_cells - empty_cells,
-                'completion_percentage': round(((total_cells - empty_cells) / total_cells) * 100, 1)
-            }
-        })
+        return jsonify(start_game(game_mode, difficulty, puzzle, solution, daily_date=today, variant=variant))
     except Exception as e:
         logger.error(f"Error generating new game: {str(e)}")
         return jsonify({
@@ -186,77 +581,25 @@ def make_move():
     """Make a move in the game with undo/redo support"""
     try:
         data = request.get_json()
-        game_id = data.get('game_id')
-        row = data.get('row')
-        col = data.get('col')
-        value = data.get('value')
-        move_type = data.get('move_type', 'number')  # 'number' or 'note'
+        result, error = process_move(
+            data.get('game_id'),
+            data.get('row'),
+            data.get('col'),
+            data.get('value'),
+            data.get('move_type', 'number')  # 'number' or 'note'
+        )
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
-        if not game_id or game_id not in game_states:
-            return jsonify({'success': False, 'error': 'Invalid game ID'}), 400
-        
-        game_state = game_states[game_id]
-        
-        # Validate move
-        if row < 0 or row >= 9 or col < 0 or col >= 9:
-            return jsonify({'success': False, 'error': 'Invalid cell position'}), 400
-        
-        if value < 0 or value > 9:
-            return jsonify({'success': False, 'error': 'Invalid value'}), 400
-        
-        # Check if cell is original
-        if game_state['puzzle'][row][col] != 0:
-            return jsonify({'success': False, 'error': 'Cannot modify original cells'}), 400
-        
-        # Save move to history
-        old_value = game_state['current_board'][row][col]
-        old_notes = game_state['notes'][row][col][:] if move_type == 'note' else []
-        
-        move = {
-            'row': row,
-            'col': col,
-            'old_value': old_value,
-            'new_value': value,
-            'old_notes': old_notes,
-            'move_type': move_type,
-            'timestamp': time.time()
-        }
-        
-        game_state['moves_history'].append(move)
-        game_state['redo_stack'].clear()  # Clear redo stack on new move
-        
-        # Apply move
-        if move_type == 'number':
-            game_state['current_board'][row][col] = value
-        elif move_type == 'note':
-            if value in game_state['notes'][row][col]:
-                game_state['notes'][row][col].remove(value)
-            else:
-                game_state['notes'][row][col].append(value)
-                game_state['notes'][row][col].sort()
-        
-        # Check for completion
-        is_complete = sudoku_solver.is_complete(game_state['current_board'])
-        is_valid = sudoku_solver.is_valid_board(game_state['current_board'])
-        
-        if is_complete and is_valid:
-            game_state['is_completed'] = True
-            # Update user stats
-            user_id = game_state['user_id']
-            stats = get_user_stats(user_id)
-            stats['total_games'] += 1
-            stats['completed_games'] += 1
-            stats['last_played'] = datetime.now().isoformat()
-            save_user_stats(user_id, stats)
-        
-        return jsonify({
+        game_state = result['game_state']
+        return board_response({
             'success': True,
-            'move': move,
-            'is_complete': is_complete,
-            'is_valid': is_valid,
+            'move': result['move'],
+            'is_complete': result['is_complete'],
+            'is_valid': result['is_valid'],
             'current_board': game_state['current_board'],
             'notes': game_state['notes']
-        })
+        }, wants_compact(request))
     except Exception as e:
         logger.error(f"Error making move: {str(e)}")
         return jsonify({
@@ -269,35 +612,17 @@ def undo_move():
     """Undo the last move"""
     try:
         data = request.get_json()
-        game_id = data.get('game_id')
-        
-        if not game_id or game_id not in game_states:
-            return jsonify({'success': False, 'error': 'Invalid game ID'}), 400
-        
-        game_state = game_states[game_id]
+        result, error = process_undo(data.get('game_id'))
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
-        if not game_state['moves_history']:
-            return jsonify({'success': False, 'error': 'No moves to undo'}), 400
-        
-        # Get last move
-        last_move = game_state['moves_history'].pop()
-        
-        # Add to redo stack
-        game_state['redo_stack'].append(last_move)
-        
-        # Undo the move
-        row, col = last_move['row'], last_move['col']
-        if last_move['move_type'] == 'number':
-            game_state['current_board'][row][col] = last_move['old_value']
-        elif last_move['move_type'] == 'note':
-            game_state['notes'][row][col] = last_move['old_notes'][:]
-        
-        return jsonify({
+        game_state = result['game_state']
+        return board_response({
             'success': True,
-            'undone_move': last_move,
+            'undone_move': result['move'],
             'current_board': game_state['current_board'],
             'notes': game_state['notes']
-        })
+        }, wants_compact(request))
     except Exception as e:
         logger.error(f"Error undoing move: {str(e)}")
         return jsonify({
@@ -310,42 +635,245 @@ def redo_move():
     """Redo the last undone move"""
     try:
         data = request.get_json()
-        game_id = data.get('game_id')
+        result, error = process_redo(data.get('game_id'))
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
-        if not game_id or game_id not in game_states:
-            return jsonify({'success': False, 'error': 'Invalid game ID'}), 400
+        game_state = result['game_state']
+        return board_response({
+            'success': True,
+            'redone_move': result['move'],
+            'current_board': game_state['current_board'],
+            'notes': game_state['notes']
+        }, wants_compact(request))
+    except Exception as e:
+        logger.error(f"Error redoing move: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to redo move. Please try again.'
+        }), 500
+
+def handle_channel_message(game_id, raw):
+    """
+    Handle one message from the game channel
+    Returns: the serialized ack or error to send back
+    """
+    seq = None
+    try:
+        message = json.loads(raw)
+        seq = message.get('seq')
+        message_type = message.get('type')
         
-        game_state = game_states[game_id]
+        if message_type == 'move':
+            result, error = process_move(game_id, message.get('row'), message.get('col'),
+                                         message.get('value'), message.get('move_type', 'number'))
+        elif message_type == 'undo':
+            result, error = process_undo(game_id)
+        elif message_type == 'redo':
+            result, error = process_redo(game_id)
+        elif message_type == 'ping':
+            return dumps({'type': 'pong', 'seq': seq}).decode('utf-8')
+        else:
+            result, error = None, 'Unknown message type'
+        
+        if error:
+            return dumps({'type': 'error', 'seq': seq, 'error': error}).decode('utf-8')
+        
+        # Only the touched cell goes back; the client already has the rest of the board
+        game_state = result['game_state']
+        row, col = result['move']['row'], result['move']['col']
+        ack = {
+            'type': 'ack',
+            'seq': seq,
+            'delta': {
+                'row': row,
+                'col': col,
+                'value': game_state['current_board'][row][col],
+                'notes': game_state['notes'][row][col]
+            },
+            'can_undo': bool(game_state['moves_history']),
+            'can_redo': bool(game_state['redo_stack'])
+        }
+        if message_type == 'move':
+            ack['is_complete'] = result['is_complete']
+            ack['is_valid'] = result['is_valid']
+        return dumps(ack).decode('utf-8')
+    except Exception as e:
+        logger.error(f"Error handling channel message: {str(e)}")
+        return dumps({'type': 'error', 'seq': seq, 'error': 'Failed to process message'}).decode('utf-8')
+
+# How often a race player's socket checks for progress broadcasts
+CHANNEL_POLL_SECONDS = 0.05
+
+def game_channel(ws):
+    """Persistent channel: client streams moves, server pushes acks, deltas and race progress"""
+    game_id = request.args.get('game_id')
+    game_state = game_states.get(game_id)
+    if game_state is None:
+        ws.send(dumps({'type': 'error', 'error': 'Invalid game ID'}).decode('utf-8'))
+        return
+    
+    race_id = game_state.get('race_id')
+    subscriber = None
+    if race_id:
+        subscriber = Subscriber(game_state['user_id'])
+        race_hub.subscribe(race_id, subscriber)
+    
+    try:
+        while True:
+            raw = ws.receive(timeout=CHANNEL_POLL_SECONDS if subscriber else None)
+            if raw is not None:
+                ws.send(handle_channel_message(game_id, raw))
+            if subscriber:
+                for message in subscriber.drain():
+                    ws.send(message)
+    except ConnectionError:
+        pass  # The client went away while we were sending
+    finally:
+        if subscriber:
+            race_hub.unsubscribe(race_id, subscriber)
+
+def register_channel():
+    """
+    Serve game_channel at /ws/game. An open socket occupies its handler for
+    as long as it stays open, so this is only called where that is cheap:
+    gevent/eventlet gunicorn workers (gunicorn.conf.py) and the development
+    server. Without the route, game.js sends moves over HTTP.
+    Returns: False if flask-sock is not installed
+    """
+    try:
+        from flask_sock import Sock  # Optional; not imported at startup
+    except ImportError:
+        return False
+    Sock(app).route('/ws/game')(game_channel)
+    return True
+
+@app.route('/api/puzzle-pack', methods=['GET'])
+def puzzle_pack():
+    """Redirect to a cacheable puzzle pack for the requested difficulty and size"""
+    difficulty = request.args.get('difficulty', 'medium')
+    count = request.args.get('count', 20, type=int)
+    
+    if difficulty not in ['easy', 'medium', 'hard', 'expert']:
+        return jsonify({'success': False, 'error': 'Invalid difficulty level'}), 400
+    
+    if not count or count < 1 or count > MAX_PACK_SIZE:
+        return jsonify({'success': False, 'error': f'Count must be between 1 and {MAX_PACK_SIZE}'}), 400
+    
+    response = redirect(url_for('get_puzzle_pack', pack_id=puzzle_packs.random_pack_id(difficulty, count)))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/puzzle-pack/<pack_id>', methods=['GET'])
+def get_puzzle_pack(pack_id):
+    """Serve an immutable puzzle pack (puzzles and solutions as 81-digit strings)"""
+    try:
+        pack = puzzle_packs.get_pack(pack_id)
+        if pack is None:
+            return jsonify({'success': False, 'error': 'Puzzle pack not found'}), 404
+        
+        if request.if_none_match.contains(pack['etag']):
+            response = Response(status=304)
+        else:
+            response = Response(pack['body'], mimetype='application/json')
+        response.set_etag(pack['etag'])
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+    except Exception as e:
+        logger.error(f"Error serving puzzle pack: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get puzzle pack'
+        }), 500
+
+@app.route('/api/daily/<date_str>', methods=['GET'])
+def get_daily(date_str):
+    """Serve a released daily puzzle (without its solution) for edge caching"""
+    try:
+        day = daily_calendar.parse_date(date_str)
+        if day is None:
+            return jsonify({'success': False, 'error': 'Invalid date'}), 400
         
-        if not game_state['redo_stack']:
-            return jsonify({'success': False, 'error': 'No moves to redo'}), 400
+        if not daily_calendar.is_released(day):
+            response = jsonify({'success': False, 'error': 'Daily puzzle not released yet'})
+            response.status_code = 404
+            response.headers['Cache-Control'] = 'public, max-age=60'
+            return response
         
-        # Get move to redo
-        move_to_redo = game_state['redo_stack'].pop()
+        if daily_calendar.is_archived(day):
+            return jsonify({'success': False, 'error': 'Daily puzzle no longer available'}), 404
         
-        # Add back to history
-        game_state['moves_history'].append(move_to_redo)
+        entry = daily_calendar.get(day.isoformat())
+        if request.if_none_match.contains(entry['etag']):
+            response = Response(status=304)
+        else:
+            response = Response(entry['body'], mimetype='application/json')
+        response.set_etag(entry['etag'])
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+    except Exception as e:
+        logger.error(f"Error serving daily puzzle: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get daily puzzle'
+        }), 500
+
+@app.route('/api/race', methods=['POST'])
+def create_race():
+    """Create a race room on a shared seeded puzzle"""
+    try:
+        data = request.get_json() or {}
+        difficulty = data.get('difficulty', 'medium')
+        
+        if difficulty not in ['easy', 'medium', 'hard', 'expert']:
+            return jsonify({'success': False, 'error': 'Invalid difficulty level'}), 400
         
-        # Apply the move
-        row, col = move_to_redo['row'], move_to_redo['col']
-        if move_to_redo['move_type'] == 'number':
-            game_state['current_board'][row][col] = move_to_redo['new_value']
-        elif move_to_redo['move_type'] == 'note':
-            game_state['notes'][row][col] = move_to_redo['new_notes'] if 'new_notes' in move_to_redo else [move_to_redo['new_value']]
+        room = race_hub.create_room(difficulty, sudoku_solver.generate_puzzle_with_seed)
         
         return jsonify({
             'success': True,
-            'redone_move': move_to_redo,
-            'current_board': game_state['current_board'],
-            'notes': game_state['notes']
+            'race_id': room.race_id,
+            'difficulty': room.difficulty
         })
     except Exception as e:
-        logger.error(f"Error redoing move: {str(e)}")
+        logger.error(f"Error creating race: {str(e)}")
         return jsonify({
             'success': False,
-            'error': 'Failed to redo move. Please try again.'
+            'error': 'Failed to create race'
         }), 500
 
+@app.route('/api/race/<race_id>/join', methods=['POST'])
+def join_race(race_id):
+    """Join a race and start a game on its puzzle"""
+    try:
+        user_id = get_user_id()
+        data = request.get_json(silent=True) or {}
+        name = str(data.get('name') or f"Player {user_id[:8]}")[:32]
+        
+        room = race_hub.join(race_id, user_id, name)
+        if room is None:
+            return jsonify({'success': False, 'error': 'Race not found'}), 404
+        
+        game = start_game('race', room.difficulty, [row[:] for row in room.puzzle],
+                          room.solution, race_id=race_id)
+        game['race_id'] = race_id
+        game['race'] = room.snapshot()
+        return jsonify(game)
+    except Exception as e:
+        logger.error(f"Error joining race: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to join race'
+        }), 500
+
+@app.route('/api/race/<race_id>', methods=['GET'])
+def get_race(race_id):
+    """Get the current standings of a race"""
+    room = race_hub.get_room(race_id)
+    if room is None:
+        return jsonify({'success': False, 'error': 'Race not found'}), 404
+    return jsonify({'success': True, 'race': room.snapshot()})
+
 @app.route('/api/hint', methods=['POST'])
 def get_hint():
     """Get a hint for a specific cell"""
@@ -359,8 +887,9 @@ def get_hint():
             return jsonify({'success': False, 'error': 'Invalid game ID'}), 400
         
         game_state = game_states[game_id]
+        size = len(game_state['puzzle'])
         
-        if row < 0 or row >= 9 or col < 0 or col >= 9:
+        if not is_int(row, col) or row < 0 or row >= size or col < 0 or col >= size:
             return jsonify({'success': False, 'error': 'Invalid cell position'}), 400
         
         if game_state['puzzle'][row][col] != 0:
@@ -370,7 +899,9 @@ def get_hint():
         hint_value = game_state['solution'][row][col]
         
         # Update game state
-        game_state['hints_used'] += 1
+        with state_lock:
+            game_state['hints_used'] += 1
+            log_event(EVENT_HINT, {'game_id': game_id, 'row': row, 'col': col})
         
         return jsonify({
             'success': True,
@@ -397,12 +928,13 @@ def check_solution():
         
         game_state = game_states[game_id]
         board = game_state['current_board']
+        solver = get_game_solver(game_state)
         
         # Check if the board is valid
-        is_valid = sudoku_solver.is_valid_board(board)
+        is_valid = solver.is_valid_board(board)
         
         # Get detailed validation info
-        validation_details = sudoku_solver.get_validation_details(board)
+        validation_details = solver.get_validation_details(board)
         
         return jsonify({
             'success': True,
@@ -429,8 +961,23 @@ def solve_puzzle():
         game_state = game_states[game_id]
         board = game_state['current_board']
         
-        # Solve the puzzle
-        solution = sudoku_solver.solve(board)
+        # The stored solution answers any board that hasn't strayed from it;
+        # otherwise search, capped so a sparse 25x25 board can't stall a worker
+        solution = game_state['solution']
+        if any(value and value != solution[r][c] for r, row in enumerate(board) for c, value in enumerate(row)):
+            max_nodes = solve_node_budget(len(board))
+            try:
+                if game_state.get('variant'):
+                    # Canonical forms only hold for classic rules, so variants skip the cache
+                    solution = get_game_solver(game_state).solve(board, max_nodes=max_nodes)
+                else:
+                    solution = solve_cache.solve(get_solver(len(board)), board, max_nodes=max_nodes)
+            except SearchLimitReached:
+                return jsonify({
+                    'success': False,
+                    'gave_up': True,
+                    'error': 'Gave up before finding a solution. Check your entries and try again.'
+                }), 422
         
         if solution:
             return jsonify({
@@ -469,7 +1016,7 @@ def save_game_stats():
         stats['total_games'] += 1
         if completed:
             stats['completed_games'] += 1
-            difficulty = game_state['difficulty']
+            difficulty = game_difficulty_key(game_state)
             if difficulty not in stats['best_times']:
                 stats['best_times'][difficulty] = time_taken
             else:
@@ -514,19 +1061,47 @@ def get_user_statistics():
 
 @app.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard():
-    """Get leaderboard data"""
+    """Get leaderboard data for a difficulty or a daily puzzle"""
     try:
-        # In a real app, this would query a database
-        # For now, return mock data
-        leaderboard = [
-            {'user_id': 'user1', 'name': 'Player 1', 'score': 1500, 'completed_games': 25},
-            {'user_id': 'user2', 'name': 'Player 2', 'score': 1200, 'completed_games': 20},
-            {'user_id': 'user3', 'name': 'Player 3', 'score': 1000, 'completed_games': 15},
-        ]
+        difficulty = request.args.get('difficulty', 'medium')
+        size = request.args.get('size', 9, type=int)
+        variant = request.args.get('variant')
+        daily_date = request.args.get('date')
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        
+        if daily_date:
+            try:
+                date.fromisoformat(daily_date)
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Invalid date'}), 400
+            board = f'daily:{daily_date}'
+        else:
+            if difficulty not in ['easy', 'medium', 'hard', 'expert']:
+                return jsonify({'success': False, 'error': 'Invalid difficulty level'}), 400
+            if size not in BOARD_SIZES:
+                return jsonify({'success': False, 'error': 'Invalid board size'}), 400
+            if variant and variant not in VARIANTS:
+                return jsonify({'success': False, 'error': 'Invalid variant'}), 400
+            board = f'difficulty:{difficulty_key(difficulty, size, variant)}'
+        
+        user_id = get_user_id()
+        entries = []
+        for position, (entry_user_id, time_taken) in enumerate(leaderboard.top(board, limit), start=1):
+            entries.append({
+                'rank': position,
+                'name': leaderboard.get_name(entry_user_id) or 'Player',
+                'time': time_taken,
+                'is_you': entry_user_id == user_id
+            })
+        
+        my_rank = leaderboard.rank(board, user_id)
         
         return jsonify({
             'success': True,
-            'leaderboard': leaderboard
+            'board': board,
+            'leaderboard': entries,
+            'total_players': leaderboard.size(board),
+            'my_rank': {'rank': my_rank[0], 'time': my_rank[1]} if my_rank else None
         })
     except Exception as e:
         logger.error(f"Error getting leaderboard: {str(e)}")
@@ -535,6 +1110,59 @@ def get_leaderboard():
             'error': 'Failed to get leaderboard'
         }), 500
 
+@app.route('/api/stats', methods=['GET'])
+def get_global_stats():
+    """Completion-time percentiles, hint/notes usage and hourly rollups"""
+    try:
+        hours = min(max(request.args.get('hours', 24, type=int), 0), stats_rollup.retention_hours)
+        return jsonify({
+            'success': True,
+            'pid': os.getpid(),
+            'stats': stats_rollup.summary(hours)
+        })
+    except Exception as e:
+        logger.error(f"Error getting global stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get statistics'
+        }), 500
+
+@app.route('/api/admin/profiling', methods=['GET', 'POST'])
+@require_admin
+def admin_profiling():
+    """Inspect or change the request profiler of the worker that serves this call"""
+    try:
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            request_profiler.configure(
+                sample_rate=data.get('sample_rate'),
+                slow_ms=data.get('slow_ms'),
+                window_seconds=data.get('window_seconds')
+            )
+        
+        limit = request.args.get('limit', 10, type=int)
+        sort_by = request.args.get('sort', 'tottime')
+        
+        return jsonify({
+            'success': True,
+            'config': request_profiler.get_config(),
+            'hot_functions': request_profiler.hot_functions(request.args.get('route'), limit, sort_by)
+        })
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid profiler settings'}), 400
+    except Exception as e:
+        logger.error(f"Error in profiling endpoint: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to access profiler'
+        }), 500
+
+@app.route('/api/admin/solve-cache', methods=['GET'])
+@require_admin
+def admin_solve_cache():
+    """Hit rate and canonicalization cost of this worker's solve cache"""
+    return jsonify({'success': True, 'pid': os.getpid(), 'solve_cache': solve_cache.get_stats()})
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -547,6 +1175,29 @@ def health_check():
         'active_users': len(user_stats)
     })
 
+# Background work starts per process, never on import
+_init_lock = threading.Lock()
+_initialized = False
+
+def init_app():
+    """
+    Recover the event log and start the daily calendar thread.
+    gunicorn.conf.py calls this in each worker after it loads the app; other
+    servers get it on their first request.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        init_event_log()
+        daily_calendar.start()
+        _initialized = True
+
+@app.before_request
+def ensure_initialized():
+    if not _initialized:
+        init_app()
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -574,5 +1225,6 @@ if __name__ == '__main__':
     print("⏹️  Press Ctrl+C to stop the server")
     print("-" * 60)
     
+    register_channel()
     app.run(debug=debug_mode, host='0.0.0.0', port=port)
     
\ No newline at end of file
@@ -100,8 +100,8 @@ echo {
 echo   "family": "%TASK_FAMILY%",
 echo   "networkMode": "awsvpc",
 echo   "requiresCompatibilities": ["FARGATE"],
-echo   "cpu": "256",
-echo   "memory": "512",
+echo   "cpu": "1024",
+echo   "memory": "2048",
 echo   "executionRoleArn": "arn:aws:iam::%ACCOUNT_ID%:role/ecsTaskExecutionRole",
 echo   "containerDefinitions": [
 echo     {
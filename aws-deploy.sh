@@ -67,8 +67,8 @@ cat > task-definition.json << EOF
   "family": "$TASK_FAMILY",
   "networkMode": "awsvpc",
   "requiresCompatibilities": ["FARGATE"],
-  "cpu": "256",
-  "memory": "512",
+  "cpu": "1024",
+  "memory": "2048",
   "executionRoleArn": "arn:aws:iam::$ACCOUNT_ID:role/ecsTaskExecutionRole",
   "containerDefinitions": [
     {
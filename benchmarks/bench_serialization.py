@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for board-heavy responses (/api/make-move, undo, redo).
+
+Compares Flask jsonify against the serializers backends, with and without
+the compact board encoding.
+
+Usage: python benchmarks/bench_serialization.py [iterations]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+import serializers
+from sudoku_solver import SudokuSolver
+
+
+def make_payload():
+    puzzle, solution = SudokuSolver().generate_puzzle('medium')
+    notes = [[sorted(random.sample(range(1, 10), random.randint(0, 4))) if puzzle[i][j] == 0 else []
+              for j in range(9)] for i in range(9)]
+    return {
+        'success': True,
+        'move': {'row': 0, 'col': 1, 'old_value': 0, 'new_value': 5, 'old_notes': [],
+                 'move_type': 'number', 'timestamp': time.time()},
+        'is_complete': False,
+        'is_valid': True,
+        'current_board': puzzle,
+        'notes': notes
+    }
+
+
+def bench(label, build, iterations):
+    build()  # Warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = build()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / iterations * 1e6:8.1f} us   {len(response.get_data()):6d} bytes")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    app = Flask(__name__)
+    payload = make_payload()
+
+    with app.app_context():
+        bench('jsonify (before)', lambda: jsonify(payload), iterations)
+
+        for name in ('json', 'orjson', 'ujson'):
+            backend, dumps = serializers._load_backend(name)
+            if backend != name:
+                print(f"{name + ' (not installed)':<32}")
+                continue
+            serializers.dumps = dumps
+            bench(f'{name}', lambda: serializers.board_response(payload), iterations)
+            bench(f'{name} + compact board', lambda: serializers.board_response(payload, compact=True), iterations)
+
+
+if __name__ == '__main__':
+    main()
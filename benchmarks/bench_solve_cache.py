@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Solve cache benchmark: canonicalization cost and hit rate.
+
+Builds a workload of --puzzles base puzzles, each requested --copies times
+as a random symmetric copy (relabelled, rows/columns/bands/stacks permuted,
+maybe transposed), then compares solving every request directly against
+solving through SolveCache.
+
+Usage: python benchmarks/bench_solve_cache.py [--puzzles 50] [--copies 10]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sudoku_solver import get_solver
+from solve_cache import SolveCache, canonicalize
+
+
+def random_copy(board, rng):
+    """Apply a random symmetry transform"""
+    size = len(board)
+    box_size = int(round(size ** 0.5))
+    digits = rng.sample(range(1, size + 1), size)
+    rows = [band * box_size + r for band in rng.sample(range(box_size), box_size)
+            for r in rng.sample(range(box_size), box_size)]
+    cols = [stack * box_size + c for stack in rng.sample(range(box_size), box_size)
+            for c in rng.sample(range(box_size), box_size)]
+    copy = [[board[r][c] and digits[board[r][c] - 1] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        copy = [list(col) for col in zip(*copy)]
+    return copy
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve cache benchmark')
+    parser.add_argument('--puzzles', type=int, default=50)
+    parser.add_argument('--copies', type=int, default=10)
+    parser.add_argument('--difficulty', default='hard')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    solver = get_solver(9)
+    bases = [solver.generate_puzzle(args.difficulty)[0] for _ in range(args.puzzles)]
+    workload = [random_copy(base, rng) for base in bases for _ in range(args.copies)]
+    rng.shuffle(workload)
+
+    canonicalize_times = []
+    for board in workload:
+        start = time.perf_counter()
+        canonicalize(board)
+        canonicalize_times.append(time.perf_counter() - start)
+    print(f"canonicalize:  p50 {percentile(canonicalize_times, 0.5) * 1000:.2f} ms   "
+          f"p99 {percentile(canonicalize_times, 0.99) * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    for board in workload:
+        solver.solve(board)
+    direct = time.perf_counter() - start
+    print(f"direct solve:  {direct / len(workload) * 1000:.2f} ms/request")
+
+    cache = SolveCache()
+    start = time.perf_counter()
+    for board in workload:
+        cache.solve(solver, board)
+    cached = time.perf_counter() - start
+    stats = cache.get_stats()
+    print(f"cached solve:  {cached / len(workload) * 1000:.2f} ms/request   "
+          f"hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['skipped']} too symmetric to canonicalize)")
+
+
+if __name__ == '__main__':
+    main()
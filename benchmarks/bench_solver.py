@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Solver benchmark per board size (4x4, 9x9, 16x16, 25x25).
+
+For each size and difficulty, times puzzle generation and solving a
+generated puzzle from scratch, and counts solves that hit the node cap
+(--max-nodes for 9x9, scaled by 81 / cells like /api/solve).
+Also times 9x9 generation from the graded seed bank (isomorphic copies).
+
+Usage: python benchmarks/bench_solver.py [--runs 20] [--max-nodes 50000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sudoku_solver import BOARD_SIZES, SearchLimitReached, get_solver
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solver benchmark per board size')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--max-nodes', type=int, default=50000)
+    parser.add_argument('--sizes', type=int, nargs='*', default=sorted(BOARD_SIZES))
+    args = parser.parse_args()
+
+    print(f"{'size':<7} {'difficulty':<10} {'generate p50':>13} {'p99':>9}   "
+          f"{'solve p50':>10} {'p99':>9}  gave up")
+    for size in args.sizes:
+        solver = get_solver(size)
+        max_nodes = args.max_nodes * 81 // (size * size)
+        for difficulty in ('easy', 'medium', 'hard', 'expert'):
+            generate_times, solve_times, gave_up = [], [], 0
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                puzzle, _ = solver.generate_puzzle(difficulty)
+                generate_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                try:
+                    solver.solve(puzzle, max_nodes=max_nodes)
+                except SearchLimitReached:
+                    gave_up += 1
+                solve_times.append(time.perf_counter() - start)
+
+            print(f"{f'{size}x{size}':<7} {difficulty:<10} "
+                  f"{percentile(generate_times, 0.5) * 1000:10.2f} ms {percentile(generate_times, 0.99) * 1000:6.2f} ms   "
+                  f"{percentile(solve_times, 0.5) * 1000:7.1f} ms {percentile(solve_times, 0.99) * 1000:6.1f} ms  "
+                  f"{gave_up}/{args.runs}")
+
+    solver = get_solver(9)
+    for difficulty in ('easy', 'medium', 'hard', 'expert'):
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            solver.generate_from_seeds(difficulty)
+            times.append(time.perf_counter() - start)
+        print(f"{'seeds':<7} {difficulty:<10} "
+              f"{percentile(times, 0.5) * 1000:10.2f} ms {percentile(times, 0.99) * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
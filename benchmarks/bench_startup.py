@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the serverless and container entry points.
+
+Each run starts a fresh interpreter, imports the entry module and serves
+its first requests through the test client, so the numbers include
+interpreter start, imports, app setup and first-request work. The module
+import is also measured with `python -X importtime`.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--budget-ms MS] [module ...]
+Exits non-zero when the best import time exceeds the budget.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = '''
+import time
+start = time.perf_counter()
+import {module} as entry
+imported = time.perf_counter()
+client = entry.app.test_client()
+client.get('/api/health')
+first = time.perf_counter()
+client.get('/')
+page = time.perf_counter()
+print(imported - start, first - start, page - start)
+'''
+
+
+# Third-party framework imports we can't make cheaper ourselves
+FRAMEWORK_MODULES = {'flask', 'flask_cors', 'werkzeug', 'jinja2'}
+
+
+def import_time_ms(module):
+    """
+    Import time of module from -X importtime
+    Returns: (total ms, ms spent in our own code and its imports)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    framework_us = 0
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2][1:].rstrip()  # Drop the space after the separator
+        # The entry module's line can come out indented: the nesting depth is
+        # shared with the background threads it starts, which import too
+        if name.strip() == module:
+            total_us = int(parts[1])
+            return total_us / 1000, (total_us - framework_us) / 1000
+        # Direct imports of the entry module are indented by exactly two spaces
+        if name.startswith('  ') and not name.startswith('   ') and name.strip() in FRAMEWORK_MODULES:
+            framework_us += int(parts[1])
+    raise RuntimeError(f'No importtime line for {module}')
+
+
+def first_request_ms(module):
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return [float(value) * 1000 for value in result.stdout.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('modules', nargs='*', default=['vercel_app', 'app'])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', 300)))
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'module':<12} {'importtime':>11} {'own code':>9} {'import':>9} {'1st req':>9} {'1st page':>9}"
+          f"  (best of {args.runs}, ms)")
+    for module in args.modules:
+        imports = [import_time_ms(module) for _ in range(args.runs)]
+        timings = [first_request_ms(module) for _ in range(args.runs)]
+        # Best-of-N is far less sensitive to noisy neighbours than the median
+        import_ms = min(total for total, _ in imports)
+        own_ms = min(own for _, own in imports)
+        columns = [min(column) for column in zip(*timings)]
+        print(f"{module:<12} {import_ms:>11.1f} {own_ms:>9.1f} {columns[0]:>9.1f} {columns[1]:>9.1f} {columns[2]:>9.1f}")
+        if import_ms > args.budget_ms:
+            print(f"  over budget: {import_ms:.1f} ms > {args.budget_ms:.1f} ms")
+            over_budget = True
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Static asset benchmark: bytes per cold page load and serving cost.
+
+Builds static/dist, then for every asset the page links to compares the
+bytes Flask sends from the plain /static/ route with the precompressed
+fingerprinted copy for brotli and gzip clients, and times --requests
+requests of each through the test client. The in-process gzip of
+style.css shows what compressing per request would cost instead.
+
+Usage: python benchmarks/bench_static.py [--requests 2000]
+"""
+
+import os
+import re
+import sys
+import gzip
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import static_assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Static asset benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    static_assets.build()
+    import vercel_app  # Loads the fresh build
+    app = vercel_app.app
+
+    client = app.test_client()
+    page = client.get('/').get_data(as_text=True)
+    paths = {f"/static/dist/{entry['path']}": name for name, entry in vercel_app.static_assets.assets.items()}
+    assets = {url: paths[url] for url in re.findall(r'(?:href|src)="(/static/dist/[^"]+)"', page)}
+
+    print(f"{'asset':<18} {'plain':>9} {'gzip':>9} {'brotli':>9}")
+    totals = [0, 0, 0]
+    for url, name in assets.items():
+        sizes = [len(client.get(f'/static/{name}').get_data()),
+                 len(client.get(url, headers={'Accept-Encoding': 'gzip'}).get_data()),
+                 len(client.get(url, headers={'Accept-Encoding': 'br, gzip'}).get_data())]
+        totals = [total + size for total, size in zip(totals, sizes)]
+        print(f"{name:<18} {sizes[0]:>9} {sizes[1]:>9} {sizes[2]:>9}")
+    print(f"{'page total':<18} {totals[0]:>9} {totals[1]:>9} {totals[2]:>9}  bytes")
+    print()
+
+    css = next(url for url, name in assets.items() if name.endswith('.css'))
+    for label, url, headers in (('plain /static/', '/static/css/style.css', {}),
+                                ('dist, brotli', css, {'Accept-Encoding': 'br, gzip'}),
+                                ('dist, gzip', css, {'Accept-Encoding': 'gzip'})):
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(url, headers=headers).get_data()
+        elapsed = time.perf_counter() - start
+        print(f"style.css {label:<15} {elapsed / args.requests * 1e6:8.0f} us/request")
+
+    with open(os.path.join(app.static_folder, 'css', 'style.css'), 'rb') as f:
+        data = f.read()
+    start = time.perf_counter()
+    for _ in range(200):
+        gzip.compress(data, 6)
+    print(f"style.css gzip on the fly {(time.perf_counter() - start) / 200 * 1e6:8.0f} us/request (level 6)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Streaming stats benchmark: record cost, summary cost and percentile error.
+
+Feeds --completions synthetic completions (log-normal times over four
+difficulties, spread across the last two days) into StatsRollup and checks
+the t-digest percentiles against exact ones computed from a sorted copy.
+
+Usage: python benchmarks/bench_stats.py [--completions 200000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats_rollup import StatsRollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming stats benchmark')
+    parser.add_argument('--completions', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = time.time()
+    workload = [
+        (rng.choice(('easy', 'medium', 'hard', 'expert')), rng.lognormvariate(5.5, 0.7),
+         rng.randint(0, 4), rng.randint(0, 60), now - rng.random() * 2 * 86400)
+        for _ in range(args.completions)
+    ]
+
+    rollup = StatsRollup()
+    start = time.perf_counter()
+    for difficulty, time_taken, hints, notes, timestamp in workload:
+        rollup.record_completion(difficulty, time_taken, hints, notes, timestamp)
+    elapsed = time.perf_counter() - start
+    print(f"record:   {elapsed / len(workload) * 1e6:.2f} us/completion")
+
+    rollup.summary()
+    start = time.perf_counter()
+    for _ in range(100):
+        summary = rollup.summary()
+    print(f"summary:  {(time.perf_counter() - start) / 100 * 1000:.2f} ms   "
+          f"({len(rollup.times.centroids)} centroids, {len(rollup.hours)} hours)")
+
+    exact = sorted(time_taken for _, time_taken, _, _, _ in workload)
+    for name, estimate in summary['completion_times']['percentiles'].items():
+        actual = exact[min(len(exact) - 1, int(len(exact) * int(name[1:]) / 100))]
+        print(f"{name:<4} estimate {estimate:8.1f}s   exact {actual:8.1f}s   "
+              f"error {abs(estimate - actual) / actual:.3%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Variant benchmark: check throughput of the constraint engine and
+generate/solve times per variant.
+
+For classic 9x9, times is_valid_board and is_valid_move through the engine
+against the hard-coded row/column/box checks it replaced, on the same
+boards. Then for classic and each variant, times the checks, puzzle
+generation and solving a generated puzzle from scratch.
+
+Usage: python benchmarks/bench_variants.py [--runs 20] [--boards 200]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sudoku_solver import get_solver
+from sudoku_variants import VARIANTS, get_variant_solver, generate_variant_puzzle
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def reference_is_valid_board(board):
+    """The hard-coded 9x9 check the engine replaced"""
+    for row in board:
+        numbers = [x for x in row if x != 0]
+        if len(numbers) != len(set(numbers)):
+            return False
+    for col in range(9):
+        numbers = [board[row][col] for row in range(9) if board[row][col] != 0]
+        if len(numbers) != len(set(numbers)):
+            return False
+    for box_row in range(0, 9, 3):
+        for box_col in range(0, 9, 3):
+            numbers = [board[i][j] for i in range(box_row, box_row + 3)
+                       for j in range(box_col, box_col + 3) if board[i][j] != 0]
+            if len(numbers) != len(set(numbers)):
+                return False
+    return True
+
+
+def time_per_call(function, calls):
+    start = time.perf_counter()
+    for args in calls:
+        function(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def check_times(solver, boards):
+    moves = [(board, r, c, n) for board in boards for r, c, n in ((0, 0, 5), (4, 4, 1), (8, 3, 9))]
+    return (time_per_call(solver.is_valid_board, [(board,) for board in boards]),
+            time_per_call(solver.is_valid_move, moves),
+            time_per_call(solver.get_validation_details, [(board,) for board in boards]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Variant benchmark')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--boards', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    classic = get_solver(9)
+    boards = [classic.generate_puzzle(rng.choice(('easy', 'hard')), rng)[0] for _ in range(args.boards)]
+    peers = classic.engine.peer_cells
+    reference_move = lambda board, row, col, num: all(board[i][j] != num for i, j in peers[row][col])
+
+    reference = (time_per_call(reference_is_valid_board, [(board,) for board in boards]),
+                 time_per_call(reference_move, [(board, r, c, n) for board in boards
+                                                for r, c, n in ((0, 0, 5), (4, 4, 1), (8, 3, 9))]))
+    engine = check_times(classic, boards)
+    print(f"classic checks  is_valid_board {reference[0]:6.1f} us hard-coded, {engine[0]:6.1f} us engine; "
+          f"is_valid_move {reference[1]:5.2f} us hard-coded, {engine[1]:5.2f} us engine")
+    print()
+
+    print(f"{'variant':<10} {'valid_board':>11} {'valid_move':>11} {'details':>9}   "
+          f"{'generate p50':>13} {'p99':>9}   {'solve p50':>10} {'p99':>9}")
+    for name in ('classic',) + VARIANTS:
+        generate_times, solve_times, solved_boards = [], [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            if name == 'classic':
+                puzzle, solution = classic.generate_puzzle(rng.choice(('easy', 'hard')), rng)
+                solver = classic
+            else:
+                puzzle, solution, variant = generate_variant_puzzle(name, rng.choice(('easy', 'hard')), rng)
+                solver = get_variant_solver(variant)
+            generate_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            solver.solve(puzzle)
+            solve_times.append(time.perf_counter() - start)
+            solved_boards.append(puzzle)
+
+        valid_board, valid_move, details = check_times(solver, solved_boards)
+        print(f"{name:<10} {valid_board:8.1f} us {valid_move:8.2f} us {details:6.1f} us   "
+              f"{percentile(generate_times, 0.5) * 1000:10.2f} ms {percentile(generate_times, 0.99) * 1000:6.2f} ms   "
+              f"{percentile(solve_times, 0.5) * 1000:7.2f} ms {percentile(solve_times, 0.99) * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Load test for the /ws/game channel and race fan-out, against one worker.
+
+Starts gunicorn with the production gunicorn.conf.py (one gevent worker),
+opens --idle sockets that stay open for the whole run, and checks that
+plain HTTP requests are still answered promptly. Then:
+  1. each of --clients players streams --moves note toggles over its own
+     socket, pipelining --window messages before waiting for the acks;
+  2. --racers players join one race and fill in their cells, counting the
+     progress broadcasts they receive.
+
+Reports HTTP latency with the sockets open, acknowledged moves/s and
+delivered broadcast messages/s.
+
+Usage: python benchmarks/load_ws.py [--idle 100] [--clients 20] [--moves 500] [--racers 50]
+Requires gunicorn, gevent and flask-sock (server) and simple-websocket (client).
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import urllib.request
+
+import simple_websocket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def serve(port):
+    """Start gunicorn as the Dockerfile does and wait until it answers"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py',
+         '--bind', f'127.0.0.1:{port}', '--timeout', '120', '--log-level', 'warning', 'app:app'],
+        cwd=ROOT, env={**os.environ, 'WEB_CONCURRENCY': '1'}
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    sys.exit('gunicorn did not start')
+
+
+def post(base, path, payload):
+    request = urllib.request.Request(f'{base}{path}', data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def timed(call):
+    """Latency of call() in ms"""
+    start = time.perf_counter()
+    call()
+    return (time.perf_counter() - start) * 1000
+
+
+def empty_cells(puzzle):
+    return [(i, j) for i in range(9) for j in range(9) if puzzle[i][j] == 0]
+
+
+def stream_moves(url, game, moves, window, results):
+    """Pipeline note toggles and wait for each window of acks"""
+    ws = simple_websocket.Client.connect(f"{url}?game_id={game['game_id']}")
+    cells = empty_cells(game['puzzle'])
+    acked = 0
+    seq = 0
+    try:
+        while seq < moves:
+            batch = min(window, moves - seq)
+            for _ in range(batch):
+                row, col = cells[seq % len(cells)]
+                ws.send(json.dumps({'type': 'move', 'seq': seq, 'row': row, 'col': col,
+                                    'value': seq % 9 + 1, 'move_type': 'note'}))
+                seq += 1
+            for _ in range(batch):
+                if json.loads(ws.receive())['type'] == 'ack':
+                    acked += 1
+    finally:
+        ws.close()
+    results.append(acked)
+
+
+def race(url, game, ready, results, move_interval):
+    """Fill in the solution one cell at a time and count progress broadcasts"""
+    ws = simple_websocket.Client.connect(f"{url}?game_id={game['game_id']}")
+    broadcasts = 0
+    ready.wait()
+    try:
+        for seq, (row, col) in enumerate(empty_cells(game['puzzle'])):
+            ws.send(json.dumps({'type': 'move', 'seq': seq, 'row': row, 'col': col,
+                                'value': game['solution'][row][col]}))
+            deadline = time.perf_counter() + move_interval
+            while True:
+                message = ws.receive(timeout=max(0.0, deadline - time.perf_counter()))
+                if message is None:
+                    break
+                if json.loads(message)['type'] == 'race_progress':
+                    broadcasts += 1
+    finally:
+        ws.close()
+    results.append(broadcasts)
+
+
+def run_threads(threads):
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WebSocket channel load test')
+    parser.add_argument('--idle', type=int, default=100)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--moves', type=int, default=500)
+    parser.add_argument('--window', type=int, default=10)
+    parser.add_argument('--racers', type=int, default=50)
+    parser.add_argument('--move-interval', type=float, default=0.02)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = serve(port)
+    base = f'http://127.0.0.1:{port}'
+    url = f'ws://127.0.0.1:{port}/ws/game'
+    idle_sockets = []
+
+    try:
+        # 0. HTTP stays responsive while many sockets sit open
+        for _ in range(args.idle):
+            game = post(base, '/api/new-game', {'difficulty': 'easy'})
+            idle_sockets.append(simple_websocket.Client.connect(f"{url}?game_id={game['game_id']}"))
+        health_ms = min(timed(lambda: urllib.request.urlopen(f'{base}/api/health', timeout=10).read())
+                        for _ in range(5))
+        new_game_ms = min(timed(lambda: post(base, '/api/new-game', {'difficulty': 'easy'}))
+                          for _ in range(5))
+        print(f"http:       {args.idle} idle sockets open, /api/health {health_ms:.1f} ms, "
+              f"/api/new-game {new_game_ms:.1f} ms")
+
+        # 1. Move throughput
+        games = [post(base, '/api/new-game', {'difficulty': 'easy'}) for _ in range(args.clients)]
+        results = []
+        elapsed = run_threads([
+            threading.Thread(target=stream_moves, args=(url, game, args.moves, args.window, results))
+            for game in games
+        ])
+        total = sum(results)
+        print(f"moves:      {total} acked from {args.clients} sockets in {elapsed:.2f}s "
+              f"= {total / elapsed:,.0f} msg/s")
+
+        # 2. Race fan-out
+        race_id = post(base, '/api/race', {'difficulty': 'easy'})['race_id']
+        racers = [post(base, f'/api/race/{race_id}/join', {}) for _ in range(args.racers)]
+        ready = threading.Event()
+        results = []
+        threads = [
+            threading.Thread(target=race, args=(url, game, ready, results, args.move_interval))
+            for game in racers
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)  # Let every socket subscribe before the race starts
+        start = time.perf_counter()
+        ready.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        delivered = sum(results)
+        print(f"race:       {args.racers} players, {delivered} progress messages delivered in {elapsed:.2f}s "
+              f"= {delivered / elapsed:,.0f} msg/s")
+    finally:
+        for ws in idle_sockets:
+            ws.close()
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from serializers import dumps, encode_board
+
+logger = logging.getLogger(__name__)
+
+
+class DailyCalendar:
+    """
+    Daily puzzles generated and graded ahead of time.
+
+    Each day's puzzle is seeded by its ISO date, so every worker derives the
+    same one. A background thread prepares today plus the next `days_ahead`
+    days; with a shared `directory` the entries are written once as JSON
+    files (under an flock, so only one worker generates) and the others
+    just read them. Past days are served back to `archive_days` ago;
+    with a directory they are written there the first time too.
+    """
+
+    def __init__(self, solver, days_ahead=7, directory=None, difficulty='medium',
+                 refresh_interval=3600, cache_size=64, archive_days=365):
+        self.solver = solver
+        self.days_ahead = days_ahead
+        self.archive_days = archive_days
+        self.directory = directory
+        self.difficulty = difficulty
+        self.refresh_interval = refresh_interval
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def parse_date(date_str):
+        """Returns: the date for an ISO date string, or None if invalid"""
+        try:
+            return date.fromisoformat(date_str)
+        except (TypeError, ValueError):
+            return None
+
+    def is_released(self, day):
+        """Future puzzles stay private until their day"""
+        return day <= date.today()
+
+    def is_archived(self, day):
+        """Days before the archive window are no longer served (or generated)"""
+        return day < date.today() - timedelta(days=self.archive_days)
+
+    def get(self, date_str):
+        """
+        Get the calendar entry for a date, generating it if it isn't ready
+        Returns: {'date', 'difficulty', 'puzzle', 'solution', 'rating',
+                  'clues', 'body', 'etag'} or None for invalid dates
+        """
+        if self.parse_date(date_str) is None:
+            return None
+
+        with self._lock:
+            entry = self._cache.get(date_str)
+            if entry is not None:
+                self._cache.move_to_end(date_str)
+                return entry
+
+        entry = self._read(date_str)
+        if entry is None:
+            entry = self._generate(date_str)
+            if self.directory:
+                self._write(entry)
+
+        with self._lock:
+            self._cache[date_str] = entry
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def get_puzzle(self, date_str):
+        """
+        Get a date's puzzle for a new game
+        Returns: (puzzle copy, solution, difficulty) or None for invalid dates
+        """
+        entry = self.get(date_str)
+        if entry is None:
+            return None
+        return [row[:] for row in entry['puzzle']], entry['solution'], entry['difficulty']
+
+    def pregenerate(self, start=None):
+        """Prepare start (default today) and the following days_ahead days"""
+        start = start or date.today()
+        days = [(start + timedelta(days=offset)).isoformat() for offset in range(self.days_ahead + 1)]
+
+        if not self.directory:
+            for date_str in days:
+                self.get(date_str)
+            return
+
+        # One worker generates; the rest skip and read the files on demand
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            try:
+                for date_str in days:
+                    if not os.path.exists(self._path(date_str)):
+                        self._write(self._generate(date_str))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def start(self):
+        """Start the background pre-generation thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='daily-calendar', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                start = time.perf_counter()
+                self.pregenerate()
+                logger.info(f"Daily calendar ready through {self.days_ahead} days ahead "
+                            f"in {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                logger.error(f"Error pre-generating daily puzzles: {str(e)}")
+            time.sleep(self.refresh_interval)
+
+    def _generate(self, date_str):
+        puzzle, solution = self.solver.generate_puzzle_with_seed(date_str, self.difficulty)
+        return self._entry(date_str, self.difficulty, puzzle, solution)
+
+    def _entry(self, date_str, difficulty, puzzle, solution):
+        """Grade a puzzle and pre-serialize its public response"""
+        import hashlib  # Deferred to keep it out of cold-start imports
+
+        rating = self.solver.get_puzzle_difficulty_rating(puzzle)
+        clues = sum(1 for row in puzzle for cell in row if cell != 0)
+        # The solution stays out of the public response
+        body = dumps({
+            'success': True,
+            'date': date_str,
+            'difficulty': difficulty,
+            'rating': rating,
+            'clues': clues,
+            'encoding': 'compact',
+            'puzzle': encode_board(puzzle)
+        })
+        return {
+            'date': date_str,
+            'difficulty': difficulty,
+            'puzzle': puzzle,
+            'solution': solution,
+            'rating': rating,
+            'clues': clues,
+            'body': body,
+            'etag': hashlib.sha256(body).hexdigest()[:32]
+        }
+
+    def _path(self, date_str):
+        return os.path.join(self.directory, f'{date_str}.json')
+
+    def _read(self, date_str):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(date_str)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return self._entry(date_str, data['difficulty'], data['puzzle'], data['solution'])
+
+    def _write(self, entry):
+        path = self._path(entry['date'])
+        # Workers may write the same past day at once; the content is identical
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({key: entry[key] for key in ('date', 'difficulty', 'puzzle', 'solution')}, f)
+        os.replace(tmp_path, path)
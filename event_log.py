@@ -0,0 +1,380 @@
+import gc
+import os
+import json
+import time
+import uuid
+import zlib
+import fcntl
+import struct
+import atexit
+import logging
+import threading
+from functools import lru_cache
+from contextlib import contextmanager
+
+try:
+    from orjson import loads as _loads  # Optional: faster snapshot decoding
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Event types
+EVENT_NEW_GAME = 1
+EVENT_MOVE = 2
+EVENT_UNDO = 3
+EVENT_REDO = 4
+EVENT_HINT = 5
+EVENT_COMPLETION = 6
+EVENT_STATS = 7
+
+# Record framing: magic, payload length, crc32(type + timestamp + payload), type, timestamp
+_MAGIC = 0x5344
+_HEADER = struct.Struct('<HIIBd')
+_CRC_OFFSET = 10  # crc covers everything after the crc field
+
+# Binary payloads for the hot per-move events; the rare ones are JSON
+_GAME = struct.Struct('<16s')
+_MOVE = struct.Struct('<16sBBBB')
+_HINT = struct.Struct('<16sBB')
+_MOVE_TYPES = ('number', 'note')
+
+_SNAPSHOT_MAGIC = b'SDKSNAP2'  # zlib-compressed JSON
+_SNAPSHOT_HEADER = struct.Struct('<8sQ')
+
+
+@lru_cache(maxsize=65536)
+def _game_id_bytes(game_id):
+    return uuid.UUID(game_id).bytes
+
+
+@lru_cache(maxsize=65536)
+def _game_id_str(raw):
+    return str(uuid.UUID(bytes=raw))
+
+
+def encode_payload(event_type, data):
+    """Encode event data into its compact binary payload"""
+    if event_type == EVENT_MOVE:
+        return _MOVE.pack(_game_id_bytes(data['game_id']), data['row'], data['col'],
+                          data['value'], _MOVE_TYPES.index(data['move_type']))
+    if event_type in (EVENT_UNDO, EVENT_REDO):
+        return _GAME.pack(_game_id_bytes(data['game_id']))
+    if event_type == EVENT_HINT:
+        return _HINT.pack(_game_id_bytes(data['game_id']), data['row'], data['col'])
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def decode_payload(event_type, payload):
+    """Decode a binary payload back into event data"""
+    if event_type == EVENT_MOVE:
+        game_id, row, col, value, move_type = _MOVE.unpack(payload)
+        return {'game_id': _game_id_str(game_id), 'row': row, 'col': col,
+                'value': value, 'move_type': _MOVE_TYPES[move_type]}
+    if event_type in (EVENT_UNDO, EVENT_REDO):
+        return {'game_id': _game_id_str(_GAME.unpack(payload)[0])}
+    if event_type == EVENT_HINT:
+        game_id, row, col = _HINT.unpack(payload)
+        return {'game_id': _game_id_str(game_id), 'row': row, 'col': col}
+    return json.loads(payload)
+
+
+def encode_record(event_type, data, timestamp):
+    """Frame an event as one self-checking log record"""
+    payload = encode_payload(event_type, data)
+    body = struct.pack('<Bd', event_type, timestamp) + payload
+    return struct.pack('<HII', _MAGIC, len(payload), zlib.crc32(body)) + body
+
+
+def iter_records(buffer):
+    """
+    Yield (event_type, timestamp, payload) from a log buffer.
+    Torn or corrupt records are skipped by resyncing on the next valid header.
+    """
+    view = memoryview(buffer)
+    end = len(buffer)
+    header_size = _HEADER.size
+    position = 0
+    while position + header_size <= end:
+        magic, length, crc, event_type, timestamp = _HEADER.unpack_from(buffer, position)
+        record_end = position + header_size + length
+        if magic == _MAGIC and record_end <= end and zlib.crc32(view[position + _CRC_OFFSET:record_end]) == crc:
+            yield event_type, timestamp, bytes(view[position + header_size:record_end])
+            position = record_end
+        else:
+            position += 1
+
+
+_claimed_fds = []
+
+
+def claim_worker_directory(directory):
+    """
+    Claim the lowest free worker-<n> log directory under directory.
+    Each worker process replays and appends to its own directory only, so a
+    game is restored into exactly one process after a restart. The claim is
+    an exclusive flock, released when the process exits.
+    Returns: the claimed directory path
+    """
+    os.makedirs(directory, exist_ok=True)
+    slot = 0
+    while True:
+        fd = os.open(os.path.join(directory, f'worker-{slot}.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            slot += 1
+            continue
+        _claimed_fds.append(fd)  # Held open for the life of the process
+        return os.path.join(directory, f'worker-{slot}')
+
+
+@contextmanager
+def _gc_paused():
+    """Replay builds millions of small containers; GC passes over them are wasted"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class EventLog:
+    """
+    Write-behind, append-only event log with periodic snapshots.
+
+    Events are buffered in memory and written + fsynced in one batch per
+    flush interval. The log is split into generations (events-<gen>.log);
+    compaction rolls writers onto a new generation, writes snapshot.bin
+    and deletes the older generations. Several processes may share one
+    directory: batches are written with O_APPEND under a shared flock and
+    compaction holds the exclusive flock.
+
+    With capture_state, compaction snapshots the caller's live state: the
+    callable returns it as JSON bytes and is called with state_lock held,
+    which the caller also holds around each change and its append, so the
+    snapshot covers exactly the events written before the roll. Without
+    it (offline tools), compaction replays the closed generations instead.
+    """
+
+    def __init__(self, directory, apply_event, new_state=None,
+                 flush_interval=1.0, snapshot_interval=300,
+                 capture_state=None, state_lock=None):
+        self.directory = directory
+        self.apply_event = apply_event
+        self.new_state = new_state or (lambda: {'game_states': {}, 'user_stats': {}})
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self.capture_state = capture_state
+        self.state_lock = state_lock or threading.Lock()
+
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._fd = None
+        self._generation = None
+        self._thread = None
+        self._stop = threading.Event()
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(directory, 'log.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+
+    # Paths -----------------------------------------------------------------
+
+    def _segment_path(self, generation):
+        return os.path.join(self.directory, f'events-{generation:08d}.log')
+
+    def _snapshot_path(self):
+        return os.path.join(self.directory, 'snapshot.bin')
+
+    def _generations(self):
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith('events-') and name.endswith('.log'):
+                generations.append(int(name[7:-4]))
+        return sorted(generations)
+
+    # Writing ---------------------------------------------------------------
+
+    def append(self, event_type, data, timestamp=None):
+        """Queue an event; it reaches disk on the next flush"""
+        record = encode_record(event_type, data, timestamp if timestamp is not None else time.time())
+        with self._buffer_lock:
+            self._buffer.append(record)
+
+    def flush(self):
+        """Write and fsync all queued events as one batch"""
+        with self._write_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+            try:
+                return self._write_buffer()
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _write_buffer(self):
+        """Write the queued events (caller holds _write_lock and the flock)"""
+        with self._buffer_lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+
+        self._open_current_segment()
+        os.write(self._fd, b''.join(batch))
+        os.fsync(self._fd)
+        return len(batch)
+
+    def _open_current_segment(self):
+        """Point the writer at the newest generation (caller holds the flock)"""
+        if (self._fd is not None and os.path.exists(self._segment_path(self._generation))
+                and not os.path.exists(self._segment_path(self._generation + 1))):
+            return
+
+        generations = self._generations()
+        generation = generations[-1] if generations else max(1, self._read_snapshot_generation())
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self._segment_path(generation), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._generation = generation
+
+    def start(self):
+        """Start the background flush/compaction thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        last_snapshot = time.time()
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if self.snapshot_interval and time.time() - last_snapshot >= self.snapshot_interval:
+                    last_snapshot = time.time()
+                    self.compact(blocking=False)
+            except Exception as e:
+                logger.error(f"Error in event log writer: {str(e)}")
+
+    def close(self):
+        """Stop the writer thread and flush what is left"""
+        self._stop.set()
+        self.flush()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # Snapshots and recovery -----------------------------------------------
+
+    def _read_snapshot_generation(self):
+        try:
+            with open(self._snapshot_path(), 'rb') as f:
+                magic, generation = _SNAPSHOT_HEADER.unpack(f.read(_SNAPSHOT_HEADER.size))
+            return generation if magic == _SNAPSHOT_MAGIC else 0
+        except (OSError, struct.error):
+            return 0
+
+    def _read_snapshot(self):
+        """Returns: (state, generation) with generation 0 if there is no snapshot"""
+        try:
+            with open(self._snapshot_path(), 'rb') as f:
+                magic, generation = _SNAPSHOT_HEADER.unpack(f.read(_SNAPSHOT_HEADER.size))
+                if magic != _SNAPSHOT_MAGIC:
+                    raise ValueError('Bad snapshot header')
+                return _loads(zlib.decompress(f.read())), generation
+        except FileNotFoundError:
+            return self.new_state(), 0
+
+    def _write_snapshot(self, encoded_state, generation):
+        path = self._snapshot_path()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, generation))
+            f.write(zlib.compress(encoded_state, 1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load(self, below_generation=None):
+        """Load the snapshot and replay every newer generation"""
+        state, snapshot_generation = self._read_snapshot()
+        events = 0
+        apply_event = self.apply_event
+        for generation in self._generations():
+            if generation < snapshot_generation:
+                continue  # Already folded into the snapshot
+            if below_generation is not None and generation >= below_generation:
+                break
+            with open(self._segment_path(generation), 'rb') as f:
+                buffer = f.read()
+            for event_type, timestamp, payload in iter_records(buffer):
+                apply_event(state, event_type, decode_payload(event_type, payload), timestamp)
+                events += 1
+        return state, events
+
+    def recover(self):
+        """
+        Rebuild state from the latest snapshot plus the log tail
+        Returns: (state, stats)
+        """
+        started = time.perf_counter()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+        try:
+            with _gc_paused():
+                state, events = self._load()
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        return state, {'events_replayed': events, 'seconds': round(time.perf_counter() - started, 3)}
+
+    def _has_new_events(self, generations):
+        """True if anything was appended since the last compaction"""
+        with self._buffer_lock:
+            if self._buffer:
+                return True
+        return any(os.path.getsize(self._segment_path(generation)) for generation in generations)
+
+    def _roll(self, generations):
+        """Start the generation after the newest one; returns its number"""
+        generation = (generations[-1] if generations else self._read_snapshot_generation()) + 1
+        os.close(os.open(self._segment_path(generation), os.O_WRONLY | os.O_CREAT, 0o644))
+        return generation
+
+    def compact(self, blocking=True):
+        """
+        Snapshot the state and delete the generations it covers.
+        Skipped when nothing was appended since the last snapshot.
+        Returns: True if a snapshot was written
+        """
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(self._lock_fd, flags)
+        except BlockingIOError:
+            return False  # Another process is compacting
+
+        try:
+            if not self._has_new_events(self._generations()):
+                return False
+
+            # Roll writers onto a fresh generation; the snapshot covers everything before it
+            if self.capture_state is not None:
+                with self.state_lock, self._write_lock:
+                    self._write_buffer()
+                    generations = self._generations()
+                    new_generation = self._roll(generations)
+                    encoded_state = self.capture_state()
+            else:
+                generations = self._generations()
+                new_generation = self._roll(generations)
+                with _gc_paused():
+                    state, _ = self._load(below_generation=new_generation)
+                    encoded_state = json.dumps(state, separators=(',', ':')).encode('utf-8')
+                del state
+
+            self._write_snapshot(encoded_state, new_generation)
+            for generation in generations:
+                os.remove(self._segment_path(generation))
+            return True
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
@@ -0,0 +1,17 @@
+# Gunicorn settings and server hooks (loaded automatically from the working directory)
+
+# gevent worker: an open /ws/game socket parks a greenlet instead of holding
+# one of a few threads, so sockets can't starve HTTP requests
+worker_class = 'gevent'
+worker_connections = 1000
+
+
+def post_worker_init(worker):
+    # Register the socket channel (async workers only), recover the event log
+    # and start background threads in each worker, before it accepts requests
+    # (importing the app starts nothing)
+    from gunicorn.workers.base_async import AsyncWorker
+    from app import init_app, register_channel
+    if isinstance(worker, AsyncWorker):
+        register_channel()
+    init_app()
@@ -0,0 +1,243 @@
+import os
+import random
+import threading
+
+
+class _SkipNode:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """
+    Sorted skip list whose links carry their span, so insert, remove,
+    rank lookup and access by rank are all O(log n) on average.
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self):
+        self.head = _SkipNode(None, self.MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.25:
+            level += 1
+        return level
+
+    def insert(self, key):
+        """Insert a key (keys must be unique and comparable)"""
+        update = [self.head] * self.MAX_LEVEL
+        steps = [0] * self.MAX_LEVEL
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            steps[i] = steps[i + 1] if i + 1 < self.level else 0
+            while node.next[i] is not None and node.next[i].key < key:
+                steps[i] += node.width[i]
+                node = node.next[i]
+            update[i] = node
+
+        new_level = self._random_level()
+        if new_level > self.level:
+            for i in range(self.level, new_level):
+                update[i] = self.head
+                steps[i] = 0
+                self.head.width[i] = self.size + 1
+            self.level = new_level
+
+        new_node = _SkipNode(key, new_level)
+        position = steps[0]
+        for i in range(new_level):
+            new_node.next[i] = update[i].next[i]
+            update[i].next[i] = new_node
+            # Split the span of the predecessor around the new node
+            new_node.width[i] = update[i].width[i] - (position - steps[i])
+            update[i].width[i] = position - steps[i] + 1
+        for i in range(new_level, self.level):
+            update[i].width[i] += 1
+
+        self.size += 1
+
+    def remove(self, key):
+        """Remove a key; returns True if it was present"""
+        update = [self.head] * self.MAX_LEVEL
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            return False
+
+        for i in range(self.level):
+            if update[i].next[i] is target:
+                update[i].next[i] = target.next[i]
+                update[i].width[i] += target.width[i] - 1
+            else:
+                update[i].width[i] -= 1
+
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def rank(self, key):
+        """Get the 0-based rank of a key, or None if missing"""
+        position = 0
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key <= key:
+                position += node.width[i]
+                node = node.next[i]
+        if node is not self.head and node.key == key:
+            return position - 1
+        return None
+
+    def slice(self, start, count):
+        """Get up to count keys starting at 0-based rank start"""
+        if start >= self.size or count <= 0:
+            return []
+
+        # Walk down the express lanes to the node just before `start`
+        position = 0
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and position + node.width[i] <= start:
+                position += node.width[i]
+                node = node.next[i]
+
+        keys = []
+        node = node.next[0]
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class InMemoryLeaderboard:
+    """
+    Per-process leaderboard keeping each user's best (lowest) time per board.
+    Boards are named like 'difficulty:medium' or 'daily:2025-01-31'.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards = {}
+        self._best = {}
+        self._names = {}
+
+    def submit(self, board, user_id, time_taken, name=None):
+        """
+        Record a completion time, keeping only the user's best
+        Returns: the user's best time on this board
+        """
+        with self._lock:
+            if name:
+                self._names[user_id] = name
+
+            index = self._boards.setdefault(board, IndexableSkipList())
+            best = self._best.setdefault(board, {})
+
+            previous = best.get(user_id)
+            if previous is not None:
+                if previous <= time_taken:
+                    return previous
+                index.remove((previous, user_id))
+
+            index.insert((time_taken, user_id))
+            best[user_id] = time_taken
+            return time_taken
+
+    def top(self, board, limit=10, offset=0):
+        """Get [(user_id, time)] ordered fastest first"""
+        with self._lock:
+            index = self._boards.get(board)
+            if index is None:
+                return []
+            return [(user_id, time_taken) for time_taken, user_id in index.slice(offset, limit)]
+
+    def rank(self, board, user_id):
+        """Get (1-based rank, best time) for a user, or None"""
+        with self._lock:
+            time_taken = self._best.get(board, {}).get(user_id)
+            if time_taken is None:
+                return None
+            return self._boards[board].rank((time_taken, user_id)) + 1, time_taken
+
+    def size(self, board):
+        with self._lock:
+            index = self._boards.get(board)
+            return len(index) if index is not None else 0
+
+    def get_name(self, user_id):
+        return self._names.get(user_id)
+
+
+class RedisLeaderboard:
+    """
+    Leaderboard stored in Redis sorted sets so every worker shares it.
+    ZADD/ZRANK/ZRANGE are all O(log n).
+    """
+
+    def __init__(self, url, prefix='sudoku:leaderboard'):
+        import redis  # Optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def _key(self, board):
+        return f'{self.prefix}:{board}'
+
+    def submit(self, board, user_id, time_taken, name=None):
+        key = self._key(board)
+        pipe = self.client.pipeline()
+        if name:
+            pipe.hset(f'{self.prefix}:names', user_id, name)
+        # LT only ever lowers an existing score, keeping the user's best time
+        pipe.zadd(key, {user_id: time_taken}, lt=True)
+        pipe.zscore(key, user_id)
+        return pipe.execute()[-1]
+
+    def top(self, board, limit=10, offset=0):
+        if limit <= 0:
+            return []
+        entries = self.client.zrange(self._key(board), offset, offset + limit - 1, withscores=True)
+        return [(user_id, score) for user_id, score in entries]
+
+    def rank(self, board, user_id):
+        key = self._key(board)
+        pipe = self.client.pipeline()
+        pipe.zrank(key, user_id)
+        pipe.zscore(key, user_id)
+        position, time_taken = pipe.execute()
+        if position is None:
+            return None
+        return position + 1, time_taken
+
+    def size(self, board):
+        return self.client.zcard(self._key(board))
+
+    def get_name(self, user_id):
+        return self.client.hget(f'{self.prefix}:names', user_id)
+
+
+def create_leaderboard():
+    """
+    Create the leaderboard backend selected by LEADERBOARD_BACKEND
+    ('memory' or 'redis', using REDIS_URL)
+    """
+    backend = os.environ.get('LEADERBOARD_BACKEND', 'memory')
+    if backend == 'redis':
+        return RedisLeaderboard(os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+    return InMemoryLeaderboard()
@@ -0,0 +1,119 @@
+import re
+import random
+import threading
+from collections import OrderedDict
+
+from serializers import dumps, encode_board
+
+# Bump when puzzle generation changes so cached packs are never reused
+PACK_VERSION = 'v1'
+PACK_ID_PATTERN = re.compile(r'^v1\.(easy|medium|hard|expert)\.(\d{1,2})\.(\d{1,6})$')
+MAX_PACK_SIZE = 50
+
+
+def make_pack_id(difficulty, count, number):
+    return f'{PACK_VERSION}.{difficulty}.{count}.{number}'
+
+
+def parse_pack_id(pack_id):
+    """
+    Parse a pack ID into its parts
+    Returns: (difficulty, count, number) or None if invalid
+    """
+    match = PACK_ID_PATTERN.match(pack_id or '')
+    if not match:
+        return None
+    difficulty, count, number = match.group(1), int(match.group(2)), int(match.group(3))
+    if not 1 <= count <= MAX_PACK_SIZE:
+        return None
+    return difficulty, count, number
+
+
+class PuzzlePacks:
+    """
+    Deterministic batches of puzzles for offline play.
+
+    A pack ID fully determines its puzzles (each one is generated from the
+    seed '<pack_id>:<index>'), so a pack's response never changes and can be
+    cached forever by the browser, service worker or a CDN. Clients are
+    handed packs from a bounded pool so caches are shared between players.
+    """
+
+    def __init__(self, solver, pool_size=100, cache_size=64):
+        self.solver = solver
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def random_pack_id(self, difficulty, count):
+        return make_pack_id(difficulty, count, random.randrange(self.pool_size))
+
+    def parse(self, pack_id):
+        """
+        Parse a pack ID from the pool; numbers outside it are rejected so
+        arbitrary IDs can't each cost a pack's worth of generation
+        Returns: (difficulty, count, number) or None if invalid
+        """
+        parsed = parse_pack_id(pack_id)
+        if parsed is None or parsed[2] >= self.pool_size:
+            return None
+        return parsed
+
+    def get_pack(self, pack_id):
+        """
+        Get a serialized pack
+        Returns: {'body': bytes, 'etag': str, 'puzzles': [...]} or None for invalid IDs
+        """
+        with self._lock:
+            pack = self._cache.get(pack_id)
+            if pack is not None:
+                self._cache.move_to_end(pack_id)
+                return pack
+
+        parsed = self.parse(pack_id)
+        if parsed is None:
+            return None
+        difficulty, count, _ = parsed
+
+        puzzles = [self._generate(pack_id, index, difficulty) for index in range(count)]
+        body = dumps({
+            'pack_id': pack_id,
+            'difficulty': difficulty,
+            'encoding': 'compact',
+            'puzzles': [[encode_board(puzzle), encode_board(solution)] for puzzle, solution in puzzles]
+        })
+        import hashlib  # Deferred to keep it out of cold-start imports
+
+        pack = {
+            'body': body,
+            'etag': hashlib.sha256(body).hexdigest()[:32],
+            'puzzles': puzzles
+        }
+
+        with self._lock:
+            self._cache[pack_id] = pack
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return pack
+
+    def get_puzzle(self, pack_id, index):
+        """
+        Get one (puzzle, solution) from a pack, without generating the
+        whole pack when it isn't cached
+        Returns: (puzzle, solution, difficulty) or None if invalid
+        """
+        parsed = self.parse(pack_id)
+        if parsed is None or not isinstance(index, int) or not 0 <= index < parsed[1]:
+            return None
+
+        with self._lock:
+            pack = self._cache.get(pack_id)
+        if pack is not None:
+            puzzle, solution = pack['puzzles'][index]
+        else:
+            puzzle, solution = self._generate(pack_id, index, parsed[0])
+        return [row[:] for row in puzzle], solution, parsed[0]
+
+    def _generate(self, pack_id, index, difficulty):
+        return self.solver.generate_puzzle_with_seed(f'{pack_id}:{index}', difficulty)
@@ -0,0 +1,191 @@
+import time
+import uuid
+import queue
+import threading
+import logging
+
+from serializers import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """
+    Outbound message queue for one connection. The connection's own thread
+    drains it, so broadcasts never block on a slow socket.
+    """
+
+    def __init__(self, user_id, max_pending=100):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self._queue = queue.SimpleQueue()
+
+    def push(self, message):
+        # Progress snapshots supersede each other, so a backed-up client
+        # loses intermediate ones instead of growing an unbounded queue
+        if self._queue.qsize() < self.max_pending:
+            self._queue.put(message)
+
+    def drain(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+
+class RaceRoom:
+    """Players racing on one seeded puzzle"""
+
+    def __init__(self, race_id, seed, difficulty, puzzle, solution):
+        self.race_id = race_id
+        self.seed = seed
+        self.difficulty = difficulty
+        self.puzzle = puzzle
+        self.solution = solution
+        self.created_at = time.time()
+        self.empty_cells = sum(1 for row in puzzle for cell in row if cell == 0)
+
+        self.players = {}
+        self.finish_order = []
+        self.subscribers = set()
+        self.dirty = False
+
+    def snapshot(self):
+        players = sorted(
+            self.players.values(),
+            key=lambda p: (p['finish_position'] or len(self.players) + 1, -p['progress'])
+        )
+        return {
+            'type': 'race_progress',
+            'race_id': self.race_id,
+            'players': players,
+            'finished': len(self.finish_order)
+        }
+
+
+class RaceHub:
+    """
+    Race rooms for this worker plus a single broadcaster thread.
+
+    Progress updates only mark a room dirty; every `tick` seconds the
+    broadcaster serializes each dirty room once and hands the same message
+    to all of its subscribers, so a burst of moves costs one encode per
+    room per tick rather than one per player per move.
+    """
+
+    def __init__(self, tick=0.1, room_ttl=6 * 3600):
+        self.tick = tick
+        self.room_ttl = room_ttl
+        self.rooms = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.messages_sent = 0
+
+    def create_room(self, difficulty, generate):
+        """Create a race on a fresh seed; generate(seed, difficulty) -> (puzzle, solution)"""
+        race_id = uuid.uuid4().hex[:8]
+        seed = f'race-{race_id}'
+        puzzle, solution = generate(seed, difficulty)
+        room = RaceRoom(race_id, seed, difficulty, puzzle, solution)
+        with self._lock:
+            self._expire_rooms()
+            self.rooms[race_id] = room
+        return room
+
+    def get_room(self, race_id):
+        return self.rooms.get(race_id)
+
+    def join(self, race_id, user_id, name):
+        with self._lock:
+            room = self.rooms.get(race_id)
+            if room is None:
+                return None
+            if user_id not in room.players:
+                room.players[user_id] = {
+                    'name': name,
+                    'progress': 0.0,
+                    'finish_position': None,
+                    'finish_time': None
+                }
+                room.dirty = True
+        return room
+
+    def update_progress(self, race_id, user_id, board, is_complete):
+        """Record a player's progress; correct cells only, so guesses don't count"""
+        with self._lock:
+            room = self.rooms.get(race_id)
+            if room is None or user_id not in room.players:
+                return
+            player = room.players[user_id]
+            if player['finish_position'] is not None:
+                return
+
+            correct = 0
+            for r, row in enumerate(board):
+                puzzle_row = room.puzzle[r]
+                solution_row = room.solution[r]
+                for c, value in enumerate(row):
+                    if puzzle_row[c] == 0 and value == solution_row[c]:
+                        correct += 1
+            player['progress'] = round(correct / room.empty_cells * 100, 1) if room.empty_cells else 100.0
+
+            if is_complete:
+                room.finish_order.append(user_id)
+                player['finish_position'] = len(room.finish_order)
+                player['finish_time'] = round(time.time() - room.created_at, 2)
+            room.dirty = True
+
+    def subscribe(self, race_id, subscriber):
+        with self._lock:
+            room = self.rooms.get(race_id)
+            if room is None:
+                return False
+            room.subscribers.add(subscriber)
+            room.dirty = True
+        self._ensure_broadcaster()
+        return True
+
+    def unsubscribe(self, race_id, subscriber):
+        with self._lock:
+            room = self.rooms.get(race_id)
+            if room is not None:
+                room.subscribers.discard(subscriber)
+
+    def broadcast_dirty(self):
+        """Send one progress snapshot to every subscriber of each dirty room"""
+        with self._lock:
+            pending = []
+            for room in self.rooms.values():
+                if room.dirty:
+                    room.dirty = False
+                    pending.append((dumps(room.snapshot()).decode('utf-8'), list(room.subscribers)))
+
+        sent = 0
+        for message, subscribers in pending:
+            for subscriber in subscribers:
+                subscriber.push(message)
+            sent += len(subscribers)
+        self.messages_sent += sent
+        return sent
+
+    def _ensure_broadcaster(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='race-broadcaster', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.tick)
+            try:
+                self.broadcast_dirty()
+            except Exception as e:
+                logger.error(f"Error broadcasting race progress: {str(e)}")
+
+    def _expire_rooms(self):
+        cutoff = time.time() - self.room_ttl
+        for race_id in [r for r, room in self.rooms.items() if room.created_at < cutoff and not room.subscribers]:
+            del self.rooms[race_id]
@@ -0,0 +1,179 @@
+import os
+import time
+import threading
+import logging
+from collections import defaultdict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfiler:
+    """
+    Opt-in sampling profiler for live Flask workers.
+
+    Profiles one request in every `sample_rate` and/or every request slower
+    than `slow_ms`. Kept profiles are written as pstats files to a rotating
+    directory and aggregated per route for a hot-function report.
+    """
+
+    def __init__(self, sample_rate=0, slow_ms=0, output_dir='logs/profiles',
+                 max_files=200, window_seconds=300, max_profiles_per_route=100):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self.window_seconds = window_seconds
+        self.max_profiles_per_route = max_profiles_per_route
+
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._profiles = defaultdict(lambda: deque(maxlen=self.max_profiles_per_route))
+
+    @classmethod
+    def from_env(cls):
+        """Build a profiler from PROFILE_* environment variables"""
+        return cls(
+            sample_rate=int(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+            slow_ms=float(os.environ.get('PROFILE_SLOW_MS', 0)),
+            output_dir=os.environ.get('PROFILE_DIR', 'logs/profiles'),
+            max_files=int(os.environ.get('PROFILE_MAX_FILES', 200)),
+            window_seconds=int(os.environ.get('PROFILE_WINDOW_SECONDS', 300))
+        )
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0 or self.slow_ms > 0
+
+    def configure(self, sample_rate=None, slow_ms=None, window_seconds=None):
+        """Update sampling settings at runtime (affects this worker only)"""
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = max(0, int(sample_rate))
+            if slow_ms is not None:
+                self.slow_ms = max(0.0, float(slow_ms))
+            if window_seconds is not None:
+                self.window_seconds = max(1, int(window_seconds))
+
+    def start(self):
+        """
+        Start profiling the current request if it is selected
+        Returns: (profile, sampled) or (None, False) if not profiled
+        """
+        if not self.enabled:
+            return None, False
+
+        with self._lock:
+            self._request_count += 1
+            sampled = self.sample_rate > 0 and self._request_count % self.sample_rate == 0
+
+        # A slow threshold can only be judged afterwards, so every request is
+        # profiled while it is set and only the slow ones are kept.
+        if not sampled and self.slow_ms <= 0:
+            return None, False
+
+        import cProfile  # Imported on first use so disabled profiling costs nothing at startup
+
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile, sampled
+
+    def finish(self, profile, sampled, route, elapsed_seconds):
+        """Stop profiling and keep the result if it was sampled or slow"""
+        profile.disable()
+
+        elapsed_ms = elapsed_seconds * 1000
+        is_slow = self.slow_ms > 0 and elapsed_ms >= self.slow_ms
+        if not sampled and not is_slow:
+            return None
+
+        import pstats
+
+        stats = pstats.Stats(profile)
+        with self._lock:
+            self._profiles[route].append((time.time(), self._summarize(stats)))
+
+        try:
+            return self._write(stats, route, elapsed_ms)
+        except OSError as e:
+            logger.error(f"Error writing profile: {str(e)}")
+            return None
+
+    def _summarize(self, stats):
+        """Reduce pstats data to {function: (calls, tottime, cumtime)}"""
+        summary = {}
+        for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+            summary[f'{name} ({os.path.basename(filename)}:{line})'] = (nc, tt, ct)
+        return summary
+
+    def _write(self, stats, route, elapsed_ms):
+        """Dump a pstats file and rotate out the oldest ones"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_route = route.strip('/').replace('/', '_').replace('<', '').replace('>', '') or 'index'
+        filename = f'{int(time.time() * 1000)}-{os.getpid()}-{safe_route}-{int(elapsed_ms)}ms.prof'
+        path = os.path.join(self.output_dir, filename)
+        stats.dump_stats(path)
+        self._rotate()
+        return path
+
+    def _rotate(self):
+        """Keep at most max_files profiles in the output directory"""
+        files = sorted(
+            os.path.join(self.output_dir, f)
+            for f in os.listdir(self.output_dir) if f.endswith('.prof')
+        )
+        for path in files[:max(0, len(files) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def hot_functions(self, route=None, limit=10, sort_by='tottime'):
+        """
+        Get the hottest functions per route over the recent time window
+        Returns: {route: {'profiles': n, 'functions': [...]}}
+        """
+        sort_index = 2 if sort_by == 'cumtime' else 1
+        cutoff = time.time() - self.window_seconds
+        report = {}
+
+        with self._lock:
+            routes = [route] if route else list(self._profiles.keys())
+            for name in routes:
+                entries = [summary for ts, summary in self._profiles.get(name, ()) if ts >= cutoff]
+                if not entries:
+                    continue
+
+                totals = defaultdict(lambda: [0, 0.0, 0.0])
+                for summary in entries:
+                    for func, (calls, tottime, cumtime) in summary.items():
+                        total = totals[func]
+                        total[0] += calls
+                        total[1] += tottime
+                        total[2] += cumtime
+
+                top = sorted(totals.items(), key=lambda item: item[1][sort_index], reverse=True)[:limit]
+                report[name] = {
+                    'profiles': len(entries),
+                    'functions': [
+                        {
+                            'function': func,
+                            'calls': calls,
+                            'tottime_ms': round(tottime * 1000, 3),
+                            'cumtime_ms': round(cumtime * 1000, 3)
+                        }
+                        for func, (calls, tottime, cumtime) in top
+                    ]
+                }
+
+        return report
+
+    def get_config(self):
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'slow_ms': self.slow_ms,
+            'output_dir': self.output_dir,
+            'max_files': self.max_files,
+            'window_seconds': self.window_seconds,
+            'pid': os.getpid()
+        }
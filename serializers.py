@@ -0,0 +1,100 @@
+import os
+import json
+from itertools import chain
+from flask import Response
+
+# Clients opt into the compact board encoding with this Accept type
+# (or the X-API-Version: 2 header)
+COMPACT_MEDIA_TYPE = 'application/vnd.sudoku.compact+json'
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _load_backend(preferred=None):
+    """
+    Pick the fastest installed JSON encoder (orjson, then ujson, then json).
+    JSON_BACKEND forces a specific one.
+    Returns: (name, dumps) where dumps returns bytes
+    """
+    candidates = [preferred] if preferred else ['orjson', 'ujson', 'json']
+    for name in candidates:
+        if name == 'orjson':
+            try:
+                import orjson
+                return 'orjson', orjson.dumps
+            except ImportError:
+                continue
+        if name == 'ujson':
+            try:
+                import ujson
+                return 'ujson', lambda obj: ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+            except ImportError:
+                continue
+        if name == 'json':
+            return 'json', _stdlib_dumps
+    return 'json', _stdlib_dumps
+
+
+# Resolved once at import, so `from serializers import dumps` binds the encoder itself
+BACKEND_NAME, dumps = _load_backend(os.environ.get('JSON_BACKEND'))
+
+
+def json_response(payload, status=200):
+    """Build a JSON response with the selected backend"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+# Maps cell values 0-25 to base-36 digits in one bytes.translate pass
+# (a 9x9 board only ever uses '0'-'9')
+_DIGITS = b'0123456789abcdefghijklmnop' + bytes(230)
+
+
+def encode_board(board):
+    """Encode a board as one base-36 digit per cell, row by row (0 = empty)"""
+    return bytes(chain.from_iterable(board)).translate(_DIGITS).decode('ascii')
+
+
+def decode_board(encoded, size=9):
+    """Decode a digit string back into a size x size board"""
+    return [[int(ch, 36) for ch in encoded[i:i + size]] for i in range(0, size * size, size)]
+
+
+def encode_notes(notes):
+    """Encode note lists as one bitmask per cell (bit n set = note n)"""
+    masks = []
+    for row in notes:
+        for cell in row:
+            mask = 0
+            for number in cell:
+                mask |= 1 << number
+            masks.append(mask)
+    return masks
+
+
+def decode_notes(masks, size=9):
+    """Decode per-cell bitmasks back into size x size note lists"""
+    cells = [[number for number in range(1, size + 1) if mask >> number & 1] for mask in masks]
+    return [cells[i:i + size] for i in range(0, size * size, size)]
+
+
+def wants_compact(request):
+    """Check whether the client opted into the compact board encoding"""
+    return (COMPACT_MEDIA_TYPE in request.headers.get('Accept', '')
+            or request.headers.get('X-API-Version') == '2')
+
+
+def board_response(payload, compact=False, status=200):
+    """
+    Serialize a response carrying 'current_board' and 'notes',
+    switching both to the compact wire encoding when requested
+    """
+    if compact:
+        payload = dict(payload)
+        payload['current_board'] = encode_board(payload['current_board'])
+        payload['notes'] = encode_notes(payload['notes'])
+        payload['encoding'] = 'compact'
+    response = json_response(payload, status)
+    response.headers['Vary'] = 'Accept, X-API-Version'
+    return response
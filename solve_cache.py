@@ -0,0 +1,212 @@
+import time
+import threading
+from itertools import permutations, product
+from collections import OrderedDict
+
+
+def _ranks(items):
+    """Replace each item by the rank of its value among the distinct values"""
+    order = {value: rank for rank, value in enumerate(sorted(set(items)))}
+    return [order[item] for item in items]
+
+
+def _refine(view, box_size):
+    """
+    Colour rows and columns by the clue pattern until the colouring is
+    stable. A row's colour combines its band's colours with the colours of
+    the columns (and stacks) holding its clues, and vice versa, so the
+    colouring is invariant under every symmetry transform.
+    Returns: (row_colors, col_colors)
+    """
+    size = len(view)
+    filled = [[c for c in range(size) if view[r][c]] for r in range(size)]
+    filled_cols = [[r for r in range(size) if view[r][c]] for c in range(size)]
+    row_color = [0] * size
+    col_color = [0] * size
+    distinct = 0
+
+    while True:
+        band_color = [tuple(sorted(row_color[b * box_size:(b + 1) * box_size])) for b in range(box_size)]
+        stack_color = [tuple(sorted(col_color[b * box_size:(b + 1) * box_size])) for b in range(box_size)]
+        row_color, col_color = (
+            _ranks([(row_color[r], band_color[r // box_size],
+                     tuple(sorted((col_color[c], stack_color[c // box_size]) for c in filled[r])))
+                    for r in range(size)]),
+            _ranks([(col_color[c], stack_color[c // box_size],
+                     tuple(sorted((row_color[r], band_color[r // box_size]) for r in filled_cols[c])))
+                    for c in range(size)])
+        )
+        count = len(set(row_color)) + len(set(col_color))
+        if count == distinct:
+            return row_color, col_color
+        distinct = count
+
+
+def _orders(colors, box_size):
+    """
+    All line orders that sort bands (or stacks) and the lines within them by
+    colour, with every permutation of tied bands and tied lines
+    """
+    groups = []
+    for b in range(box_size):
+        lines = sorted(range(b * box_size, (b + 1) * box_size), key=lambda line: colors[line])
+        # Orders of this band's lines: tied lines may come in any order
+        choices = [[]]
+        for _, tied in _tied(lines, lambda line: colors[line]):
+            choices = [order + list(perm) for order in choices for perm in permutations(tied)]
+        groups.append((tuple(sorted(colors[line] for line in lines)), choices))
+
+    orders = []
+    bands = sorted(range(box_size), key=lambda b: groups[b][0])
+    band_orders = [[]]
+    for _, tied in _tied(bands, lambda b: groups[b][0]):
+        band_orders = [order + list(perm) for order in band_orders for perm in permutations(tied)]
+    for band_order in band_orders:
+        for parts in product(*(groups[b][1] for b in band_order)):
+            orders.append([line for part in parts for line in part])
+    return orders
+
+
+def _tied(items, key):
+    """Split a sorted list into runs of equal key"""
+    runs = []
+    for item in items:
+        if runs and runs[-1][0] == key(item):
+            runs[-1][1].append(item)
+        else:
+            runs.append((key(item), [item]))
+    return runs
+
+
+def canonicalize(board, max_states=2000):
+    """
+    Map a board (0 = empty) to a canonical representative of its symmetry
+    class: digit relabelling, row permutations within bands, band swaps,
+    column permutations within stacks, stack swaps and transposition.
+
+    Rows and columns are first coloured by an invariant refinement of the
+    clue pattern and sorted by colour, so only transforms that permute tied
+    rows or columns (and the transposition) remain. The representative is
+    the smallest of their relabelled boards, with digits renumbered in order
+    of first appearance. Boards with too many ties (e.g. nearly empty ones)
+    give up after max_states candidates and return None.
+
+    Returns: (key, transform) or None, where key is a tuple of the canonical
+    cells and transform is (transposed, row_order, col_order, labels) with
+    labels mapping original digits to canonical ones.
+    """
+    size = len(board)
+    box_size = int(round(size ** 0.5))
+    views = (board, [list(col) for col in zip(*board)])
+
+    best = None
+    for transposed, view in enumerate(views):
+        row_colors, col_colors = _refine(view, box_size)
+        row_orders = _orders(row_colors, box_size)
+        col_orders = _orders(col_colors, box_size)
+        if len(row_orders) * len(col_orders) > max_states:
+            return None
+
+        for row_order in row_orders:
+            for col_order in col_orders:
+                labels = {}
+                cells = []
+                for r in row_order:
+                    values = view[r]
+                    for c in col_order:
+                        value = values[c]
+                        if value:
+                            label = labels.get(value)
+                            if label is None:
+                                label = labels[value] = len(labels) + 1
+                            value = label
+                        cells.append(value)
+                cells = tuple(cells)
+                if best is None or cells < best[0]:
+                    best = (cells, (transposed, row_order, col_order, labels))
+    return best
+
+
+def from_canonical(solution, transform):
+    """Map a solution of the canonical board back onto the original board"""
+    transposed, row_order, col_order, labels = transform
+    size = len(solution)
+
+    # Digits missing from the original board take the unused labels in order
+    digits = dict((label, value) for value, label in labels.items())
+    missing = [d for d in range(1, size + 1) if d not in labels]
+    for label in range(len(labels) + 1, size + 1):
+        digits[label] = missing[label - len(labels) - 1]
+
+    mapped = [[0] * size for _ in range(size)]
+    for i, row in enumerate(row_order):
+        for j, col in enumerate(col_order):
+            r, c = (col, row) if transposed else (row, col)
+            mapped[r][c] = digits[solution[i][j]]
+    return mapped
+
+
+class SolveCache:
+    """
+    Bounded LRU of solutions keyed by canonical board, so relabelled,
+    permuted or transposed copies of a solved board are not solved again.
+    """
+
+    def __init__(self, max_entries=4096, max_states=2000):
+        self.max_entries = max_entries
+        self.max_states = max_states
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.canonicalize_seconds = 0.0
+
+    def solve(self, solver, board, max_nodes=None):
+        """
+        Solve through the cache
+        Returns: solved board or None if unsolvable
+        Raises: SearchLimitReached if the search gave up
+        """
+        start = time.perf_counter()
+        canonical = canonicalize(board, self.max_states)
+        self.canonicalize_seconds += time.perf_counter() - start
+
+        if canonical is None:
+            self.skipped += 1
+            return solver.solve(board, max_nodes=max_nodes)
+
+        key, transform = canonical
+        with self._lock:
+            solution = self._cache.get(key)
+            if solution is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if solution is not None:
+            return from_canonical(solution, transform)
+
+        self.misses += 1
+        size = len(board)
+        canonical_board = [list(key[i:i + size]) for i in range(0, size * size, size)]
+        solution = solver.solve(canonical_board, max_nodes=max_nodes)
+        if solution is None:
+            return None
+
+        with self._lock:
+            self._cache[key] = solution
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return from_canonical(solution, transform)
+
+    def get_stats(self):
+        lookups = self.hits + self.misses + self.skipped
+        return {
+            'entries': len(self._cache),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'skipped': self.skipped,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'avg_canonicalize_ms': round(self.canonicalize_seconds / lookups * 1000, 3) if lookups else 0.0
+        }
@@ -0,0 +1,1193 @@
+class SudokuPro {
+    constructor() {
+        this.gameState = {
+            gameId: null,
+            difficulty: 'medium',
+            board: [],
+            solution: [],
+            originalBoard: [],
+            notes: [],
+            selectedCell: null,
+            gameStartTime: null,
+            timerInterval: null,
+            isGameComplete: false,
+            hintsUsed: 0,
+            maxHints: 5,
+            movesHistory: [],
+            redoStack: [],
+            isNoteMode: false,
+            autoCheck: true,
+            raceId: new URLSearchParams(window.location.search).get('race'),
+            isLocal: false
+        };
+        
+        // Prefetched puzzle packs, dealt from localStorage so play continues offline
+        this.packStorageKey = 'sudokuProPuzzlePacks';
+        this.packSize = 20;
+        this.packRefillAt = 5;
+        this.packFetches = {};
+        
+        // Persistent move channel (WebSocket), used when the server offers it.
+        // socket is set on creation, channel only once it is open; each socket
+        // keeps its own pending acks so a stale one can't reject the current ones
+        this.socket = null;
+        this.channel = null;
+        this.channelSeq = 0;
+        this.pendingAcks = new Map();
+        
+        this.settings = {
+            theme: 'light',
+            animations: true,
+            autoCheck: true,
+            sound: true
+        };
+        
+        this.initializeElements();
+        this.bindEvents();
+        this.loadSettings();
+        this.applyTheme();
+    }
+    
+    initializeElements() {
+        // Welcome screen elements
+        this.welcomeScreen = document.getElementById('welcomeScreen');
+        this.gameInterface = document.getElementById('gameInterface');
+        this.continueBtn = document.getElementById('continueBtn');
+        
+        // Game interface elements
+        this.boardElement = document.getElementById('sudokuBoard');
+        this.timerElement = document.getElementById('timer');
+        this.statusMessage = document.getElementById('statusMessage');
+        this.progressFill = document.getElementById('progressFill');
+        this.progressText = document.getElementById('progressText');
+        
+        // Header elements
+        this.gameModeTitle = document.getElementById('gameModeTitle');
+        this.difficultyBadge = document.getElementById('difficultyBadge');
+        this.backBtn = document.getElementById('backBtn');
+        this.statsBtn = document.getElementById('statsBtn');
+        this.settingsBtn = document.getElementById('settingsBtn');
+        
+        // Control elements
+        this.difficultySelect = document.getElementById('difficulty');
+        this.newGameBtn = document.getElementById('newGameBtn');
+        this.undoBtn = document.getElementById('undoBtn');
+        this.redoBtn = document.getElementById('redoBtn');
+        this.hintBtn = document.getElementById('hintBtn');
+        this.hintCount = document.getElementById('hintCount');
+        this.checkBtn = document.getElementById('checkBtn');
+        
+        // Number pad elements
+        this.numberBtns = document.querySelectorAll('.number-btn');
+        this.noteBtn = document.getElementById('noteBtn');
+        
+        // Modal elements
+        this.instructionsModal = document.getElementById('instructionsModal');
+        this.winModal = document.getElementById('winModal');
+        this.statsModal = document.getElementById('statsModal');
+        this.settingsModal = document.getElementById('settingsModal');
+        this.errorModal = document.getElementById('errorModal');
+        this.loadingOverlay = document.getElementById('loadingOverlay');
+        
+        // Modal buttons
+        this.startGameBtn = document.getElementById('startGameBtn');
+        this.playAgainBtn = document.getElementById('playAgainBtn');
+        this.shareBtn = document.getElementById('shareBtn');
+        this.closeStatsBtn = document.getElementById('closeStatsBtn');
+        this.closeSettingsBtn = document.getElementById('closeSettingsBtn');
+        this.saveSettingsBtn = document.getElementById('saveSettingsBtn');
+        this.closeErrorBtn = document.getElementById('closeErrorBtn');
+        
+        // Win modal elements
+        this.finalTime = document.getElementById('finalTime');
+        this.finalHints = document.getElementById('finalHints');
+        this.finalDifficulty = document.getElementById('finalDifficulty');
+        
+        // Stats modal elements
+        this.totalGames = document.getElementById('totalGames');
+        this.completedGames = document.getElementById('completedGames');
+        this.totalTime = document.getElementById('totalTime');
+        this.totalHints = document.getElementById('totalHints');
+        this.bestTimesList = document.getElementById('bestTimesList');
+        
+        // Settings elements
+        this.themeSelect = document.getElementById('themeSelect');
+        this.animationToggle = document.getElementById('animationToggle');
+        this.autoCheckToggle = document.getElementById('autoCheckToggle');
+        this.soundToggle = document.getElementById('soundToggle');
+        
+        // Error modal elements
+        this.errorMessage = document.getElementById('errorMessage');
+    }
+    
+    bindEvents() {
+        // Welcome screen events
+        this.continueBtn.addEventListener('click', () => this.startGame());
+        
+        // Game interface events
+        this.backBtn.addEventListener('click', () => this.showWelcomeScreen());
+        this.statsBtn.addEventListener('click', () => this.showStats());
+        this.settingsBtn.addEventListener('click', () => this.showSettings());
+        
+        // Control events
+        this.difficultySelect.addEventListener('change', (e) => {
+            this.gameState.difficulty = e.target.value;
+            this.showInstructions();
+        });
+        this.newGameBtn.addEventListener('click', () => this.showInstructions());
+        this.undoBtn.addEventListener('click', () => this.undoMove());
+        this.redoBtn.addEventListener('click', () => this.redoMove());
+        this.hintBtn.addEventListener('click', () => this.getHint());
+        this.checkBtn.addEventListener('click', () => this.checkSolution());
+        
+        // Number pad events
+        this.numberBtns.forEach(btn => {
+            btn.addEventListener('click', () => {
+                const number = parseInt(btn.dataset.number);
+                this.makeMove(number);
+            });
+        });
+        this.noteBtn.addEventListener('click', () => this.toggleNoteMode());
+        
+        // Modal events
+        this.startGameBtn.addEventListener('click', () => {
+            this.hideModal(this.instructionsModal);
+            this.startNewGame();
+        });
+        this.playAgainBtn.addEventListener('click', () => {
+            this.hideModal(this.winModal);
+            this.showInstructions();
+        });
+        this.shareBtn.addEventListener('click', () => this.shareResult());
+        this.closeStatsBtn.addEventListener('click', () => this.hideModal(this.statsModal));
+        this.closeSettingsBtn.addEventListener('click', () => this.hideModal(this.settingsModal));
+        this.saveSettingsBtn.addEventListener('click', () => this.saveSettings());
+        this.closeErrorBtn.addEventListener('click', () => this.hideModal(this.errorModal));
+        
+        // Keyboard events
+        document.addEventListener('keydown', (e) => this.handleKeyPress(e));
+        
+        // Click outside modal to close
+        [this.instructionsModal, this.winModal, this.statsModal, this.settingsModal, this.errorModal].forEach(modal => {
+            modal.addEventListener('click', (e) => {
+                if (e.target === modal) {
+                    this.hideModal(modal);
+                }
+            });
+        });
+    }
+    
+    startGame() {
+        this.hideWelcomeScreen();
+        this.showGameInterface();
+        this.showInstructions();
+    }
+    
+    showWelcomeScreen() {
+        this.welcomeScreen.style.display = 'flex';
+        this.gameInterface.style.display = 'none';
+        this.resetGameState();
+    }
+    
+    hideWelcomeScreen() {
+        this.welcomeScreen.style.display = 'none';
+        this.gameInterface.style.display = 'flex';
+    }
+    
+    showGameInterface() {
+        this.gameInterface.style.display = 'flex';
+        this.updateGameModeTitle();
+    }
+    
+    updateGameModeTitle() {
+        this.gameModeTitle.textContent = 'Sudoku Pro';
+    }
+    
+    showInstructions() {
+        this.showModal(this.instructionsModal);
+    }
+    
+    async startNewGame() {
+        try {
+            this.showLoading(true);
+            this.resetGameState();
+            
+            const dealt = this.gameState.raceId ? null : this.dealFromPack(this.gameState.difficulty);
+            this.prefetchPack(this.gameState.difficulty);
+            
+            if (dealt && !navigator.onLine) {
+                this.startLocalGame(dealt);
+                return;
+            }
+            
+            const url = this.gameState.raceId
+                ? `/api/race/${encodeURIComponent(this.gameState.raceId)}/join`
+                : '/api/new-game';
+            const body = dealt
+                ? { pack_id: dealt.packId, pack_index: dealt.index }
+                : { difficulty: this.gameState.difficulty };
+            
+            let response;
+            try {
+                response = await fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(body)
+                });
+            } catch (error) {
+                // Network went away mid-request; fall back to the pack puzzle
+                if (dealt) {
+                    this.startLocalGame(dealt);
+                    return;
+                }
+                throw error;
+            }
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                this.gameState.gameId = data.game_id;
+                this.gameState.board = data.puzzle;
+                this.gameState.solution = data.solution;
+                this.gameState.originalBoard = data.puzzle.map(row => [...row]);
+                this.gameState.notes = Array(9).fill().map(() => Array(9).fill().map(() => []));
+                
+                this.renderBoard();
+                this.startTimer();
+                this.updateProgress();
+                this.updateUndoRedoButtons();
+                this.openChannel();
+                this.showStatus('New game started! Click on cells to play.', 'success');
+            } else {
+                throw new Error(data.error || 'Failed to generate puzzle');
+            }
+        } catch (error) {
+            console.error('Error starting new game:', error);
+            this.showError('Failed to start new game. Please try again.');
+        } finally {
+            this.showLoading(false);
+        }
+    }
+    
+    loadPacks() {
+        try {
+            return JSON.parse(localStorage.getItem(this.packStorageKey)) || {};
+        } catch (error) {
+            return {};
+        }
+    }
+    
+    savePacks(packs) {
+        try {
+            localStorage.setItem(this.packStorageKey, JSON.stringify(packs));
+        } catch (error) {
+            console.warn('Could not store puzzle pack:', error);
+        }
+    }
+    
+    async prefetchPack(difficulty) {
+        // Keep a pack per difficulty topped up in the background
+        const stored = this.loadPacks()[difficulty];
+        const remaining = stored ? stored.puzzles.length - stored.cursor : 0;
+        if (remaining >= this.packRefillAt || this.packFetches[difficulty]) return;
+        
+        this.packFetches[difficulty] = true;
+        try {
+            // The redirect picks a pack; the pack itself is immutable and cached by ETag.
+            // Offline, the service worker answers with its spare pack for the difficulty
+            const response = await fetch(`/api/puzzle-pack?difficulty=${difficulty}&count=${this.packSize}`);
+            if (!response.ok) return;
+            const pack = await response.json();
+            
+            const packs = this.loadPacks();
+            const current = packs[difficulty];
+            const leftover = current ? current.puzzles.slice(current.cursor).map((p, i) => [...p, current.pack_id, current.cursor + i]) : [];
+            packs[difficulty] = {
+                pack_id: pack.pack_id,
+                cursor: 0,
+                puzzles: leftover.concat(pack.puzzles.map((p, i) => [...p, pack.pack_id, i]))
+            };
+            this.savePacks(packs);
+        } catch (error) {
+            console.warn('Puzzle pack prefetch failed:', error);
+        } finally {
+            this.packFetches[difficulty] = false;
+        }
+    }
+    
+    dealFromPack(difficulty) {
+        const packs = this.loadPacks();
+        const stored = packs[difficulty];
+        if (!stored || stored.cursor >= stored.puzzles.length) return null;
+        
+        const [puzzle, solution, packId, index] = stored.puzzles[stored.cursor];
+        stored.cursor += 1;
+        this.savePacks(packs);
+        return {
+            packId: packId,
+            index: index,
+            puzzle: this.decodeBoard(puzzle),
+            solution: this.decodeBoard(solution)
+        };
+    }
+    
+    decodeBoard(digits) {
+        const board = [];
+        for (let i = 0; i < 9; i++) {
+            board.push([]);
+            for (let j = 0; j < 9; j++) {
+                board[i].push(digits.charCodeAt(i * 9 + j) - 48);
+            }
+        }
+        return board;
+    }
+    
+    startLocalGame(dealt) {
+        // Offline game: moves, hints and checks all run against the pack's solution
+        this.gameState.isLocal = true;
+        this.gameState.gameId = `local-${dealt.packId}-${dealt.index}`;
+        this.gameState.board = dealt.puzzle;
+        this.gameState.solution = dealt.solution;
+        this.gameState.originalBoard = dealt.puzzle.map(row => [...row]);
+        this.gameState.notes = Array(9).fill().map(() => Array(9).fill().map(() => []));
+        
+        this.renderBoard();
+        this.startTimer();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+        this.showStatus('Offline game started from a saved puzzle pack.', 'success');
+    }
+    
+    applyLocalMove(row, col, value, moveType) {
+        const notes = this.gameState.notes[row][col];
+        const move = {
+            row: row,
+            col: col,
+            old_value: this.gameState.board[row][col],
+            new_value: value,
+            old_notes: [...notes],
+            move_type: moveType
+        };
+        
+        if (moveType === 'number') {
+            this.gameState.board[row][col] = value;
+        } else if (notes.includes(value)) {
+            notes.splice(notes.indexOf(value), 1);
+        } else {
+            notes.push(value);
+            notes.sort();
+        }
+        move.new_notes = [...notes];
+        
+        this.gameState.movesHistory.push(move);
+        this.gameState.redoStack = [];
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+        
+        const isComplete = this.gameState.board.every((r, i) => r.every((v, j) => v === this.gameState.solution[i][j]));
+        if (isComplete) {
+            this.handleGameComplete();
+        }
+    }
+    
+    stepLocalHistory(from, to, undo) {
+        if (from.length === 0) return;
+        
+        const move = from.pop();
+        to.push(move);
+        if (move.move_type === 'number') {
+            this.gameState.board[move.row][move.col] = undo ? move.old_value : move.new_value;
+        } else {
+            this.gameState.notes[move.row][move.col] = [...(undo ? move.old_notes : move.new_notes)];
+        }
+        
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+    }
+    
+    renderBoard() {
+        this.boardElement.innerHTML = '';
+        
+        for (let i = 0; i < 9; i++) {
+            for (let j = 0; j < 9; j++) {
+                const cell = document.createElement('button');
+                cell.className = 'cell';
+                cell.dataset.row = i;
+                cell.dataset.col = j;
+                
+                const value = this.gameState.board[i][j];
+                if (value !== 0) {
+                    cell.textContent = value;
+                    if (this.gameState.originalBoard[i][j] !== 0) {
+                        cell.classList.add('original');
+                    } else {
+                        cell.classList.add('filled');
+                    }
+                } else if (this.gameState.notes[i][j].length > 0) {
+                    this.renderNotes(cell, this.gameState.notes[i][j]);
+                }
+                
+                cell.addEventListener('click', () => this.selectCell(i, j));
+                this.boardElement.appendChild(cell);
+            }
+        }
+    }
+    
+    renderNotes(cell, notes) {
+        const notesContainer = document.createElement('div');
+        notesContainer.className = 'notes';
+        
+        for (let num = 1; num <= 9; num++) {
+            const note = document.createElement('div');
+            note.className = 'note';
+            if (notes.includes(num)) {
+                note.textContent = num;
+            }
+            notesContainer.appendChild(note);
+        }
+        
+        cell.appendChild(notesContainer);
+    }
+    
+    selectCell(row, col) {
+        if (this.gameState.originalBoard[row][col] !== 0) {
+            return; // Can't select original cells
+        }
+        
+        // Remove previous selection
+        if (this.gameState.selectedCell) {
+            this.gameState.selectedCell.classList.remove('selected');
+        }
+        
+        // Select new cell
+        this.gameState.selectedCell = this.boardElement.querySelector(`[data-row="${row}"][data-col="${col}"]`);
+        this.gameState.selectedCell.classList.add('selected');
+        this.gameState.selectedCell.focus();
+        
+        this.updateNumberPad();
+    }
+    
+    updateNumberPad() {
+        if (!this.gameState.selectedCell) return;
+        
+        const row = parseInt(this.gameState.selectedCell.dataset.row);
+        const col = parseInt(this.gameState.selectedCell.dataset.col);
+        const value = this.gameState.board[row][col];
+        
+        this.numberBtns.forEach(btn => {
+            const number = parseInt(btn.dataset.number);
+            btn.classList.remove('active');
+            
+            if (number === value) {
+                btn.classList.add('active');
+            }
+        });
+        
+        this.noteBtn.classList.toggle('active', this.gameState.isNoteMode);
+    }
+    
+    openChannel() {
+        this.closeChannel();
+        if (!('WebSocket' in window)) return;
+        
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const socket = new WebSocket(`${protocol}//${window.location.host}/ws/game?game_id=${encodeURIComponent(this.gameState.gameId)}`);
+        const pendingAcks = new Map();
+        this.socket = socket;
+        this.pendingAcks = pendingAcks;
+        
+        socket.addEventListener('open', () => {
+            if (this.socket === socket) this.channel = socket;
+        });
+        socket.addEventListener('message', (event) => this.handleChannelMessage(JSON.parse(event.data), pendingAcks));
+        socket.addEventListener('close', () => {
+            if (this.socket === socket) {
+                this.socket = null;
+                this.channel = null;
+            }
+            // Fall back to HTTP for anything still waiting on this socket
+            pendingAcks.forEach(({ reject }) => reject(new Error('Channel closed')));
+            pendingAcks.clear();
+        });
+    }
+    
+    closeChannel() {
+        // Also closes a socket that is still connecting for the previous game
+        if (this.socket) {
+            this.socket.close();
+            this.socket = null;
+            this.channel = null;
+        }
+    }
+    
+    sendOverChannel(message) {
+        const seq = ++this.channelSeq;
+        return new Promise((resolve, reject) => {
+            this.pendingAcks.set(seq, { resolve, reject });
+            this.channel.send(JSON.stringify({ ...message, seq }));
+        });
+    }
+    
+    handleChannelMessage(message, pendingAcks) {
+        if (message.type === 'race_progress') {
+            this.showRaceProgress(message);
+            return;
+        }
+        
+        const pending = pendingAcks.get(message.seq);
+        if (!pending) return;
+        pendingAcks.delete(message.seq);
+        
+        if (message.type === 'ack') {
+            pending.resolve(message);
+        } else {
+            pending.reject(new Error(message.error || 'Move rejected'));
+        }
+    }
+    
+    applyDelta(ack) {
+        const { row, col, value, notes } = ack.delta;
+        this.gameState.board[row][col] = value;
+        this.gameState.notes[row][col] = notes;
+        
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+    }
+    
+    showRaceProgress(race) {
+        const standings = race.players
+            .map(player => `${player.name}: ${player.finish_position ? '#' + player.finish_position : player.progress + '%'}`)
+            .join(' · ');
+        this.showStatus(`Race — ${standings}`);
+    }
+    
+    async makeMove(value) {
+        if (!this.gameState.selectedCell || this.gameState.isGameComplete) return;
+        
+        const row = parseInt(this.gameState.selectedCell.dataset.row);
+        const col = parseInt(this.gameState.selectedCell.dataset.col);
+        
+        if (this.gameState.originalBoard[row][col] !== 0) return;
+        
+        const moveType = this.gameState.isNoteMode ? 'note' : 'number';
+        if (this.gameState.isLocal) {
+            this.applyLocalMove(row, col, value, moveType);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'move', row, col, value, move_type: moveType });
+                this.gameState.movesHistory.push(ack.delta);
+                this.gameState.redoStack = [];
+                this.applyDelta(ack);
+                
+                if (ack.is_complete && ack.is_valid) {
+                    this.handleGameComplete();
+                }
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+                // Channel dropped; retry over HTTP below
+            }
+        }
+        
+        try {
+            const response = await fetch('/api/make-move', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId,
+                    row: row,
+                    col: col,
+                    value: value,
+                    move_type: moveType
+                })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                this.gameState.board = data.current_board;
+                this.gameState.notes = data.notes;
+                this.gameState.movesHistory = data.moves_history || this.gameState.movesHistory;
+                this.gameState.redoStack = [];
+                
+                this.renderBoard();
+                this.updateProgress();
+                this.updateUndoRedoButtons();
+                
+                if (data.is_complete) {
+                    this.handleGameComplete();
+                }
+            } else {
+                throw new Error(data.error || 'Failed to make move');
+            }
+        } catch (error) {
+            console.error('Error making move:', error);
+            this.showError('Failed to make move. Please try again.');
+        }
+    }
+    
+    async undoMove() {
+        if (!this.gameState.gameId) return;
+        
+        if (this.gameState.isLocal) {
+            this.stepLocalHistory(this.gameState.movesHistory, this.gameState.redoStack, true);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'undo' });
+                this.gameState.redoStack.push(this.gameState.movesHistory.pop());
+                this.applyDelta(ack);
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+            }
+        }
+        
+        try {
+            const response = await fetch('/api/undo', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId
+                })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                this.gameState.board = data.current_board;
+                this.gameState.notes = data.notes;
+                this.gameState.movesHistory = data.moves_history || this.gameState.movesHistory;
+                this.gameState.redoStack = data.redo_stack || this.gameState.redoStack;
+                
+                this.renderBoard();
+                this.updateProgress();
+                this.updateUndoRedoButtons();
+            } else {
+                throw new Error(data.error || 'Failed to undo move');
+            }
+        } catch (error) {
+            console.error('Error undoing move:', error);
+            this.showError('Failed to undo move. Please try again.');
+        }
+    }
+    
+    async redoMove() {
+        if (!this.gameState.gameId) return;
+        
+        if (this.gameState.isLocal) {
+            this.stepLocalHistory(this.gameState.redoStack, this.gameState.movesHistory, false);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'redo' });
+                this.gameState.movesHistory.push(this.gameState.redoStack.pop());
+                this.applyDelta(ack);
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+            }
+        }
+        
+        try {
+            const response = await fetch('/api/redo', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId
+                })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                this.gameState.board = data.current_board;
+                this.gameState.notes = data.notes;
+                this.gameState.movesHistory = data.moves_history || this.gameState.movesHistory;
+                this.gameState.redoStack = data.redo_stack || this.gameState.redoStack;
+                
+                this.renderBoard();
+                this.updateProgress();
+                this.updateUndoRedoButtons();
+            } else {
+                throw new Error(data.error || 'Failed to redo move');
+            }
+        } catch (error) {
+            console.error('Error redoing move:', error);
+            this.showError('Failed to redo move. Please try again.');
+        }
+    }
+    
+    updateUndoRedoButtons() {
+        this.undoBtn.disabled = this.gameState.movesHistory.length === 0;
+        this.redoBtn.disabled = this.gameState.redoStack.length === 0;
+    }
+    
+    toggleNoteMode() {
+        this.gameState.isNoteMode = !this.gameState.isNoteMode;
+        this.noteBtn.classList.toggle('active', this.gameState.isNoteMode);
+        this.updateNumberPad();
+    }
+    
+    async getHint() {
+        if (!this.gameState.selectedCell || this.gameState.isGameComplete) {
+            this.showStatus('Please select a cell first.', 'error');
+            return;
+        }
+        
+        if (this.gameState.hintsUsed >= this.gameState.maxHints) {
+            this.showStatus(`You've used all ${this.gameState.maxHints} hints for this game.`, 'error');
+            return;
+        }
+        
+        const row = parseInt(this.gameState.selectedCell.dataset.row);
+        const col = parseInt(this.gameState.selectedCell.dataset.col);
+        
+        if (this.gameState.originalBoard[row][col] !== 0) {
+            this.showStatus('Cannot get hint for original cells.', 'error');
+            return;
+        }
+        
+        if (this.gameState.isLocal) {
+            this.gameState.hintsUsed += 1;
+            this.hintCount.textContent = this.gameState.maxHints - this.gameState.hintsUsed;
+            this.applyLocalMove(row, col, this.gameState.solution[row][col], 'number');
+            this.showStatus(`Hint applied! (${this.gameState.maxHints - this.gameState.hintsUsed} hints remaining)`, 'success');
+            return;
+        }
+        
+        try {
+            const response = await fetch('/api/hint', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId,
+                    row: row,
+                    col: col
+                })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success && data.hint) {
+                this.gameState.hintsUsed = data.hints_used;
+                this.hintCount.textContent = this.gameState.maxHints - this.gameState.hintsUsed;
+                
+                // Apply the hint
+                await this.makeMove(data.hint);
+                
+                this.gameState.selectedCell.classList.add('hint');
+                setTimeout(() => {
+                    if (this.gameState.selectedCell) {
+                        this.gameState.selectedCell.classList.remove('hint');
+                    }
+                }, 1000);
+                
+                this.showStatus(`Hint applied! (${this.gameState.maxHints - this.gameState.hintsUsed} hints remaining)`, 'success');
+            } else {
+                this.showStatus('No hint available for this cell.', 'error');
+            }
+        } catch (error) {
+            console.error('Error getting hint:', error);
+            this.showError('Failed to get hint. Please try again.');
+        }
+    }
+    
+    async checkSolution() {
+        if (!this.gameState.gameId) return;
+        
+        if (this.gameState.isLocal) {
+            const hasConflicts = this.gameState.board.some((r, i) => r.some((v, j) => v !== 0 && !this.isValidMove(i, j, v)));
+            if (hasConflicts) {
+                this.showStatus('Current solution has conflicts.', 'error');
+                this.highlightErrors();
+            } else {
+                this.showStatus('Current solution is valid!', 'success');
+                this.clearErrors();
+            }
+            return;
+        }
+        
+        try {
+            const response = await fetch('/api/check-solution', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId
+                })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                if (data.is_valid) {
+                    this.showStatus('Current solution is valid!', 'success');
+                    this.clearErrors();
+                } else {
+                    this.showStatus('Current solution has conflicts.', 'error');
+                    this.highlightErrors();
+                }
+            } else {
+                throw new Error(data.error || 'Failed to check solution');
+            }
+        } catch (error) {
+            console.error('Error checking solution:', error);
+            this.showError('Failed to check solution. Please try again.');
+        }
+    }
+    
+    highlightErrors() {
+        this.clearErrors();
+        
+        for (let i = 0; i < 9; i++) {
+            for (let j = 0; j < 9; j++) {
+                if (this.gameState.board[i][j] !== 0) {
+                    if (!this.isValidMove(i, j, this.gameState.board[i][j])) {
+                        const cell = this.boardElement.querySelector(`[data-row="${i}"][data-col="${j}"]`);
+                        if (cell) {
+                            cell.classList.add('error');
+                        }
+                    }
+                }
+            }
+        }
+    }
+    
+    clearErrors() {
+        document.querySelectorAll('.cell.error').forEach(cell => {
+            cell.classList.remove('error');
+        });
+    }
+    
+    isValidMove(row, col, num) {
+        // Check row
+        for (let j = 0; j < 9; j++) {
+            if (j !== col && this.gameState.board[row][j] === num) {
+                return false;
+            }
+        }
+        
+        // Check column
+        for (let i = 0; i < 9; i++) {
+            if (i !== row && this.gameState.board[i][col] === num) {
+                return false;
+            }
+        }
+        
+        // Check 3x3 box
+        const boxRow = Math.floor(row / 3) * 3;
+        const boxCol = Math.floor(col / 3) * 3;
+        
+        for (let i = boxRow; i < boxRow + 3; i++) {
+            for (let j = boxCol; j < boxCol + 3; j++) {
+                if ((i !== row || j !== col) && this.gameState.board[i][j] === num) {
+                    return false;
+                }
+            }
+        }
+        
+        return true;
+    }
+    
+    handleGameComplete() {
+        this.gameState.isGameComplete = true;
+        this.stopTimer();
+        this.showWinModal();
+        this.saveGameStats();
+    }
+    
+    updateProgress() {
+        const filledCells = this.gameState.board.flat().filter(cell => cell !== 0).length;
+        const totalCells = 81;
+        const percentage = (filledCells / totalCells) * 100;
+        
+        this.progressFill.style.width = `${percentage}%`;
+        this.progressText.textContent = `${filledCells}/${totalCells}`;
+    }
+    
+    startTimer() {
+        this.gameState.gameStartTime = Date.now();
+        this.gameState.timerInterval = setInterval(() => {
+            this.updateTimer();
+        }, 1000);
+    }
+    
+    stopTimer() {
+        if (this.gameState.timerInterval) {
+            clearInterval(this.gameState.timerInterval);
+            this.gameState.timerInterval = null;
+        }
+    }
+    
+    updateTimer() {
+        if (!this.gameState.gameStartTime) return;
+        
+        const elapsed = Math.floor((Date.now() - this.gameState.gameStartTime) / 1000);
+        const minutes = Math.floor(elapsed / 60);
+        const seconds = elapsed % 60;
+        
+        this.timerElement.textContent = 
+            `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
+    }
+    
+    async saveGameStats() {
+        if (!this.gameState.gameId || this.gameState.isLocal) return;
+        
+        try {
+            const timeTaken = Math.floor((Date.now() - this.gameState.gameStartTime) / 1000);
+            
+            await fetch('/api/game-stats', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_id: this.gameState.gameId,
+                    time_taken: timeTaken,
+                    completed: this.gameState.isGameComplete
+                })
+            });
+        } catch (error) {
+            console.error('Error saving game stats:', error);
+        }
+    }
+    
+    async showStats() {
+        try {
+            const response = await fetch('/api/user-stats');
+            const data = await response.json();
+            
+            if (data.success) {
+                this.populateStats(data.stats);
+                this.showModal(this.statsModal);
+            } else {
+                throw new Error(data.error || 'Failed to load statistics');
+            }
+        } catch (error) {
+            console.error('Error loading stats:', error);
+            this.showError('Failed to load statistics. Please try again.');
+        }
+    }
+    
+    populateStats(stats) {
+        this.totalGames.textContent = stats.total_games || 0;
+        this.completedGames.textContent = stats.completed_games || 0;
+        this.totalTime.textContent = this.formatTime(stats.total_play_time || 0);
+        this.totalHints.textContent = stats.hints_used || 0;
+        
+        // Populate best times
+        this.bestTimesList.innerHTML = '';
+        if (stats.best_times) {
+            Object.entries(stats.best_times).forEach(([difficulty, time]) => {
+                const timeItem = document.createElement('div');
+                timeItem.className = 'time-item';
+                timeItem.innerHTML = `
+                    <span>${difficulty.charAt(0).toUpperCase() + difficulty.slice(1)}</span>
+                    <span>${this.formatTime(time)}</span>
+                `;
+                this.bestTimesList.appendChild(timeItem);
+            });
+        }
+    }
+    
+    formatTime(seconds) {
+        const minutes = Math.floor(seconds / 60);
+        const remainingSeconds = seconds % 60;
+        return `${minutes}m ${remainingSeconds}s`;
+    }
+    
+    showSettings() {
+        this.themeSelect.value = this.settings.theme;
+        this.animationToggle.checked = this.settings.animations;
+        this.autoCheckToggle.checked = this.settings.autoCheck;
+        this.soundToggle.checked = this.settings.sound;
+        this.showModal(this.settingsModal);
+    }
+    
+    saveSettings() {
+        this.settings.theme = this.themeSelect.value;
+        this.settings.animations = this.animationToggle.checked;
+        this.settings.autoCheck = this.autoCheckToggle.checked;
+        this.settings.sound = this.soundToggle.checked;
+        
+        this.gameState.autoCheck = this.settings.autoCheck;
+        
+        this.saveSettingsToStorage();
+        this.applyTheme();
+        this.hideModal(this.settingsModal);
+        this.showStatus('Settings saved!', 'success');
+    }
+    
+    loadSettings() {
+        const saved = localStorage.getItem('sudokuProSettings');
+        if (saved) {
+            this.settings = { ...this.settings, ...JSON.parse(saved) };
+            this.gameState.autoCheck = this.settings.autoCheck;
+        }
+    }
+    
+    saveSettingsToStorage() {
+        localStorage.setItem('sudokuProSettings', JSON.stringify(this.settings));
+    }
+    
+    applyTheme() {
+        document.documentElement.setAttribute('data-theme', this.settings.theme);
+    }
+    
+    showWinModal() {
+        this.finalTime.textContent = this.timerElement.textContent;
+        this.finalHints.textContent = this.gameState.hintsUsed;
+        this.finalDifficulty.textContent = this.gameState.difficulty.charAt(0).toUpperCase() + this.gameState.difficulty.slice(1);
+        this.showModal(this.winModal);
+    }
+    
+    shareResult() {
+        const text = `I solved a ${this.gameState.difficulty} Sudoku puzzle in ${this.timerElement.textContent} with ${this.gameState.hintsUsed} hints! 🧩`;
+        
+        if (navigator.share) {
+            navigator.share({
+                title: 'Sudoku Pro',
+                text: text,
+                url: window.location.href
+            });
+        } else {
+            // Fallback to copying to clipboard
+            navigator.clipboard.writeText(text).then(() => {
+                this.showStatus('Result copied to clipboard!', 'success');
+            });
+        }
+    }
+    
+    handleKeyPress(event) {
+        if (!this.gameState.selectedCell || this.gameState.isGameComplete) return;
+        
+        const row = parseInt(this.gameState.selectedCell.dataset.row);
+        const col = parseInt(this.gameState.selectedCell.dataset.col);
+        
+        if (this.gameState.originalBoard[row][col] !== 0) return;
+        
+        if (event.key >= '1' && event.key <= '9') {
+            this.makeMove(parseInt(event.key));
+        } else if (event.key === '0' || event.key === 'Backspace' || event.key === 'Delete') {
+            this.makeMove(0);
+        } else if (event.key === 'n' || event.key === 'N') {
+            this.toggleNoteMode();
+        } else if (event.key === 'ArrowUp' || event.key === 'ArrowDown' || 
+                   event.key === 'ArrowLeft' || event.key === 'ArrowRight') {
+            this.moveSelection(event.key);
+        }
+    }
+    
+    moveSelection(direction) {
+        if (!this.gameState.selectedCell) return;
+        
+        const currentRow = parseInt(this.gameState.selectedCell.dataset.row);
+        const currentCol = parseInt(this.gameState.selectedCell.dataset.col);
+        let newRow = currentRow;
+        let newCol = currentCol;
+        
+        switch (direction) {
+            case 'ArrowUp':
+                newRow = Math.max(0, currentRow - 1);
+                break;
+            case 'ArrowDown':
+                newRow = Math.min(8, currentRow + 1);
+                break;
+            case 'ArrowLeft':
+                newCol = Math.max(0, currentCol - 1);
+                break;
+            case 'ArrowRight':
+                newCol = Math.min(8, currentCol + 1);
+                break;
+        }
+        
+        this.selectCell(newRow, newCol);
+    }
+    
+    resetGameState() {
+        this.closeChannel();
+        this.gameState.isLocal = false;
+        this.gameState.board = [];
+        this.gameState.solution = [];
+        this.gameState.originalBoard = [];
+        this.gameState.notes = [];
+        this.gameState.selectedCell = null;
+        this.gameState.isGameComplete = false;
+        this.gameState.hintsUsed = 0;
+        this.gameState.movesHistory = [];
+        this.gameState.redoStack = [];
+        this.gameState.isNoteMode = false;
+        
+        this.stopTimer();
+        this.timerElement.textContent = '00:00';
+        this.hintCount.textContent = this.gameState.maxHints;
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+        this.showStatus('');
+    }
+    
+    showStatus(message, type = '') {
+        this.statusMessage.textContent = message;
+        this.statusMessage.className = 'status-message';
+        if (type) {
+            this.statusMessage.classList.add(type);
+        }
+    }
+    
+    showError(message) {
+        this.errorMessage.textContent = message;
+        this.showModal(this.errorModal);
+    }
+    
+    showModal(modal) {
+        modal.classList.add('show');
+    }
+    
+    hideModal(modal) {
+        modal.classList.remove('show');
+    }
+    
+    showLoading(show) {
+        if (show) {
+            this.loadingOverlay.classList.add('show');
+        } else {
+            this.loadingOverlay.classList.remove('show');
+        }
+    }
+}
+
+// Initialize the game when the page loads
+document.addEventListener('DOMContentLoaded', () => {
+    new SudokuPro();
+}); 
\ No newline at end of file
@@ -0,0 +1,167 @@
+// Service Worker for Sudoku Game PWA
+// Set to the asset build's version by static_assets.py, so each build
+// that changes an asset installs into a fresh cache
+const ASSET_VERSION = 'b58aaea087cd';
+const CACHE_NAME = `sudoku-pro-${ASSET_VERSION}`;
+// One spare puzzle pack per difficulty, prefetched for when the app asks
+// for a pack while offline; packs outlive app cache versions
+const PACK_CACHE_NAME = 'sudoku-packs';
+const PACK_PICKER = '/api/puzzle-pack';
+const PACK_DIFFICULTIES = ['easy', 'medium', 'hard', 'expert'];
+const PACK_SIZE = 20;
+const urlsToCache = [
+  '/',
+  '/static/dist/css/style.7d50cbc89e8d.css',
+  '/static/dist/js/game.b5917cb57bf0.js',
+  '/static/dist/js/pwa.e8fedc1dbeb6.js',
+  '/static/dist/manifest.95b9c5925529.json',
+  '/static/dist/icons/icon-192x192.14ab3621b2cd.png',
+  '/static/dist/icons/icon-512x512.66764260a98f.png',
+  'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap',
+  'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
+];
+
+// Install event - cache resources
+self.addEventListener('install', event => {
+  event.waitUntil(
+    caches.open(CACHE_NAME)
+      .then(cache => {
+        console.log('Opened cache');
+        return cache.addAll(urlsToCache);
+      })
+  );
+});
+
+// The spare pack for a difficulty is stored under the picker URL
+function spareKey(difficulty) {
+  return `${PACK_PICKER}?difficulty=${difficulty}`;
+}
+
+// Fetch a spare pack for each difficulty that doesn't have one yet
+function prefetchPacks(difficulties = PACK_DIFFICULTIES) {
+  return caches.open(PACK_CACHE_NAME).then(cache =>
+    Promise.all(difficulties.map(difficulty =>
+      cache.match(spareKey(difficulty)).then(spare => {
+        if (spare) {
+          return;
+        }
+        // The picker redirects to an immutable pack; store the followed response
+        return fetch(`${spareKey(difficulty)}&count=${PACK_SIZE}`).then(response => {
+          if (response.ok) {
+            return cache.put(spareKey(difficulty), response);
+          }
+        });
+      }).catch(() => {})
+    ))
+  );
+}
+
+// Picker requests go to the network; offline, hand out the spare pack once
+function pickPack(request) {
+  const difficulty = new URL(request.url).searchParams.get('difficulty') || 'medium';
+  return fetch(request)
+    .then(response => {
+      prefetchPacks([difficulty]);
+      return response;
+    })
+    .catch(error =>
+      caches.open(PACK_CACHE_NAME).then(cache =>
+        cache.match(spareKey(difficulty)).then(spare => {
+          if (!spare) {
+            throw error;
+          }
+          return cache.delete(spareKey(difficulty)).then(() => spare);
+        })
+      )
+    );
+}
+
+// Fetch event - serve from cache when offline
+self.addEventListener('fetch', event => {
+  const url = new URL(event.request.url);
+  if (event.request.method === 'GET' && url.pathname === PACK_PICKER) {
+    event.respondWith(pickPack(event.request));
+    return;
+  }
+
+  event.respondWith(
+    caches.match(event.request)
+      .then(response => {
+        // Return cached version or fetch from network
+        if (response) {
+          return response;
+        }
+        return fetch(event.request);
+      }
+    )
+  );
+});
+
+// Activate event - clean up old caches and prefetch spare packs
+self.addEventListener('activate', event => {
+  event.waitUntil(
+    caches.keys().then(cacheNames => {
+      return Promise.all(
+        cacheNames.map(cacheName => {
+          if (cacheName !== CACHE_NAME && cacheName !== PACK_CACHE_NAME) {
+            console.log('Deleting old cache:', cacheName);
+            return caches.delete(cacheName);
+          }
+        })
+      );
+    }).then(() => prefetchPacks())
+  );
+});
+
+// Background sync for offline data
+self.addEventListener('sync', event => {
+  if (event.tag === 'background-sync') {
+    event.waitUntil(doBackgroundSync());
+  }
+});
+
+function doBackgroundSync() {
+  // Sync any offline data when connection is restored
+  return Promise.resolve();
+}
+
+// Push notification handling
+self.addEventListener('push', event => {
+  const options = {
+    body: event.data ? event.data.text() : 'New daily challenge available!',
+    icon: '/static/dist/icons/icon-192x192.14ab3621b2cd.png',
+    badge: '/static/dist/icons/icon-72x72.e0e4ae0e2285.svg',
+    vibrate: [100, 50, 100],
+    data: {
+      dateOfArrival: Date.now(),
+      primaryKey: 1
+    },
+    actions: [
+      {
+        action: 'explore',
+        title: 'Play Now',
+        icon: '/static/dist/icons/icon-96x96.e3aaca93f4de.svg'
+      },
+      {
+        action: 'close',
+        title: 'Close',
+        icon: '/static/dist/icons/icon-96x96.e3aaca93f4de.svg'
+      }
+    ]
+  };
+
+  event.waitUntil(
+    self.registration.showNotification('Sudoku Pro', options)
+  );
+});
+
+// Notification click handling
+self.addEventListener('notificationclick', event => {
+  event.notification.close();
+
+  if (event.action === 'explore') {
+    event.waitUntil(
+      clients.openWindow('/')
+    );
+  }
+}); 
\ No newline at end of file
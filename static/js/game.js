@@ -16,9 +16,25 @@ class SudokuPro {
             movesHistory: [],
             redoStack: [],
             isNoteMode: false,
-            autoCheck: true
+            autoCheck: true,
+            raceId: new URLSearchParams(window.location.search).get('race'),
+            isLocal: false
         };
         
+        // Prefetched puzzle packs, dealt from localStorage so play continues offline
+        this.packStorageKey = 'sudokuProPuzzlePacks';
+        this.packSize = 20;
+        this.packRefillAt = 5;
+        this.packFetches = {};
+        
+        // Persistent move channel (WebSocket), used when the server offers it.
+        // socket is set on creation, channel only once it is open; each socket
+        // keeps its own pending acks so a stale one can't reject the current ones
+        this.socket = null;
+        this.channel = null;
+        this.channelSeq = 0;
+        this.pendingAcks = new Map();
+        
         this.settings = {
             theme: 'light',
             animations: true,
@@ -196,15 +212,38 @@ class SudokuPro {
             this.showLoading(true);
             this.resetGameState();
             
-            const response = await fetch('/api/new-game', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    difficulty: this.gameState.difficulty
-                })
-            });
+            const dealt = this.gameState.raceId ? null : this.dealFromPack(this.gameState.difficulty);
+            this.prefetchPack(this.gameState.difficulty);
+            
+            if (dealt && !navigator.onLine) {
+                this.startLocalGame(dealt);
+                return;
+            }
+            
+            const url = this.gameState.raceId
+                ? `/api/race/${encodeURIComponent(this.gameState.raceId)}/join`
+                : '/api/new-game';
+            const body = dealt
+                ? { pack_id: dealt.packId, pack_index: dealt.index }
+                : { difficulty: this.gameState.difficulty };
+            
+            let response;
+            try {
+                response = await fetch(url, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify(body)
+                });
+            } catch (error) {
+                // Network went away mid-request; fall back to the pack puzzle
+                if (dealt) {
+                    this.startLocalGame(dealt);
+                    return;
+                }
+                throw error;
+            }
             
             const data = await response.json();
             
@@ -219,6 +258,7 @@ class SudokuPro {
                 this.startTimer();
                 this.updateProgress();
                 this.updateUndoRedoButtons();
+                this.openChannel();
                 this.showStatus('New game started! Click on cells to play.', 'success');
             } else {
                 throw new Error(data.error || 'Failed to generate puzzle');
@@ -231,6 +271,144 @@ class SudokuPro {
         }
     }
     
+    loadPacks() {
+        try {
+            return JSON.parse(localStorage.getItem(this.packStorageKey)) || {};
+        } catch (error) {
+            return {};
+        }
+    }
+    
+    savePacks(packs) {
+        try {
+            localStorage.setItem(this.packStorageKey, JSON.stringify(packs));
+        } catch (error) {
+            console.warn('Could not store puzzle pack:', error);
+        }
+    }
+    
+    async prefetchPack(difficulty) {
+        // Keep a pack per difficulty topped up in the background
+        const stored = this.loadPacks()[difficulty];
+        const remaining = stored ? stored.puzzles.length - stored.cursor : 0;
+        if (remaining >= this.packRefillAt || this.packFetches[difficulty]) return;
+        
+        this.packFetches[difficulty] = true;
+        try {
+            // The redirect picks a pack; the pack itself is immutable and cached by ETag.
+            // Offline, the service worker answers with its spare pack for the difficulty
+            const response = await fetch(`/api/puzzle-pack?difficulty=${difficulty}&count=${this.packSize}`);
+            if (!response.ok) return;
+            const pack = await response.json();
+            
+            const packs = this.loadPacks();
+            const current = packs[difficulty];
+            const leftover = current ? current.puzzles.slice(current.cursor).map((p, i) => [...p, current.pack_id, current.cursor + i]) : [];
+            packs[difficulty] = {
+                pack_id: pack.pack_id,
+                cursor: 0,
+                puzzles: leftover.concat(pack.puzzles.map((p, i) => [...p, pack.pack_id, i]))
+            };
+            this.savePacks(packs);
+        } catch (error) {
+            console.warn('Puzzle pack prefetch failed:', error);
+        } finally {
+            this.packFetches[difficulty] = false;
+        }
+    }
+    
+    dealFromPack(difficulty) {
+        const packs = this.loadPacks();
+        const stored = packs[difficulty];
+        if (!stored || stored.cursor >= stored.puzzles.length) return null;
+        
+        const [puzzle, solution, packId, index] = stored.puzzles[stored.cursor];
+        stored.cursor += 1;
+        this.savePacks(packs);
+        return {
+            packId: packId,
+            index: index,
+            puzzle: this.decodeBoard(puzzle),
+            solution: this.decodeBoard(solution)
+        };
+    }
+    
+    decodeBoard(digits) {
+        const board = [];
+        for (let i = 0; i < 9; i++) {
+            board.push([]);
+            for (let j = 0; j < 9; j++) {
+                board[i].push(digits.charCodeAt(i * 9 + j) - 48);
+            }
+        }
+        return board;
+    }
+    
+    startLocalGame(dealt) {
+        // Offline game: moves, hints and checks all run against the pack's solution
+        this.gameState.isLocal = true;
+        this.gameState.gameId = `local-${dealt.packId}-${dealt.index}`;
+        this.gameState.board = dealt.puzzle;
+        this.gameState.solution = dealt.solution;
+        this.gameState.originalBoard = dealt.puzzle.map(row => [...row]);
+        this.gameState.notes = Array(9).fill().map(() => Array(9).fill().map(() => []));
+        
+        this.renderBoard();
+        this.startTimer();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+        this.showStatus('Offline game started from a saved puzzle pack.', 'success');
+    }
+    
+    applyLocalMove(row, col, value, moveType) {
+        const notes = this.gameState.notes[row][col];
+        const move = {
+            row: row,
+            col: col,
+            old_value: this.gameState.board[row][col],
+            new_value: value,
+            old_notes: [...notes],
+            move_type: moveType
+        };
+        
+        if (moveType === 'number') {
+            this.gameState.board[row][col] = value;
+        } else if (notes.includes(value)) {
+            notes.splice(notes.indexOf(value), 1);
+        } else {
+            notes.push(value);
+            notes.sort();
+        }
+        move.new_notes = [...notes];
+        
+        this.gameState.movesHistory.push(move);
+        this.gameState.redoStack = [];
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+        
+        const isComplete = this.gameState.board.every((r, i) => r.every((v, j) => v === this.gameState.solution[i][j]));
+        if (isComplete) {
+            this.handleGameComplete();
+        }
+    }
+    
+    stepLocalHistory(from, to, undo) {
+        if (from.length === 0) return;
+        
+        const move = from.pop();
+        to.push(move);
+        if (move.move_type === 'number') {
+            this.gameState.board[move.row][move.col] = undo ? move.old_value : move.new_value;
+        } else {
+            this.gameState.notes[move.row][move.col] = [...(undo ? move.old_notes : move.new_notes)];
+        }
+        
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+    }
+    
     renderBoard() {
         this.boardElement.innerHTML = '';
         
@@ -312,6 +490,82 @@ class SudokuPro {
         this.noteBtn.classList.toggle('active', this.gameState.isNoteMode);
     }
     
+    openChannel() {
+        this.closeChannel();
+        if (!('WebSocket' in window)) return;
+        
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const socket = new WebSocket(`${protocol}//${window.location.host}/ws/game?game_id=${encodeURIComponent(this.gameState.gameId)}`);
+        const pendingAcks = new Map();
+        this.socket = socket;
+        this.pendingAcks = pendingAcks;
+        
+        socket.addEventListener('open', () => {
+            if (this.socket === socket) this.channel = socket;
+        });
+        socket.addEventListener('message', (event) => this.handleChannelMessage(JSON.parse(event.data), pendingAcks));
+        socket.addEventListener('close', () => {
+            if (this.socket === socket) {
+                this.socket = null;
+                this.channel = null;
+            }
+            // Fall back to HTTP for anything still waiting on this socket
+            pendingAcks.forEach(({ reject }) => reject(new Error('Channel closed')));
+            pendingAcks.clear();
+        });
+    }
+    
+    closeChannel() {
+        // Also closes a socket that is still connecting for the previous game
+        if (this.socket) {
+            this.socket.close();
+            this.socket = null;
+            this.channel = null;
+        }
+    }
+    
+    sendOverChannel(message) {
+        const seq = ++this.channelSeq;
+        return new Promise((resolve, reject) => {
+            this.pendingAcks.set(seq, { resolve, reject });
+            this.channel.send(JSON.stringify({ ...message, seq }));
+        });
+    }
+    
+    handleChannelMessage(message, pendingAcks) {
+        if (message.type === 'race_progress') {
+            this.showRaceProgress(message);
+            return;
+        }
+        
+        const pending = pendingAcks.get(message.seq);
+        if (!pending) return;
+        pendingAcks.delete(message.seq);
+        
+        if (message.type === 'ack') {
+            pending.resolve(message);
+        } else {
+            pending.reject(new Error(message.error || 'Move rejected'));
+        }
+    }
+    
+    applyDelta(ack) {
+        const { row, col, value, notes } = ack.delta;
+        this.gameState.board[row][col] = value;
+        this.gameState.notes[row][col] = notes;
+        
+        this.renderBoard();
+        this.updateProgress();
+        this.updateUndoRedoButtons();
+    }
+    
+    showRaceProgress(race) {
+        const standings = race.players
+            .map(player => `${player.name}: ${player.finish_position ? '#' + player.finish_position : player.progress + '%'}`)
+            .join(' · ');
+        this.showStatus(`Race — ${standings}`);
+    }
+    
     async makeMove(value) {
         if (!this.gameState.selectedCell || this.gameState.isGameComplete) return;
         
@@ -320,6 +574,32 @@ class SudokuPro {
         
         if (this.gameState.originalBoard[row][col] !== 0) return;
         
+        const moveType = this.gameState.isNoteMode ? 'note' : 'number';
+        if (this.gameState.isLocal) {
+            this.applyLocalMove(row, col, value, moveType);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'move', row, col, value, move_type: moveType });
+                this.gameState.movesHistory.push(ack.delta);
+                this.gameState.redoStack = [];
+                this.applyDelta(ack);
+                
+                if (ack.is_complete && ack.is_valid) {
+                    this.handleGameComplete();
+                }
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+                // Channel dropped; retry over HTTP below
+            }
+        }
+        
         try {
             const response = await fetch('/api/make-move', {
                 method: 'POST',
@@ -331,7 +611,7 @@ class SudokuPro {
                     row: row,
                     col: col,
                     value: value,
-                    move_type: this.gameState.isNoteMode ? 'note' : 'number'
+                    move_type: moveType
                 })
             });
             
@@ -362,6 +642,25 @@ class SudokuPro {
     async undoMove() {
         if (!this.gameState.gameId) return;
         
+        if (this.gameState.isLocal) {
+            this.stepLocalHistory(this.gameState.movesHistory, this.gameState.redoStack, true);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'undo' });
+                this.gameState.redoStack.push(this.gameState.movesHistory.pop());
+                this.applyDelta(ack);
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+            }
+        }
+        
         try {
             const response = await fetch('/api/undo', {
                 method: 'POST',
@@ -396,6 +695,25 @@ class SudokuPro {
     async redoMove() {
         if (!this.gameState.gameId) return;
         
+        if (this.gameState.isLocal) {
+            this.stepLocalHistory(this.gameState.redoStack, this.gameState.movesHistory, false);
+            return;
+        }
+        
+        if (this.channel) {
+            try {
+                const ack = await this.sendOverChannel({ type: 'redo' });
+                this.gameState.movesHistory.push(this.gameState.redoStack.pop());
+                this.applyDelta(ack);
+                return;
+            } catch (error) {
+                if (this.channel) {
+                    this.showError(error.message);
+                    return;
+                }
+            }
+        }
+        
         try {
             const response = await fetch('/api/redo', {
                 method: 'POST',
@@ -457,6 +775,14 @@ class SudokuPro {
             return;
         }
         
+        if (this.gameState.isLocal) {
+            this.gameState.hintsUsed += 1;
+            this.hintCount.textContent = this.gameState.maxHints - this.gameState.hintsUsed;
+            this.applyLocalMove(row, col, this.gameState.solution[row][col], 'number');
+            this.showStatus(`Hint applied! (${this.gameState.maxHints - this.gameState.hintsUsed} hints remaining)`, 'success');
+            return;
+        }
+        
         try {
             const response = await fetch('/api/hint', {
                 method: 'POST',
@@ -499,6 +825,18 @@ class SudokuPro {
     async checkSolution() {
         if (!this.gameState.gameId) return;
         
+        if (this.gameState.isLocal) {
+            const hasConflicts = this.gameState.board.some((r, i) => r.some((v, j) => v !== 0 && !this.isValidMove(i, j, v)));
+            if (hasConflicts) {
+                this.showStatus('Current solution has conflicts.', 'error');
+                this.highlightErrors();
+            } else {
+                this.showStatus('Current solution is valid!', 'success');
+                this.clearErrors();
+            }
+            return;
+        }
+        
         try {
             const response = await fetch('/api/check-solution', {
                 method: 'POST',
@@ -624,7 +962,7 @@ class SudokuPro {
     }
     
     async saveGameStats() {
-        if (!this.gameState.gameId) return;
+        if (!this.gameState.gameId || this.gameState.isLocal) return;
         
         try {
             const timeTaken = Math.floor((Date.now() - this.gameState.gameStartTime) / 1000);
@@ -798,6 +1136,8 @@ class SudokuPro {
     }
     
     resetGameState() {
+        this.closeChannel();
+        this.gameState.isLocal = false;
         this.gameState.board = [];
         this.gameState.solution = [];
         this.gameState.originalBoard = [];
@@ -1,5 +1,14 @@
 // Service Worker for Sudoku Game PWA
-const CACHE_NAME = 'sudoku-pro-v3.0.0';
+// Set to the asset build's version by static_assets.py, so each build
+// that changes an asset installs into a fresh cache
+const ASSET_VERSION = 'dev';
+const CACHE_NAME = `sudoku-pro-${ASSET_VERSION}`;
+// One spare puzzle pack per difficulty, prefetched for when the app asks
+// for a pack while offline; packs outlive app cache versions
+const PACK_CACHE_NAME = 'sudoku-packs';
+const PACK_PICKER = '/api/puzzle-pack';
+const PACK_DIFFICULTIES = ['easy', 'medium', 'hard', 'expert'];
+const PACK_SIZE = 20;
 const urlsToCache = [
   '/',
   '/static/css/style.css',
@@ -23,8 +32,58 @@ self.addEventListener('install', event => {
   );
 });
 
+// The spare pack for a difficulty is stored under the picker URL
+function spareKey(difficulty) {
+  return `${PACK_PICKER}?difficulty=${difficulty}`;
+}
+
+// Fetch a spare pack for each difficulty that doesn't have one yet
+function prefetchPacks(difficulties = PACK_DIFFICULTIES) {
+  return caches.open(PACK_CACHE_NAME).then(cache =>
+    Promise.all(difficulties.map(difficulty =>
+      cache.match(spareKey(difficulty)).then(spare => {
+        if (spare) {
+          return;
+        }
+        // The picker redirects to an immutable pack; store the followed response
+        return fetch(`${spareKey(difficulty)}&count=${PACK_SIZE}`).then(response => {
+          if (response.ok) {
+            return cache.put(spareKey(difficulty), response);
+          }
+        });
+      }).catch(() => {})
+    ))
+  );
+}
+
+// Picker requests go to the network; offline, hand out the spare pack once
+function pickPack(request) {
+  const difficulty = new URL(request.url).searchParams.get('difficulty') || 'medium';
+  return fetch(request)
+    .then(response => {
+      prefetchPacks([difficulty]);
+      return response;
+    })
+    .catch(error =>
+      caches.open(PACK_CACHE_NAME).then(cache =>
+        cache.match(spareKey(difficulty)).then(spare => {
+          if (!spare) {
+            throw error;
+          }
+          return cache.delete(spareKey(difficulty)).then(() => spare);
+        })
+      )
+    );
+}
+
 // Fetch event - serve from cache when offline
 self.addEventListener('fetch', event => {
+  const url = new URL(event.request.url);
+  if (event.request.method === 'GET' && url.pathname === PACK_PICKER) {
+    event.respondWith(pickPack(event.request));
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request)
       .then(response => {
@@ -38,19 +97,19 @@ self.addEventListener('fetch', event => {
   );
 });
 
-// Activate event - clean up old caches
+// Activate event - clean up old caches and prefetch spare packs
 self.addEventListener('activate', event => {
   event.waitUntil(
     caches.keys().then(cacheNames => {
       return Promise.all(
         cacheNames.map(cacheName => {
-          if (cacheName !== CACHE_NAME) {
+          if (cacheName !== CACHE_NAME && cacheName !== PACK_CACHE_NAME) {
             console.log('Deleting old cache:', cacheName);
             return caches.delete(cacheName);
           }
         })
       );
-    })
+    }).then(() => prefetchPacks())
   );
 });
 
@@ -0,0 +1,212 @@
+import os
+import json
+import logging
+
+from flask import current_app, request, send_from_directory, url_for
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST = 'dist'                    # Build output, served at /static/dist/
+MANIFEST = 'assets.json'         # Logical name -> fingerprinted file
+SERVICE_WORKER = 'sw.js'         # Kept at a stable URL, so never fingerprinted
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg', '.html', '.txt')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))  # In order of preference
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# The build step (python static_assets.py, run in the Docker image) imports
+# its hashing and compression modules itself; the app only reads the manifest
+
+
+def _digest(data):
+    import hashlib
+    return hashlib.sha256(data).hexdigest()
+
+
+def _brotli():
+    try:
+        import brotli  # Optional: the build also writes .br variants when installed
+    except ImportError:
+        return None
+    return brotli
+
+
+def _source_files(static_dir):
+    """Static files to fingerprint, as paths relative to static_dir"""
+    names = []
+    for root, dirs, files in os.walk(static_dir):
+        if root == static_dir:
+            dirs[:] = [name for name in dirs if name != DIST]
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, '/')
+            if path != SERVICE_WORKER and not name.startswith('.'):
+                names.append(path)
+    return sorted(names)
+
+
+def build(static_dir=STATIC_DIR):
+    """
+    Write content-hashed copies of the static files to static/dist with
+    gzip (and brotli) variants, plus the manifest that maps each logical
+    name to its copy. Text assets have their /static/ references rewritten
+    to the fingerprinted URLs first (the web manifest's icons, the service
+    worker's precache list), so a file's hash covers what it points to.
+    The service worker keeps its URL and gets a cache name derived from
+    every asset's hash instead.
+    Returns: the manifest
+    """
+    import re
+    import shutil
+
+    # References to other static files inside text assets
+    static_url = re.compile(r"/static/([\w./-]+\.\w+)")
+    dist = os.path.join(static_dir, DIST)
+    shutil.rmtree(dist, ignore_errors=True)
+    sources = set(_source_files(static_dir))
+    assets = {}
+
+    def rewrite(data):
+        return static_url.sub(
+            lambda match: f"/static/{DIST}/{fingerprint(match.group(1))['path']}"
+            if match.group(1) in sources else match.group(0),
+            data.decode()
+        ).encode()
+
+    def fingerprint(name):
+        # Referenced files first, so their hashes are known
+        if name in assets:
+            return assets[name]
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            source = f.read()
+        data = rewrite(source) if name.endswith(COMPRESSIBLE) else source
+
+        stem, ext = os.path.splitext(name)
+        path = f'{stem}.{_digest(data)[:12]}{ext}'
+        encodings = _write(os.path.join(dist, path), data)
+        assets[name] = {'path': path, 'encodings': encodings}
+        return assets[name]
+
+    for name in sorted(sources):
+        fingerprint(name)
+
+    version = _digest(json.dumps(assets, sort_keys=True).encode())[:12]
+    with open(os.path.join(static_dir, SERVICE_WORKER), 'rb') as f:
+        worker_source = f.read()
+    worker = rewrite(worker_source).decode()
+    worker = re.sub(r"ASSET_VERSION = '[^']*'", f"ASSET_VERSION = '{version}'", worker)
+    _write(os.path.join(dist, SERVICE_WORKER), worker.encode(), compress=False)
+
+    manifest = {'version': version, 'assets': assets, 'service_worker': SERVICE_WORKER}
+    with open(os.path.join(dist, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def _write(path, data, compress=True):
+    """
+    Write a file and its compressed variants, skipping any that would not
+    be smaller (tiny SVGs, PNGs)
+    Returns: list of encodings written
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    if not compress or not path.endswith(COMPRESSIBLE):
+        return []
+
+    import gzip
+
+    brotli = _brotli()
+    compressors = {'gzip': lambda data: gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+    encodings = []
+    for encoding, suffix in ENCODINGS:
+        if encoding not in compressors:
+            continue
+        compressed = compressors[encoding](data)
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            encodings.append(encoding)
+    return encodings
+
+
+class StaticAssets:
+    """
+    Serves the fingerprinted build for deployments without nginx (Vercel,
+    a bare container): templates link to assets through asset_url(), the
+    app picks the precompressed variant the client accepts and marks it
+    immutable, and the service worker is served from the build so its cache
+    name changes with every asset change. Only the manifest is read at
+    startup, so the build must be rerun after editing static files; in
+    debug mode the plain /static/ files are served instead.
+    """
+
+    def __init__(self, app, static_dir=None):
+        self.static_dir = static_dir or app.static_folder
+        self.dist = os.path.join(self.static_dir, DIST)
+        self.version = None
+        self.assets = {}     # Logical name -> manifest entry
+        self.encodings = {}  # Fingerprinted path -> precompressed variants
+        self.worker_built = False
+        self._load()
+
+        app.add_url_rule(f'/static/{DIST}/<path:filename>', 'static_dist', self.send)
+        app.add_url_rule(f'/static/{SERVICE_WORKER}', 'service_worker', self.service_worker)
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.dist, MANIFEST)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            logger.info("No static asset build; serving plain static files (run python static_assets.py)")
+            return
+        except Exception as e:
+            logger.error(f"Error loading static asset manifest: {str(e)}")
+            return
+
+        self.version = manifest['version']
+        self.assets = manifest['assets']
+        self.encodings = {entry['path']: entry['encodings'] for entry in self.assets.values()}
+        self.worker_built = bool(manifest.get('service_worker'))
+
+    def url(self, filename):
+        """URL of a static file: its fingerprinted copy if it is in the build"""
+        entry = None if current_app.debug else self.assets.get(filename)
+        if entry is None:
+            return url_for('static', filename=filename)
+        return url_for('static_dist', filename=entry['path'])
+
+    def send(self, filename):
+        """Serve a fingerprinted file, precompressed if the client accepts it"""
+        import mimetypes  # Already loaded by werkzeug; the type comes from the uncompressed name
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        available = self.encodings.get(filename, ())
+        encoding, suffix = None, ''
+        for candidate, candidate_suffix in ENCODINGS:
+            if candidate in available and request.accept_encodings[candidate]:
+                encoding, suffix = candidate, candidate_suffix
+                break
+
+        response = send_from_directory(self.dist, filename + suffix, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    def service_worker(self):
+        """The built service worker (or the source one); browsers revalidate it on every load"""
+        directory = self.dist if self.worker_built and not current_app.debug else self.static_dir
+        response = send_from_directory(directory, SERVICE_WORKER, mimetype='application/javascript')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+if __name__ == '__main__':
+    manifest = build()
+    print(f"Built {len(manifest['assets'])} assets into static/{DIST} (version {manifest['version']}"
+          f"{', no brotli: pip install brotli' if _brotli() is None else ''})")
@@ -0,0 +1,210 @@
+import time
+import threading
+from bisect import bisect_left, insort
+
+
+class TDigest:
+    """
+    Merging t-digest: approximate quantiles of a stream in bounded memory.
+
+    Values are buffered and periodically merged into a few hundred centroids
+    (growing only logarithmically with the count), which are kept small near
+    the tails so extreme percentiles (p95, p99) stay accurate.
+    """
+
+    def __init__(self, compression=100, buffer_size=500):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.centroids = []  # [mean, weight], sorted by mean
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._buffer = []
+
+    def add(self, value, weight=1):
+        self._buffer.append([value, weight])
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another digest into this one"""
+        other._compress()
+        if not other.count:
+            return
+        self._buffer.extend([mean, weight] for mean, weight in other.centroids)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + self._buffer)
+        self._buffer = []
+
+        total = self.count
+        merged = [points[0][:]]
+        seen = 0
+        for mean, weight in points[1:]:
+            last = merged[-1]
+            q = (seen + last[1] + weight / 2) / total
+            # Centroid size limit shrinks towards q = 0 and q = 1
+            if last[1] + weight <= max(1, 4 * total * q * (1 - q) / self.compression):
+                last[0] += (mean - last[0]) * weight / (last[1] + weight)
+                last[1] += weight
+            else:
+                seen += last[1]
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q):
+        """Returns: the approximate q-quantile (0 <= q <= 1), or None if empty"""
+        self._compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+
+        target = q * self.count
+        seen = 0
+        previous_mean, previous_center = self.min, 0
+        for mean, weight in self.centroids:
+            center = seen + weight / 2
+            if target <= center:
+                # Interpolate between neighbouring centroid centers
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span else 0
+                return previous_mean + (mean - previous_mean) * fraction
+            previous_mean, previous_center = mean, center
+            seen += weight
+
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span else 0
+        return previous_mean + (self.max - previous_mean) * fraction
+
+
+class Distribution:
+    """Counts of small non-negative integers, with one overflow bucket"""
+
+    def __init__(self, max_value=20):
+        self.max_value = max_value
+        self.counts = [0] * (max_value + 2)
+        self.total = 0
+        self.count = 0
+
+    def add(self, value):
+        self.counts[min(max(0, value), self.max_value + 1)] += 1
+        self.total += value
+        self.count += 1
+
+    def summary(self):
+        buckets = {str(value): n for value, n in enumerate(self.counts[:-1]) if n}
+        if self.counts[-1]:
+            buckets[f'{self.max_value + 1}+'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 2) if self.count else 0.0,
+            'buckets': buckets
+        }
+
+
+class StatsRollup:
+    """
+    Streaming aggregation of completed games.
+
+    Each completion updates global and per-difficulty completion-time
+    digests, hint and note usage distributions, and an hourly rollup, so
+    summaries cost the same whether there are ten players or ten million.
+    Hourly rollups are kept for the last retention_hours wall-clock hours;
+    older ones (and replayed completions older than that) are dropped.
+    """
+
+    PERCENTILES = (0.5, 0.75, 0.9, 0.95, 0.99)
+
+    def __init__(self, retention_hours=48, compression=100):
+        self.retention_hours = retention_hours
+        self.compression = compression
+        self._lock = threading.Lock()
+
+        self.times = TDigest(compression)
+        self.times_by_difficulty = {}
+        self.hints = Distribution(max_value=10)
+        self.notes = Distribution(max_value=50)
+        self.hours = {}
+        self._hour_keys = []  # Sorted; replayed completions can arrive out of order
+
+    @staticmethod
+    def _first_hour(hours, now=None):
+        """Start of the oldest of the last `hours` wall-clock hours"""
+        return int((now or time.time()) // 3600 * 3600) - (hours - 1) * 3600
+
+    def record_completion(self, difficulty, time_taken, hints_used=0, notes_used=0, timestamp=None):
+        now = time.time()
+        hour = int((timestamp or now) // 3600 * 3600)
+        first_hour = self._first_hour(self.retention_hours, now)
+        with self._lock:
+            self.times.add(time_taken)
+            digest = self.times_by_difficulty.get(difficulty)
+            if digest is None:
+                digest = self.times_by_difficulty[difficulty] = TDigest(self.compression)
+            digest.add(time_taken)
+            self.hints.add(hints_used)
+            self.notes.add(notes_used)
+
+            while self._hour_keys and self._hour_keys[0] < first_hour:
+                del self.hours[self._hour_keys.pop(0)]
+            if hour < first_hour:
+                return
+
+            rollup = self.hours.get(hour)
+            if rollup is None:
+                rollup = self.hours[hour] = {
+                    'completions': 0, 'total_time': 0.0, 'hints_used': 0, 'notes_used': 0,
+                    'by_difficulty': {}
+                }
+                insort(self._hour_keys, hour)
+            rollup['completions'] += 1
+            rollup['total_time'] += time_taken
+            rollup['hints_used'] += hints_used
+            rollup['notes_used'] += notes_used
+            rollup['by_difficulty'][difficulty] = rollup['by_difficulty'].get(difficulty, 0) + 1
+
+    def _times_summary(self, digest):
+        return {
+            'count': digest.count,
+            'min': digest.min,
+            'max': digest.max,
+            'percentiles': {
+                f'p{round(q * 100)}': round(digest.quantile(q), 2) for q in self.PERCENTILES
+            } if digest.count else {}
+        }
+
+    def summary(self, hours=24):
+        """Global and per-difficulty percentiles, usage distributions and the last `hours` hours"""
+        with self._lock:
+            start = bisect_left(self._hour_keys, self._first_hour(hours)) if hours > 0 else len(self._hour_keys)
+            recent = [(hour, self.hours[hour]) for hour in self._hour_keys[start:]]
+            return {
+                'completion_times': self._times_summary(self.times),
+                'completion_times_by_difficulty': {
+                    difficulty: self._times_summary(digest)
+                    for difficulty, digest in sorted(self.times_by_difficulty.items())
+                },
+                'hints_used': self.hints.summary(),
+                'notes_used': self.notes.summary(),
+                'hourly': [
+                    {
+                        'hour': hour,
+                        'completions': rollup['completions'],
+                        'avg_time': round(rollup['total_time'] / rollup['completions'], 2),
+                        'hints_used': rollup['hints_used'],
+                        'notes_used': rollup['notes_used'],
+                        'by_difficulty': dict(rollup['by_difficulty'])
+                    }
+                    for hour, rollup in recent
+                ]
+            }
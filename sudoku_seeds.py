@@ -0,0 +1,144 @@
+"""
+Graded 9x9 seed puzzles per difficulty as (puzzle, solution) digit strings.
+Every puzzle has a unique solution and a grade within SEED_GRADES.
+Generated by `python sudoku_solver.py --write-seeds`; do not edit.
+"""
+
+SEEDS = {
+    'easy': (
+        ('803204600900507008000938415086075900045192876070046031097051083001483750500729104', '853214697914567328762938415186375942345192876279846531497651283621483759538729164'),
+        ('532000789860070053197030206471002965026907000000400072680095420240813607710620538', '532146789864279153197538246471382965326957814958461372683795421245813697719624538'),
+        ('612354790087169324000080610030918007100000002096007851950000283821490576703820109', '612354798587169324349782615235918467178546932496237851954671283821493576763825149'),
+        ('906034050523178469874690200032406907000001340045903000300049072097562813050007694', '916234758523178469874695231132456987689721345745983126361849572497562813258317694'),
+        ('700204098150360402000087360312048009007920813900006700820603940693051207574802136', '736214598158369472249587361312748659467925813985136724821673945693451287574892136'),
+        ('007100486605370000400800573200591730050708094070603200790086350368215940514937860', '937152486685374129421869573246591738153728694879643215792486351368215947514937862'),
+        ('002135087506204001017869005109048062073900004200617953821090470030400129960021508', '492135687586274391317869245159348762673952814248617953821593476735486129964721538'),
+        ('008300596300008127192070040607080950583004712024100863050009231039621405240035670', '478312596365498127192576348617283954583964712924157863856749231739621485241835679'),
+        ('208103500300859004450607130682571900190430072704206015520700390810000457907305280', '278143569361859724459627138682571943195438672734296815526784391813962457947315286'),
+        ('000200080682147500043895102307014928460003005210708043924081300800470251501062804', '195236487682147539743895162357614928468923715219758643924581376836479251571362894'),
+        ('083125769210607008750090030367012985108509020002368070834000690600083542025040810', '483125769219637458756894231367412985148579326592368174834251697671983542925746813'),
+        ('060039057794520183153070006305010000029004710810695042431702598070800604580940270', '268139457794526183153478926345217869629384715817695342431762598972851634586943271'),
+        ('500120800804006192010409005007064500050237019003005274381742056976350428040698730', '569123847834576192712489365127964583458237619693815274381742956976351428245698731'),
+        ('205003809063080201178052034309010700000800013017639502682540307531708420004326180', '245163879963487251178952634359214768426875913817639542682541397531798426794326185'),
+        ('429030087300208401007094000172860034600042815548309762034080150005021046060453270', '429136587356278491817594623172865934693742815548319762234687159785921346961453278'),
+        ('800034506074650200005019083100406008086003721093180654508301907940065132631920005', '819234576374658219265719483152476398486593721793182654528341967947865132631927845'),
+        ('607013085038470092100589307014897256059000804000050739860720900920040578475038600', '697213485538476192142589367314897256759362814286154739861725943923641578475938621'),
+        ('278004000390560182051820703105748006486010070029650004910080050567291408842075090', '278134569394567182651829743135748926486912375729653814913486257567291438842375691'),
+        ('084310560900060318360859247000285930430106052209000001542001870890074025600528093', '784312569925467318361859247176285934438196752259743681542931876893674125617528493'),
+        ('100230600480150070023670145015027409008405317094000800872540030609702584041083726', '157234698486159273923678145315827469268495317794361852872546931639712584541983726'),
+        ('630240978007198503080600200124009685500004320378526410410753096050000034003461052', '631245978247198563985637241124379685569814327378526419412753896756982134893461752'),
+        ('145236098000158346836094000304062809502800001698307050907403005001970063053080927', '145236798729158346836794512314562879572849631698317254967423185281975463453681927'),
+        ('017203689200609304300040025024931758005470006793805402040080290070090063931520847', '417253689258619374369748125624931758185472936793865412546387291872194563931526847'),
+        ('000000500540816239328005410000109875075683900000057361732568194890072600600931708', '916324587547816239328795416263149875175683942489257361732568194891472653654931728'),
+        ('001039608900060072653287490100305020205040039437008516306800147814090265572004003', '721439658948561372653287491169375824285146739437928516396852147814793265572614983'),
+        ('869000570327400009041897200035000942478020360602350701203946100900780423014500698', '869213574327465819541897236135678942478129365692354781283946157956781423714532698'),
+        ('700023045039560100152800307215090703008370200970280010094012536327406091561938000', '786123945439567128152849367215694783648371259973285614894712536327456891561938472'),
+        ('293140700080253691106098304530462817672800900841070562000027080010630200020981030', '293146758487253691156798324539462817672815943841379562364527189918634275725981436'),
+        ('608410097429307068700698040106070039500100806003869700054720001870931654960504072', '638412597429357168715698243186275439597143826243869715354726981872931654961584372'),
+        ('000023578237458196085679320310947860504300907098510000800700000050061003673095241', '946123578237458196185679324312947865564382917798516432821734659459261783673895241'),
+        ('650030487407509123203008509320607908094800000768093000042301095030256870576900312', '659132487487569123213748569325617948194825736768493251842371695931256874576984312'),
+        ('098003000135406209204859316316080904429017538507000601740008192901702860000091700', '698123457135476289274859316316285974429617538587934621743568192951742863862391745'),
+    ),
+    'medium': (
+        ('300100700020407503700608024003000406009306050068051200002514970007000315950780640', '384125769126497583795638124513872496279346851468951237632514978847269315951783642'),
+        ('700100639683900000109000400500012090207083004401700580304009021972001346006004070', '745128639683945217129367458568412793297583164431796582354679821972851346816234975'),
+        ('010000080500170290208069103130000065400816930090325010675041008080052000024600050', '719234586563178294248569173132497865457816932896325417675941328381752649924683751'),
+        ('075213000000560270002000015006800050740009302059730180593600027001970506060025800', '675213948914568273382497615136842759748159362259736184593681427821974536467325891'),
+        ('428153079030006410000084003300020040240509061096000025074005002503840000682071000', '428153679735296418169784253351628947247539861896417325974365182513842796682971534'),
+        ('780213009000456000510000204128040397005038601360029005000081700002000016801002043', '784213569239456178516897234128645397495738621367129485643981752952374816871562943'),
+        ('091345678835060009400089350027000410600070032103026080000002865050010000700053004', '291345678835167249476289351527938416689471532143526987314792865958614723762853194'),
+        ('001004506409658012600170834160583900097000683380060251000010009003400070000002060', '871324596439658712625179834162583947597241683384967251746815329253496178918732465'),
+        ('436207500109405062028009074210854090090070205765000010050003046347000020002040000', '436217589179485362528639174213854697894176235765392418951723846347568921682941753'),
+        ('086300497003090006970086310068030900010009003000064020801003570790501600635078100', '586312497143795286972486315268137954417259863359864721821643579794521638635978142'),
+        ('520060000704000300683000042007040930800673020045002617030097504008005063052006791', '521364879794128356683759142267541938819673425345982617136297584978415263452836791'),
+        ('009045680054028030800000450040519800000000394007000021401052700523701940678003010', '239145687754628139816937452342519876185276394967384521491852763523761948678493215'),
+        ('821300079950070020073290800247530086300487000080060030030050700700024503500003208', '821345679956178324473296815247531986369487152185962437632859741718624593594713268'),
+        ('000100040700309100921400563596000834030904007400063090810690400050741002000805016', '385126749764359128921478563596217834132984657478563291813692475659741382247835916'),
+        ('052000090070006030436795028100052004389140000000869301728001640590020010600078000', '852413796971286435436795128167352984389147562245869371728531649593624817614978253'),
+        ('450200098809000013000609050134005820500830040082000009610790382973000100248001005', '457213698869457213321689457134975826596832741782146539615794382973528164248361975'),
+        ('000010008806030002120678005300060000460090037597004006071846020003950764004723001', '735412698846539172129678345318267459462195837597384216971846523283951764654723981'),
+        ('600123080002009100500008600250431790901060800006800051174905203365000970009070004', '697123485482659137513748629258431796931567842746892351174985263365214978829376514'),
+        ('402105080861207300003090010146300008579486102028001040200010009000062470000950001', '492135687861247395753698214146329758579486132328571946284713569915862473637954821'),
+        ('490150028003000000600407053206000507340070000800020016934802060700305984000749231', '497153628153286479682497153216938547345671892879524316934812765721365984568749231'),
+        ('309000080027003009080049030093120768570690000200030910700361090804050601910870050', '349216587627583149185749236493125768571698423268437915752361894834952671916874352'),
+        ('504216000302504007009038402050400706700085240046079003000300004807042065000061370', '574216938382594617619738452158423796793685241246179583961357824837942165425861379'),
+        ('040032589092648371081500006030001864050000002009027100870000900603790200900085007', '746132589592648371381579426237951864158463792469827135875216943613794258924385617'),
+        ('705010340309070206600009785038000900000100407400900830062430500073800694004007123', '785216349349578216621349785538724961296183457417965832962431578173852694854697123'),
+        ('407020008810400200000000105120009007000530980589200006260847030735900820948300701', '457123698816495273392768145123689457674531982589274316261847539735916824948352761'),
+        ('705000006240086090860359420030208600600000000509040802900835060456900738302400100', '795124386243786591861359427134298675628571943579643812917835264456912738382467159'),
+        ('900206500040530029250109403003825704400371052005000031094002306008400005000058900', '931246578846537129257189463163825794489371652725964831594712386678493215312658947'),
+        ('506000700007056009304009000105072093068390107000800052000204005000508416450967238', '596123784817456329324789561145672893268395147739841652683214975972538416451967238'),
+        ('564002800009008016107096000005001900892007460600004508403000029020640150706210380', '564172893239458716187396245345861972892537461671924538413785629928643157756219384'),
+        ('908100067072306809005790030364005008000601070000009000001803795750042381800010406', '938124567172356849645798132364275918589631274217489653421863795756942381893517426'),
+        ('257043069010568204400020153170800900546200000900406025800000607030080090004001082', '257143869319568274468729153172835946546297318983416725821954637735682491694371582'),
+        ('100530689900601000468207003004900370057000000300070512090025431801700965003009020', '172534689935681247468297153214958376657312894389476512796825431821743965543169728'),
+    ),
+    'hard': (
+        ('100030607000100030350087290007240010000000004060001900020074068071023000000006300', '192435687786192435354687291537249816219368754468751923923574168671823549845916372'),
+        ('080230560700010000500700002050100040009600001018000305100800000406051070800006059', '981234567762518493534769812257183946349625781618947325175892634496351278823476159'),
+        ('300000040094308000680090351006200900030860000000005074000000090041600005060049028', '375126849194358267682497351456271983739864512218935674827513496941682735563749128'),
+        ('907032084200040090004900200020600000010408906086010050000004000602070010000200078', '967132584258746193134985267329657841715428936486319752871564329692873415543291678'),
+        ('002305008090286050000900000006753480089004070000000013900060741700001800000000600', '172345968493286157658917324216753489389124576547698213935862741764531892821479635'),
+        ('000135000073420500090000320200000000007200043400380100902017004005800710010000009', '826135497173429568594768321231974685687251943459386172962517834345892716718643259'),
+        ('036120009000000607000465120018003060004000008090000230000980070702030000040600580', '436127859125398647879465123218743965364259718597816234651984372782531496943672581'),
+        ('090100400000700193308000060050020386000000910000513700800006004009000000072801039', '697132458245768193318459267154927386723684915986513742831296574469375821572841639'),
+        ('893020000002000091000070200036904700240007086708600900604000800310040000000000074', '893125467472836591561479238136984752249357186758612943624793815317548629985261374'),
+        ('016234870090008002400000000100640008600302100050780460030000000000020705040005080', '516234879397168542428597631173649258684352197952781463735816924869423715241975386'),
+        ('709000608080530109001009000060200005008000700904080060400000510000041097010900026', '739412658682537149541869372163274985258196734974385261496728513325641897817953426'),
+        ('900000080301002940804003000006208000509000061008560230200759400400000090007000005', '972145683351682947864973152136298574529437861748561239283759416415326798697814325'),
+        ('000103000372000186001080004008200007006900800500000003805090700003600400469001050', '684123579372549186951786234138265947246937815597418623825394761713652498469871352'),
+        ('009006508600000000002709136100693002307025080000007000080300010004070860000800004', '419236578673518429852749136148693752397425681526187943985364217234971865761852394'),
+        ('802100006100700084009000050208360000050000960906007001001800647080401500000050000', '832145796165792384479638152218369475357214968946587231591823647683471529724956813'),
+        ('000230700830006004640789003006000005025900300000007612000002400710405200000070000', '951234768837156924642789153476321895125968347389547612563812479718495236294673581'),
+        ('809200000050410000700000003005180004060000530007003082000540700096000240400002395', '819235467653417829724698153235186974968724531147953682382549716596371248471862395'),
+        ('063102450009400007040500060020641700000007801000000000734090000000000900910763008', '863172459259436187147589362328641795496357821571928634734895216685214973912763548'),
+        ('008403790060000000002690000140206907600000200007050400054000073081700040030800500', '518423796469517328372698154145286937693174285827359461254961873981735642736842519'),
+        ('000023096004000100009076835420000000105030248600240001000000300006000084000950700', '758123496364589127219476835427891653195637248683245971542768319976312584831954762'),
+        ('067130894008200371100000060071000900024001000500320000000600027600040130040000000', '267135894458269371139478265371856942824791653596324718915683427682547139743912586'),
+        ('900102000060000007001000359108600030040908761600003502010090005000001008000065100', '957132846463589217281746359128657934345928761679413582812394675536271498794865123'),
+        ('002000009005100040900327060003090857000078000004000690050004100689003000401000076', '312645789765189243948327561123496857596278314874531692257964138689713425431852976'),
+        ('319000607000000040520000030030050064000630700006420050090060000800500906602903500', '319245687768391245524786139237159864451638792986427351195862473873514926642973518'),
+        ('500000700160000000079548000205001000003070850007000003700850216801603400000004008', '542136789168297345379548162285361974693472851417985623734859216851623497926714538'),
+        ('001006000943180000800000030100632947600000503000790000082070001090800002000024090', '521346789943187265867259134158632947679418523234795816482973651395861472716524398'),
+        ('800000007000398001000407309109000000000023015500004600001052030906700052000049100', '893215467674398521215467389139576248468923715527184693781652934946731852352849176'),
+        ('200000000000700300090062075000190063300800507006040901007004139504001000001200004', '273415698645789312198362475452197863319826547786543921827654139534971286961238754'),
+        ('005300009090287060800000000006103000140070002000500041050000030000806405430720806', '265314789391287564874659123526143978143978652987562341658491237712836495439725816'),
+        ('000350098743000000950600004009230005300805000005700930007000100502000000081072050', '216354798743189562958627314179236845364895271825741936437568129592413687681972453'),
+        ('729003000481200000005900004172006985530700000600001700000009047800000200050000008', '729143856481265379365978124172436985538792461694851732213689547846517293957324618'),
+        ('000020706007068009030097004172000900000602075056800003000006001000040000869700500', '984123756527468139631597824172354968398612475456879213745286391213945687869731542'),
+    ),
+    'expert': (
+        ('900100005165470000002000000000700060080030700009008500006300100004807302000040000', '938126475165479283742583916253794861481635729679218534896352147514867392327941658'),
+        ('002000009450000200800007005000002060080050004600010000031005006006980000500700003', '172534689453896217869127345315472968287659134694318752931245876746983521528761493'),
+        ('602000058000070009037000060010003805050400010008020000060000400000900000000701300', '692314758485276139137859264214693875356487912978125643861532497743968521529741386'),
+        ('000430009670000000000000016000500900000042001095010062001890000003000070000020304', '152436789679185243438279516214568937367942851895317462741893625923654178586721394'),
+        ('300052600071000020900000300040000030005068207009000010000900000000070000700316000', '384152679571639428926847351247591836135468297869723514412985763693274185758316942'),
+        ('840000090605004000003000700019070004060030900000050030030010200000005006000090000', '847123695695784312123569748319278564568431927274956831436817259982345176751692483'),
+        ('070000069003100000205400000300000000000005082000700501800004700009000830006002000', '178253469463179258295468173354821697617945382982736541831594726529617834746382915'),
+        ('380100000200509004000000002030008907002000000000090621800005006046000000007010430', '385142769271569384469837512134628957692751843758394621813475296946283175527916438'),
+        ('000005000098030010001007040106400000040009001007000400000600000062004000300020508', '723145689498236715651897342136458927245769831987312456519683274862574193374921568'),
+        ('004007600000020095310000000000705004000000000080006001042000000890000407060012008', '924157683678324195315698742139785264456231879287946531542879316891563427763412958'),
+        ('500200000300040068000067002160000007000000080000000014002600040050380200090005000', '586213479327549168419867352163458927945172683278936514832691745751384296694725831'),
+        ('080240056000090000003000400009000000007006105004070000000000019608010020400005300', '781243956546791832923658471169532748237486195854179263375824619698317524412965387'),
+        ('030000000000069407006000210200100900000600000600090002000040080007030000004927500', '735214698821369457496758213248173965579682341613495872362541789957836124184927536'),
+        ('001030097200000000090080350405000000000008000102006804000900005000000183006001000', '841235697253769418697184352485312976369478521172596834718943265924657183536821749'),
+        ('000300006004008010000090240000700000180002070570080320905060008048000000610000900', '291345786364278519857691243432716895189532674576489321925167438748953162613824957'),
+        ('020130080005200004800079000010090057000006400000000030000000005087000003040000210', '724135689195268374863479521416392857378516492952847136231984765587621943649753218'),
+        ('800105300100200480900060000030000056090007030000602000600001002050090000000000040', '827145369163279485945863127238914756496587231571632894684351972752498613319726548'),
+        ('049010000000600080675004100400029050000005031700000000000000007000080290907000300', '849213675312657489675894123438129756296475831751368942184932567563781294927546318'),
+        ('000040008540000090706500200009002080000807005000159000002000000800000301000613000', '921346758543278196786591234159432687234867915678159423312784569867925341495613872'),
+        ('008305000700106034400700002003600578000000900500000000001530020004000000000000095', '128345769795126834436798152243619578817253946569487213981534627654972381372861495'),
+        ('700000000260000370000090052500002000100765800030000000012500007300800006400900000', '759213648261458379843697152598342761124765893637189524912536487375824916486971235'),
+        ('030005700001200056009000000000590300070100004040072000000000502004900000600801000', '236415789781239456459768231162594378975183624348672195897346512514927863623851947'),
+        ('000120000004070028105000600200004000400210030060090200008740050000000000000065900', '876123495934576128125489673213654789489217536567398241698741352751932864342865917'),
+        ('007000500002005610180000003000720800030000000009308040941000000000030005000071000', '467213589392485617185697423514729836738146952629358741941562378276834195853971264'),
+        ('030000000805307000000480020104705800080000090000030000060000000053006009000000230', '439152678825367941617489325194725863382614597576938412261893754753246189948571236'),
+        ('005100000006000080902000004100000000200918006009700020400030092500002000000006048', '835124967746359281912687354174265839253918476689743125467831592598472613321596748'),
+        ('053020600000700009000608500006010090130400000070000000000851070801009004000000900', '953124687682735149417698532246517893139482765578963421394851276861279354725346918'),
+        ('000000360092306000070080204005920800000800401000004050000603000000090100030010002', '854172369192346587673589214345921876769835421218764953921653748486297135537418692'),
+        ('000002050900000180030000400000076800708500000390400607249060000000050200007001000', '486132759972645183531897462124376895768529341395418627249763518813954276657281934'),
+        ('000000009001009030030008060100300000000920003009007040080040100000801000600000705', '856132479421679538937458261142386957578924613369517842283745196795861324614293785'),
+        ('030100500005300000290000640000000000009400021010806300080050002000002000000010009', '637124598845369217291587643458231976369475821712896354184953762973642185526718439'),
+        ('009003065200600300010049020050400000007001238000000040000200050700000000080010000', '879123465245687319316549827158432976467951238923876541631298754794365182582714693'),
+    ),
+}
@@ -1,177 +1,863 @@
+import os
 import random
-import copy
-import hashlib
+
+def build_tables(box_size=3):
+    """
+    Build the units and peers tables for a board of box_size^2 cells per side
+    Returns: (units, peers) where units is a tuple of row, column and box cell
+    lists and peers[row][col] is the tuple of cells sharing a unit with it
+    """
+    size = box_size * box_size
+    rows = [tuple((r, c) for c in range(size)) for r in range(size)]
+    cols = [tuple((r, c) for r in range(size)) for c in range(size)]
+    boxes = [
+        tuple((r, c)
+              for r in range(br, br + box_size)
+              for c in range(bc, bc + box_size))
+        for br in range(0, size, box_size)
+        for bc in range(0, size, box_size)
+    ]
+    units = tuple(rows + cols + boxes)
+    
+    peers = []
+    for r in range(size):
+        row_peers = []
+        for c in range(size):
+            box = (r // box_size) * box_size + c // box_size
+            cells = set(rows[r]) | set(cols[c]) | set(boxes[box])
+            cells.discard((r, c))
+            row_peers.append(tuple(sorted(cells)))
+        peers.append(tuple(row_peers))
+    
+    return units, tuple(peers)
+
+def write_tables_module(path=None, box_size=3):
+    """
+    Freeze the tables into an importable module. Cells are stored as flat
+    indices in hex strings, which compile and load far faster than nested
+    tuple literals when no .pyc is available (e.g. serverless cold starts).
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sudoku_tables.py')
+    units, peers = build_tables(box_size)
+    size = box_size * box_size
+    units_hex = bytes(r * size + c for unit in units for r, c in unit).hex()
+    peers_hex = bytes(r * size + c for row in peers for cell in row for r, c in cell).hex()
+    with open(path, 'w') as f:
+        f.write('"""\nPrecomputed units and peers for the 9x9 board as flat cell indices.\n'
+                'Generated by `python sudoku_solver.py --write-tables`; do not edit.\n"""\n\n')
+        f.write(f'BOX_SIZE = {box_size}\n\n')
+        f.write(f'UNITS_HEX = {units_hex!r}\n\n')
+        f.write(f'PEERS_HEX = {peers_hex!r}\n')
+
+def load_frozen_tables():
+    """Load the 9x9 tables from sudoku_tables, or build them if it is missing"""
+    try:
+        from sudoku_tables import BOX_SIZE, UNITS_HEX, PEERS_HEX
+    except ImportError:
+        return build_tables(3)
+    
+    size = BOX_SIZE * BOX_SIZE
+    cells = [divmod(index, size) for index in range(size * size)]
+    unit_data = bytes.fromhex(UNITS_HEX)
+    peer_data = bytes.fromhex(PEERS_HEX)
+    peer_count = len(peer_data) // (size * size)
+    
+    units = tuple(
+        tuple(cells[index] for index in unit_data[i:i + size])
+        for i in range(0, len(unit_data), size)
+    )
+    peers = tuple(
+        tuple(
+            tuple(cells[index] for index in peer_data[(r * size + c) * peer_count:(r * size + c + 1) * peer_count])
+            for c in range(size)
+        )
+        for r in range(size)
+    )
+    return units, peers
+
+def write_seeds_module(path=None, per_difficulty=32):
+    """
+    Freeze a bank of graded 9x9 seed puzzles for generate_from_seeds. Every
+    seed has exactly one solution (generate_unique_puzzle) and a grade_puzzle
+    grade within SEED_GRADES for its difficulty; candidates outside it are
+    skipped. Each entry is the puzzle and its solution as 81-digit strings;
+    the candidate seeds are fixed so regenerating gives the same bank.
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sudoku_seeds.py')
+    import hashlib  # Offline only
+    solver = SudokuSolver()
+    with open(path, 'w') as f:
+        f.write('"""\nGraded 9x9 seed puzzles per difficulty as (puzzle, solution) digit strings.\n'
+                'Every puzzle has a unique solution and a grade within SEED_GRADES.\n'
+                'Generated by `python sudoku_solver.py --write-seeds`; do not edit.\n"""\n\n')
+        f.write('SEEDS = {\n')
+        for difficulty in DIFFICULTY_REMOVAL:
+            lowest, highest = SEED_GRADES[difficulty]
+            f.write(f'    {difficulty!r}: (\n')
+            kept = index = 0
+            while kept < per_difficulty:
+                seed = int(hashlib.md5(f'seed-bank:{difficulty}:{index}'.encode()).hexdigest(), 16)
+                index += 1
+                puzzle, solution = solver.generate_unique_puzzle(difficulty, random.Random(seed))
+                if not lowest <= solver.grade_puzzle(puzzle) <= highest:
+                    continue
+                encoded = [''.join(str(value) for row in board for value in row) for board in (puzzle, solution)]
+                f.write(f'        ({encoded[0]!r}, {encoded[1]!r}),\n')
+                kept += 1
+            f.write('    ),\n')
+        f.write('}\n')
+
+_seed_bank = None
+
+def load_seed_bank():
+    """Load the 9x9 seed bank on first use; empty if sudoku_seeds is missing"""
+    global _seed_bank
+    if _seed_bank is None:
+        try:
+            from sudoku_seeds import SEEDS
+        except ImportError:
+            SEEDS = {}
+        _seed_bank = SEEDS
+    return _seed_bank
+
+UNITS, PEERS = load_frozen_tables()
+
+# Supported board sizes (cells per side) and their box sizes
+BOARD_SIZES = {4: 2, 9: 3, 16: 4, 25: 5}
+
+# Share of cells removed per difficulty; 30/40/50/60 of 81 on a 9x9 board
+DIFFICULTY_REMOVAL = {
+    'easy': 30 / 81,
+    'medium': 40 / 81,
+    'hard': 50 / 81,
+    'expert': 60 / 81
+}
+
+# Seed bank grades (grade_puzzle) allowed per difficulty, easiest and hardest:
+# 1 naked singles, 2 hidden singles, 3 locked candidates, 4 anything harder
+SEED_GRADES = {
+    'easy': (1, 1),
+    'medium': (1, 2),
+    'hard': (2, 3),
+    'expert': (4, 4)
+}
+
+# Node cap per cell for one attempt at filling a board other than 9x9
+FILL_NODES_PER_CELL = 3
+
+
+class SearchLimitReached(Exception):
+    """A capped solve ran out of nodes before finding a solution or proving there is none"""
+
+_tables = {3: (UNITS, PEERS)}
+_solvers = {}
+
+def get_tables(box_size):
+    """Get the (units, peers) tables for a box size, building them once"""
+    if box_size not in _tables:
+        _tables[box_size] = build_tables(box_size)
+    return _tables[box_size]
+
+def get_solver(size=9):
+    """
+    Get the shared solver for a board size
+    Returns: SudokuSolver or None if the size is not supported
+    """
+    if size not in BOARD_SIZES:
+        return None
+    if size not in _solvers:
+        _solvers[size] = SudokuSolver(BOARD_SIZES[size])
+    return _solvers[size]
+
+# Unit kinds: (validation details key, conflict label)
+UNIT_KINDS = {
+    'row': ('rows_valid', 'Row'),
+    'column': ('columns_valid', 'Column'),
+    'box': ('boxes_valid', 'Box'),
+    'diagonal': ('diagonals_valid', 'Diagonal'),
+    'window': ('windows_valid', 'Window'),
+    'region': ('regions_valid', 'Region'),
+    'cage': ('cages_valid', 'Cage')
+}
+
+class ConstraintEngine:
+    """
+    Sudoku rules compiled from a list of units and cages.
+
+    A unit is a group of cells whose numbers must all differ (rows, columns,
+    boxes, diagonals, jigsaw regions, windows); a cage is a group whose
+    numbers must also add up to a total (killer). Compiling turns them into
+    per-cell peer and unit tables, so every check is table lookups and
+    bitmask tests whatever the variant.
+    """
+
+    def __init__(self, size, units, cages=(), peers=None):
+        """
+        units: sequence of (kind, cells) and cages: sequence of (cells, total),
+        with cells as (row, col) pairs; peers: the matching peers[row][col]
+        table if the caller already has one (the frozen 9x9 table)
+        """
+        self.size = size
+        self.cages = tuple((tuple(r * size + c for r, c in cells), total) for cells, total in cages)
+
+        compiled = [(kind, tuple(r * size + c for r, c in cells)) for kind, cells in units]
+        compiled += [('cage', cells) for cells, _ in self.cages]
+        self.kinds = tuple(kind for kind, _ in compiled)
+        self.units = tuple(cells for _, cells in compiled)
+
+        # Number of each unit among those of its kind, for conflict messages
+        counts = {}
+        self.numbers = []
+        for kind in self.kinds:
+            counts[kind] = counts.get(kind, 0) + 1
+            self.numbers.append(counts[kind])
+
+        cell_count = size * size
+        cell_units = [[] for _ in range(cell_count)]
+        for index, cells in enumerate(self.units):
+            for cell in cells:
+                cell_units[cell].append(index)
+        self.cell_units = tuple(tuple(indices) for indices in cell_units)
+        # Peers as (row, col) for checks on nested boards
+        if peers is None:
+            peers = tuple(
+                tuple(
+                    tuple(divmod(peer, size) for peer in sorted(
+                        {peer for index in cell_units[r * size + c] for peer in self.units[index]} - {r * size + c}))
+                    for c in range(size)
+                )
+                for r in range(size)
+            )
+        self.peer_cells = peers
+        self.cell_cage = [None] * cell_count
+        for index, (cells, _) in enumerate(self.cages):
+            for cell in cells:
+                self.cell_cage[cell] = index
+
+    @classmethod
+    def classic(cls, box_size=3):
+        """Rows, columns and boxes, from the shared units and peers tables"""
+        units, peers = get_tables(box_size)
+        size = box_size * box_size
+        kinds = ('row',) * size + ('column',) * size + ('box',) * size
+        return cls(size, zip(kinds, units), peers=peers)
+
+    def _cage_conflict(self, cells, index):
+        """
+        Check a cage's sum against its total: too high for the filled cells
+        plus one per empty cell, or wrong once the cage is full
+        """
+        cage_cells, total = self.cages[index]
+        values = [cells[cell] for cell in cage_cells]
+        empty = values.count(0)
+        return sum(values) + empty > total or (not empty and sum(values) != total)
+
+    def is_valid_move(self, board, row, col, num):
+        """Check if placing num at (row, col) clashes with a peer or a cage total"""
+        for i, j in self.peer_cells[row][col]:
+            if board[i][j] == num:
+                return False
+
+        if self.cages:
+            index = self.cell_cage[row * self.size + col]
+            if index is not None:
+                cells = [value for line in board for value in line]
+                cells[row * self.size + col] = num
+                return not self._cage_conflict(cells, index)
+        return True
+
+    def available_numbers(self, board, row, col):
+        used = {board[i][j] for i, j in self.peer_cells[row][col]}
+        return [num for num in range(1, self.size + 1) if num not in used]
+
+    def _unit_conflict(self, cells, index):
+        """Check a unit for a repeated number, with one bit per number seen"""
+        seen = 0
+        for cell in self.units[index]:
+            value = cells[cell]
+            if value:
+                bit = 1 << value
+                if seen & bit:
+                    return True
+                seen |= bit
+        return False
+
+    def is_valid_board(self, board):
+        """Check every unit for repeated numbers and every cage for its total"""
+        cells = [value for row in board for value in row]
+        # _unit_conflict inlined: this runs after every move
+        for unit in self.units:
+            seen = 0
+            for cell in unit:
+                value = cells[cell]
+                if value:
+                    bit = 1 << value
+                    if seen & bit:
+                        return False
+                    seen |= bit
+        for index in range(len(self.cages)):
+            if self._cage_conflict(cells, index):
+                return False
+        return True
+
+    def validation_details(self, board):
+        """
+        Check every unit and cage, reporting conflicts by unit kind
+        Returns: {'<kind>s_valid': bool per kind, 'conflicts': [...], 'is_valid': bool}
+        """
+        cells = [value for row in board for value in row]
+        details = {UNIT_KINDS[kind][0]: True for kind in self.kinds}
+        details['conflicts'] = []
+
+        for index, kind in enumerate(self.kinds):
+            if self._unit_conflict(cells, index):
+                key, label = UNIT_KINDS[kind]
+                details[key] = False
+                details['conflicts'].append(f'{label} {self.numbers[index]} has duplicate numbers')
+
+        for index, (_, total) in enumerate(self.cages):
+            if self._cage_conflict(cells, index):
+                details['cages_valid'] = False
+                details['conflicts'].append(f'Cage {index + 1} does not add up to {total}')
+
+        details['is_valid'] = not details['conflicts']
+        return details
+
+    def search(self, board, max_nodes=None, rng=None):
+        """
+        Solve the board in place as an exact cover problem (Algorithm X).
+        
+        Each (cell, number) placement covers its cell and the number in each
+        of the cell's units. Units with a cell per number (rows, columns,
+        boxes, diagonals, windows, regions) must get every number exactly
+        once; smaller units (cages) at most once, and a placement that
+        pushes a cage past its total is dropped. Always branching on the
+        constraint with the fewest remaining placements finds naked and
+        hidden singles for free, which keeps 16x16 and 25x25 boards
+        tractable where plain backtracking is not. Sparse 25x25 boards can
+        still need a long search, so max_nodes caps it. rng shuffles the
+        branch order from the start (used to fill empty boards).
+        Returns: True if solved, False if unsolvable, None if the cap was hit
+        """
+        size = self.size
+        cells = size * size
+        
+        # constraint id -> placements that satisfy it; placement -> its constraints
+        constraints = {j: set() for j in range(cells + len(self.units) * size)}
+        placements = {}
+        for cell in range(cells):
+            for n in range(size):
+                placement = cell * size + n
+                covers = (cell,) + tuple(cells + index * size + n for index in self.cell_units[cell])
+                placements[placement] = covers
+                for j in covers:
+                    constraints[j].add(placement)
+        # Only cells and full units have to be covered; cages share the sets
+        primary_ids = {j for j in constraints if j < cells or len(self.units[(j - cells) // size]) == size}
+        primary = constraints if len(primary_ids) == len(constraints) else {j: constraints[j] for j in primary_ids}
+        shared = primary is not constraints
+        
+        def select(placement):
+            removed = []
+            for j in placements[placement]:
+                for other in constraints[j]:
+                    for k in placements[other]:
+                        if k != j:
+                            constraints[k].discard(other)
+                removed.append(constraints.pop(j))
+                if shared:
+                    primary.pop(j, None)
+            return removed
+        
+        def deselect(placement, removed):
+            for j in reversed(placements[placement]):
+                constraints[j] = removed.pop()
+                if shared and j in primary_ids:
+                    primary[j] = constraints[j]
+                for other in constraints[j]:
+                    for k in placements[other]:
+                        if k != j:
+                            constraints[k].add(other)
+        
+        cages = self.cages
+        cage_room = [total for _, total in cages]
+        cage_empty = [len(cage_cells) for cage_cells, _ in cages]
+        
+        def fits_cage(placement, sign):
+            # Add (sign=1) or take back (sign=-1) a number in its cage;
+            # each other empty cell still needs at least 1
+            cell, n = divmod(placement, size)
+            cage = self.cell_cage[cell]
+            if cage is None:
+                return True
+            cage_room[cage] -= sign * (n + 1)
+            cage_empty[cage] -= sign
+            return cage_room[cage] >= cage_empty[cage] and (cage_empty[cage] or not cage_room[cage])
+        
+        # Cage bookkeeping wraps select/deselect only when there are cages,
+        # so classic boards search without it
+        place, unplace = select, deselect
+        if cages:
+            def place(placement):
+                # A number that overfills its cage is a dead end, like a clash
+                if not fits_cage(placement, 1):
+                    fits_cage(placement, -1)
+                    return None
+                return select(placement)
+            
+            def unplace(placement, removed):
+                deselect(placement, removed)
+                fits_cage(placement, -1)
+        
+        # Givens are placed up front; a clash means the board has no solution
+        for r in range(size):
+            for c in range(size):
+                if board[r][c]:
+                    placement = (r * size + c) * size + board[r][c] - 1
+                    if any(j not in constraints or placement not in constraints[j]
+                           for j in placements[placement]):
+                        return False
+                    if place(placement) is None:
+                        return False
+        
+        chosen = []
+        nodes = [0]
+        
+        def search(rng, budget):
+            # True = solved, False = no solution below here, None = out of budget
+            if not primary:
+                return True
+            nodes[0] += 1
+            if nodes[0] > budget:
+                return None
+            # Inline scan for the constraint with fewest options (same pick as
+            # min() with a key, without a call per constraint)
+            j, fewest = None, size + 1
+            for k, options in primary.items():
+                if len(options) < fewest:
+                    j, fewest = k, len(options)
+                    if not fewest:
+                        break
+            options = list(primary[j])
+            if rng is not None:
+                rng.shuffle(options)
+            for placement in options:
+                removed = place(placement)
+                if removed is None:
+                    continue
+                chosen.append(placement)
+                result = search(rng, budget)
+                if result:
+                    return True
+                chosen.pop()
+                unplace(placement, removed)
+                if result is None:
+                    return None
+            return False
+        
+        # Early wrong guesses on sparse boards can trap the search in a huge
+        # dead subtree, so restart with a shuffled branch order and a growing
+        # node budget instead of exhausting it
+        budget, spent = 2 * len(primary) // 4 + 100, 0
+        while True:
+            if max_nodes is not None:
+                budget = min(budget, max_nodes - spent)
+            nodes[0] = 0
+            result = search(rng, budget)
+            spent += nodes[0]
+            if result is not None:
+                break
+            if max_nodes is not None and spent >= max_nodes:
+                return None
+            rng = rng or random.Random(size)
+            budget *= 2
+        
+        if not result:
+            return False
+        for placement in chosen:
+            cell, n = divmod(placement, size)
+            board[cell // size][cell % size] = n + 1
+        return True
 
 class SudokuSolver:
-    def __init__(self):
-        self.size = 9
-        self.box_size = 3
-        
-    def generate_puzzle(self, difficulty='medium'):
+    def __init__(self, box_size=3, engine=None):
+        self.size = box_size * box_size
+        self.box_size = box_size
+        self.full_mask = ((1 << self.size) - 1) << 1  # Bit n set = number n allowed
+        # Rules used by the move and board checks (variants pass their own)
+        self.engine = engine or ConstraintEngine.classic(box_size)
+
+    def generate_puzzle(self, difficulty='medium', rng=random):
         """
-        Generate a new Sudoku puzzle with specified difficulty
+        Generate a new Sudoku puzzle with specified difficulty, drawing
+        randomness from rng (the shared random module by default)
         Returns: (puzzle, solution)
         """
         # Create a solved board first
-        solution = self._create_solved_board()
+        solution = self._create_solved_board(rng)
         
         # Create puzzle by removing numbers based on difficulty
-        puzzle = self._create_puzzle_from_solution(solution, difficulty)
+        puzzle = self._create_puzzle_from_solution(solution, difficulty, rng)
         
         return puzzle, solution
     
-    def generate_puzzle_with_seed(self, seed, difficulty='medium'):
+    def generate_unique_puzzle(self, difficulty='medium', rng=random):
         """
-        Generate a new Sudoku puzzle with a specific seed for reproducibility
+        Generate a puzzle with exactly one solution: clues are removed in
+        random order, skipping any whose removal would allow a second
+        solution, until the difficulty's share is gone or nothing more can
+        go. Costs a solution count per clue, so the seed bank uses it offline
         Returns: (puzzle, solution)
         """
-        # Create a hash from the seed for consistent random generation
-        seed_hash = int(hashlib.md5(seed.encode()).hexdigest(), 16)
-        random.seed(seed_hash)
+        solution = self._create_solved_board(rng)
+        puzzle = [row[:] for row in solution]
         
-        # Generate puzzle
-        puzzle, solution = self.generate_puzzle(difficulty)
+        removal = DIFFICULTY_REMOVAL.get(difficulty, DIFFICULTY_REMOVAL['medium'])
+        cells_to_remove = round(removal * self.size * self.size)
+        positions = [(i, j) for i in range(self.size) for j in range(self.size)]
+        rng.shuffle(positions)
         
-        # Reset random seed
-        random.seed()
+        for i, j in positions:
+            if not cells_to_remove:
+                break
+            value, puzzle[i][j] = puzzle[i][j], 0
+            if self.count_solutions(puzzle) == 1:
+                cells_to_remove -= 1
+            else:
+                puzzle[i][j] = value
         
         return puzzle, solution
     
-    def _create_solved_board(self):
+    def generate_puzzle_with_seed(self, seed, difficulty='medium'):
+        """
+        Generate a new Sudoku puzzle with a specific seed for reproducibility
+        Returns: (puzzle, solution)
+        """
+        import hashlib  # Only needed for seeded puzzles; keeps cold starts lean
+        
+        # A private generator seeded from the hash keeps concurrent seeded
+        # generations (daily calendar, packs, races) from interleaving
+        seed_hash = int(hashlib.md5(seed.encode()).hexdigest(), 16)
+        return self.generate_puzzle(difficulty, random.Random(seed_hash))
+    
+    def generate_from_seeds(self, difficulty='medium', rng=random):
+        """
+        Derive a new puzzle from a graded seed puzzle of the same difficulty
+        by a random symmetry transform: O(cells), no search, and the clue
+        count, rating and number of solutions are those of the seed. Falls
+        back to generate_puzzle when there is no seed bank for this size.
+        Returns: (puzzle, solution)
+        """
+        seeds = load_seed_bank().get(difficulty) if self.size == 9 else None
+        if not seeds:
+            return self.generate_puzzle(difficulty, rng)
+        
+        puzzle, solution = rng.choice(seeds)
+        size = self.size
+        puzzle = [[int(ch) for ch in puzzle[i:i + size]] for i in range(0, size * size, size)]
+        solution = [[int(ch) for ch in solution[i:i + size]] for i in range(0, size * size, size)]
+        return self.transform_puzzle(puzzle, solution, rng)
+    
+    def transform_puzzle(self, puzzle, solution, rng=random):
+        """
+        Apply one random symmetry transform to a puzzle and its solution:
+        digit permutation, row/column permutations within bands and stacks,
+        band/stack swaps and (half the time) transposition
+        Returns: (puzzle, solution)
+        """
+        box_size = self.box_size
+        digits = [0] + rng.sample(range(1, self.size + 1), self.size)
+        rows = [band * box_size + r for band in rng.sample(range(box_size), box_size)
+                for r in rng.sample(range(box_size), box_size)]
+        cols = [stack * box_size + c for stack in rng.sample(range(box_size), box_size)
+                for c in rng.sample(range(box_size), box_size)]
+        if rng.random() < 0.5:
+            puzzle = list(zip(*puzzle))
+            solution = list(zip(*solution))
+        
+        return (
+            [[digits[puzzle[r][c]] for c in cols] for r in rows],
+            [[digits[solution[r][c]] for c in cols] for r in rows]
+        )
+    
+    def _create_solved_board(self, rng=random):
         """Create a valid solved Sudoku board"""
+        if self.size != 9:
+            return self._create_search_board(rng)
+        
         board = [[0 for _ in range(self.size)] for _ in range(self.size)]
         
-        # Fill diagonal 3x3 boxes first (these are independent)
+        # Fill the diagonal boxes first (these are independent)
         for i in range(0, self.size, self.box_size):
-            self._fill_box(board, i, i)
+            self._fill_box(board, i, i, rng)
         
-        # Solve the rest of the board
+        # Solve the rest of the board in row-major order, which keeps
+        # seeded puzzles (daily, packs, races) the same as before
         self._solve_board(board)
         
         return board
     
-    def _fill_box(self, board, row, col):
-        """Fill a 3x3 box with random numbers"""
-        numbers = list(range(1, 10))
-        random.shuffle(numbers)
+    def _create_search_board(self, rng=random):
+        """
+        Create a solved board of any size with the exact cover search:
+        fill the independent diagonal boxes at random, then search the
+        rest in a shuffled branch order. Attempts are capped at a few nodes
+        per cell and retried, since an unlucky start (a 4x4 diagonal that
+        dead-ends, an early wrong branch on 25x25) is cheaper to redo than
+        to search out of.
+        """
+        while True:
+            board = [[0] * self.size for _ in range(self.size)]
+            for i in range(0, self.size, self.box_size):
+                self._fill_box(board, i, i, rng)
+            if self.engine.search(board, max_nodes=FILL_NODES_PER_CELL * self.size * self.size, rng=rng):
+                return board
+    
+    def _fill_box(self, board, row, col, rng=random):
+        """Fill a box with random numbers"""
+        numbers = list(range(1, self.size + 1))
+        rng.shuffle(numbers)
         
         for i in range(self.box_size):
             for j in range(self.box_size):
                 board[row + i][col + j] = numbers.pop()
     
     def _solve_board(self, board):
-        """Solve the Sudoku board using backtracking"""
-        empty_cell = self._find_empty(board)
-        if not empty_cell:
-            return True
-        
-        row, col = empty_cell
-        
-        for num in range(1, 10):
-            if self._is_valid_move(board, row, col, num):
-                board[row][col] = num
+        """
+        Solve the board in place by backtracking in row-major order, with
+        row, column and box usage kept as bitmasks. The fill order matches
+        the original solver so seeded puzzles are unchanged.
+        """
+        size, box_size = self.size, self.box_size
+        row_used = [0] * size
+        col_used = [0] * size
+        box_used = [0] * size
+        empties = []
+        
+        for r in range(size):
+            for c in range(size):
+                value = board[r][c]
+                b = (r // box_size) * box_size + c // box_size
+                if value == 0:
+                    empties.append((r, c, b))
+                    continue
+                bit = 1 << value
+                if (row_used[r] | col_used[c] | box_used[b]) & bit:
+                    return False
+                row_used[r] |= bit
+                col_used[c] |= bit
+                box_used[b] |= bit
+        
+        def search(index):
+            if index == len(empties):
+                return True
+            r, c, b = empties[index]
+            candidates = self.full_mask & ~(row_used[r] | col_used[c] | box_used[b])
+            while candidates:
+                bit = candidates & -candidates  # Lowest number first
+                candidates ^= bit
+                board[r][c] = bit.bit_length() - 1
+                row_used[r] |= bit
+                col_used[c] |= bit
+                box_used[b] |= bit
                 
-                if self._solve_board(board):
+                if search(index + 1):
                     return True
                 
-                board[row][col] = 0
-        
-        return False
-    
-    def _find_empty(self, board):
-        """Find an empty cell in the board"""
-        for i in range(self.size):
-            for j in range(self.size):
-                if board[i][j] == 0:
-                    return (i, j)
-        return None
-    
-    def _is_valid_move(self, board, row, col, num):
-        """Check if placing num at (row, col) is valid"""
-        # Check row
-        for j in range(self.size):
-            if board[row][j] == num:
-                return False
-        
-        # Check column
-        for i in range(self.size):
-            if board[i][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row = (row // self.box_size) * self.box_size
-        box_col = (col // self.box_size) * self.box_size
+                row_used[r] ^= bit
+                col_used[c] ^= bit
+                box_used[b] ^= bit
+            board[r][c] = 0
+            return False
         
-        for i in range(box_row, box_row + self.box_size):
-            for j in range(box_col, box_col + self.box_size):
-                if board[i][j] == num:
-                    return False
-        
-        return True
+        return search(0)
     
-    def _create_puzzle_from_solution(self, solution, difficulty):
+    def _create_puzzle_from_solution(self, solution, difficulty, rng=random):
         """Create a puzzle by removing numbers from the solution"""
-        puzzle = copy.deepcopy(solution)
-        
-        # Define number of cells to remove based on difficulty
-        difficulty_levels = {
-            'easy': 30,      # Remove 30 numbers
-            'medium': 40,    # Remove 40 numbers
-            'hard': 50,      # Remove 50 numbers
-            'expert': 60     # Remove 60 numbers
-        }
+        puzzle = [row[:] for row in solution]
         
-        cells_to_remove = difficulty_levels.get(difficulty, 40)
+        # Number of cells to remove scales with the board's cell count
+        removal = DIFFICULTY_REMOVAL.get(difficulty, DIFFICULTY_REMOVAL['medium'])
+        cells_to_remove = round(removal * self.size * self.size)
         
         # Randomly remove cells
         positions = [(i, j) for i in range(self.size) for j in range(self.size)]
-        random.shuffle(positions)
+        rng.shuffle(positions)
         
         for i, j in positions[:cells_to_remove]:
             puzzle[i][j] = 0
         
         return puzzle
     
-    def solve(self, board):
+    def solve(self, board, max_nodes=None):
         """
-        Solve a Sudoku puzzle
+        Solve a Sudoku puzzle, searching at most max_nodes positions if set
         Returns: solved board or None if unsolvable
+        Raises: SearchLimitReached if the search gave up
         """
-        board_copy = copy.deepcopy(board)
+        board_copy = [row[:] for row in board]
         
-        if self._solve_board(board_copy):
+        result = self.engine.search(board_copy, max_nodes)
+        if result is None:
+            raise SearchLimitReached(f'No answer within {max_nodes} nodes')
+        if result:
             return board_copy
         return None
     
+    def count_solutions(self, board, limit=2):
+        """
+        Count the board's solutions by backtracking on the empty cell with
+        the fewest candidates, stopping once limit are found (2 tells a
+        unique puzzle from an ambiguous one)
+        Returns: number of solutions, at most limit
+        """
+        size, box_size = self.size, self.box_size
+        row_used = [0] * size
+        col_used = [0] * size
+        box_used = [0] * size
+        empties = []
+        
+        for r in range(size):
+            for c in range(size):
+                value = board[r][c]
+                b = (r // box_size) * box_size + c // box_size
+                if value == 0:
+                    empties.append((r, c, b))
+                    continue
+                bit = 1 << value
+                if (row_used[r] | col_used[c] | box_used[b]) & bit:
+                    return 0
+                row_used[r] |= bit
+                col_used[c] |= bit
+                box_used[b] |= bit
+        
+        def search(remaining, limit):
+            # empties[:remaining] are still open
+            if not remaining:
+                return 1
+            best, fewest, best_mask = 0, size + 1, 0
+            for index in range(remaining):
+                r, c, b = empties[index]
+                mask = self.full_mask & ~(row_used[r] | col_used[c] | box_used[b])
+                count = bin(mask).count('1')
+                if count < fewest:
+                    best, fewest, best_mask = index, count, mask
+                    if count <= 1:
+                        break
+            if not fewest:
+                return 0
+            
+            empties[best], empties[remaining - 1] = empties[remaining - 1], empties[best]
+            r, c, b = empties[remaining - 1]
+            found = 0
+            while best_mask and found < limit:
+                bit = best_mask & -best_mask
+                best_mask ^= bit
+                row_used[r] |= bit
+                col_used[c] |= bit
+                box_used[b] |= bit
+                found += search(remaining - 1, limit - found)
+                row_used[r] ^= bit
+                col_used[c] ^= bit
+                box_used[b] ^= bit
+            return found
+        
+        return search(len(empties), limit)
+    
+    def grade_puzzle(self, puzzle):
+        """
+        Grade a puzzle by the hardest technique needed to solve it without
+        guessing, always applying the simplest one that makes progress:
+        1 naked singles, 2 hidden singles, 3 locked candidates (a number
+        confined to where a box meets a row or column), 4 anything harder
+        Returns: grade 1-4
+        """
+        size = self.size
+        units, peers = get_tables(self.box_size)
+        units = [[r * size + c for r, c in unit] for unit in units]
+        peers = [[r * size + c for r, c in cells] for row in peers for cells in row]
+        cells = [value for row in puzzle for value in row]
+        candidates = [0] * (size * size)
+        for index, value in enumerate(cells):
+            if not value:
+                used = 0
+                for peer in peers[index]:
+                    used |= 1 << cells[peer]
+                candidates[index] = self.full_mask & ~used
+        
+        # Where each box meets each row or column: (overlap, rest of box, rest of line)
+        overlaps = []
+        for box in units[2 * size:]:
+            for line in units[:2 * size]:
+                overlap = set(box) & set(line)
+                if overlap:
+                    overlaps.append((tuple(overlap), [i for i in box if i not in overlap],
+                                     [i for i in line if i not in overlap]))
+        
+        def place(index, value):
+            cells[index] = value
+            candidates[index] = 0
+            keep = ~(1 << value)
+            for peer in peers[index]:
+                candidates[peer] &= keep
+        
+        def hidden_single():
+            for unit in units:
+                once = twice = 0
+                for index in unit:
+                    twice |= once & candidates[index]
+                    once |= candidates[index]
+                only = once & ~twice
+                if only:
+                    bit = only & -only
+                    return next(index for index in unit if candidates[index] & bit), bit.bit_length() - 1
+            return None
+        
+        def eliminate_locked():
+            # A number confined to the overlap within the box leaves the rest
+            # of the line, and one confined to it within the line leaves the rest of the box
+            eliminated = False
+            for overlap, box_rest, line_rest in overlaps:
+                in_overlap = in_box = in_line = 0
+                for index in overlap:
+                    in_overlap |= candidates[index]
+                for index in box_rest:
+                    in_box |= candidates[index]
+                for index in line_rest:
+                    in_line |= candidates[index]
+                for rest, locked in ((line_rest, in_overlap & ~in_box), (box_rest, in_overlap & ~in_line)):
+                    for index in rest:
+                        if candidates[index] & locked:
+                            candidates[index] &= ~locked
+                            eliminated = True
+            return eliminated
+        
+        grade = 1
+        while 0 in cells:
+            naked = next((index for index, mask in enumerate(candidates)
+                          if mask and not mask & (mask - 1)), None)
+            if naked is not None:
+                place(naked, candidates[naked].bit_length() - 1)
+                continue
+            hidden = hidden_single()
+            if hidden:
+                grade = max(grade, 2)
+                place(*hidden)
+                continue
+            if eliminate_locked():
+                grade = 3
+                continue
+            return 4
+        return grade
+    
     def is_valid_board(self, board):
         """
         Check if the current board state is valid (no conflicts)
         Returns: True if valid, False otherwise
         """
-        # Check rows
-        for row in board:
-            numbers = [x for x in row if x != 0]
-            if len(numbers) != len(set(numbers)):
-                return False
-        
-        # Check columns
-        for col in range(self.size):
-            numbers = [board[row][col] for row in range(self.size) if board[row][col] != 0]
-            if len(numbers) != len(set(numbers)):
-                return False
-        
-        # Check 3x3 boxes
-        for box_row in range(0, self.size, self.box_size):
-            for box_col in range(0, self.size, self.box_size):
-                numbers = []
-                for i in range(box_row, box_row + self.box_size):
-                    for j in range(box_col, box_col + self.box_size):
-                        if board[i][j] != 0:
-                            numbers.append(board[i][j])
-                if len(numbers) != len(set(numbers)):
-                    return False
-        
-        return True
+        return self.engine.is_valid_board(board)
     
     def is_complete(self, board):
         """
@@ -188,60 +874,21 @@ class SudokuSolver:
         Get available numbers for a specific cell
         Returns: list of available numbers
         """
-        available = []
-        for num in range(1, 10):
-            if self._is_valid_move(board, row, col, num):
-                available.append(num)
-        return available
+        return self.engine.available_numbers(board, row, col)
     
     def is_valid_move(self, board, row, col, num):
         """
         Check if placing num at (row, col) is valid
         Returns: True if valid, False otherwise
         """
-        return self._is_valid_move(board, row, col, num)
+        return self.engine.is_valid_move(board, row, col, num)
     
     def get_validation_details(self, board):
         """
         Get detailed validation information for the board
         Returns: dictionary with validation details
         """
-        details = {
-            'rows_valid': True,
-            'columns_valid': True,
-            'boxes_valid': True,
-            'conflicts': []
-        }
-        
-        # Check rows
-        for row_idx, row in enumerate(board):
-            numbers = [x for x in row if x != 0]
-            if len(numbers) != len(set(numbers)):
-                details['rows_valid'] = False
-                details['conflicts'].append(f'Row {row_idx + 1} has duplicate numbers')
-        
-        # Check columns
-        for col_idx in range(self.size):
-            numbers = [board[row][col_idx] for row in range(self.size) if board[row][col_idx] != 0]
-            if len(numbers) != len(set(numbers)):
-                details['columns_valid'] = False
-                details['conflicts'].append(f'Column {col_idx + 1} has duplicate numbers')
-        
-        # Check 3x3 boxes
-        for box_row in range(0, self.size, self.box_size):
-            for box_col in range(0, self.size, self.box_size):
-                numbers = []
-                for i in range(box_row, box_row + self.box_size):
-                    for j in range(box_col, box_col + self.box_size):
-                        if board[i][j] != 0:
-                            numbers.append(board[i][j])
-                if len(numbers) != len(set(numbers)):
-                    details['boxes_valid'] = False
-                    box_num = (box_row // self.box_size) * 3 + (box_col // self.box_size) + 1
-                    details['conflicts'].append(f'Box {box_num} has duplicate numbers')
-        
-        details['is_valid'] = details['rows_valid'] and details['columns_valid'] and details['boxes_valid']
-        return details
+        return self.engine.validation_details(board)
     
     def get_puzzle_difficulty_rating(self, puzzle):
         """
@@ -251,9 +898,9 @@ class SudokuSolver:
         # This is a simplified difficulty calculation
         # In a real implementation, you'd analyze the solving techniques required
         
-        empty_cells = sum(1 for row in puzzle for cell in row if cell == 0)
+        # Base difficulty on empty cells, scaled to a 9x9 board
+        empty_cells = sum(1 for row in puzzle for cell in row if cell == 0) * 81 / (len(puzzle) ** 2)
         
-        # Base difficulty on empty cells
         if empty_cells <= 30:
             return 1  # Very Easy
         elif empty_cells <= 40:
@@ -284,4 +931,15 @@ class SudokuSolver:
         elif len(available) <= 3:
             hints.append(f"Only {', '.join(map(str, available))} can go in this cell")
         
-        return hints 
\ No newline at end of file
+        return hints
+
+if __name__ == '__main__':
+    import sys
+    
+    if '--write-tables' in sys.argv:
+        write_tables_module()
+        print('Wrote sudoku_tables.py')
+    
+    if '--write-seeds' in sys.argv:
+        write_seeds_module()
+        print('Wrote sudoku_seeds.py')
@@ -0,0 +1,10 @@
+"""
+Precomputed units and peers for the 9x9 board as flat cell indices.
+Generated by `python sudoku_solver.py --write-tables`; do not edit.
+"""
+
+BOX_SIZE = 3
+
+UNITS_HEX = '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f202122232425262728292a2b2c2d2e2f303132333435363738393a3b3c3d3e3f404142434445464748494a4b4c4d4e4f500009121b242d363f48010a131c252e374049020b141d262f38414a030c151e273039424b040d161f28313a434c050e172029323b444d060f18212a333c454e071019222b343d464f08111a232c353e4750000102090a0b1213140304050c0d0e1516170607080f101118191a1b1c1d2425262d2e2f1e1f202728293031322122232a2b2c3334353637383f404148494a393a3b4243444b4c4d3c3d3e4546474e4f50'
+
+PEERS_HEX = '0102030405060708090a0b1213141b242d363f480002030405060708090a0b1213141c252e3740490001030405060708090a0b1213141d262f38414a00010204050607080c0d0e1516171e273039424b00010203050607080c0d0e1516171f28313a434c00010203040607080c0d0e1516172029323b444d00010203040507080f101118191a212a333c454e00010203040506080f101118191a222b343d464f00010203040506070f101118191a232c353e47500001020a0b0c0d0e0f10111213141b242d363f48000102090b0c0d0e0f10111213141c252e374049000102090a0c0d0e0f10111213141d262f38414a030405090a0b0d0e0f10111516171e273039424b030405090a0b0c0e0f10111516171f28313a434c030405090a0b0c0d0f10111516172029323b444d060708090a0b0c0d0e101118191a212a333c454e060708090a0b0c0d0e0f1118191a222b343d464f060708090a0b0c0d0e0f1018191a232c353e4750000102090a0b131415161718191a1b242d363f48000102090a0b121415161718191a1c252e374049000102090a0b121315161718191a1d262f38414a0304050c0d0e121314161718191a1e273039424b0304050c0d0e121314151718191a1f28313a434c0304050c0d0e121314151618191a2029323b444d0607080f1011121314151617191a212a333c454e0607080f1011121314151617181a222b343d464f0607080f10111213141516171819232c353e47500009121c1d1e1f202122232425262d2e2f363f48010a131b1d1e1f202122232425262d2e2f374049020b141b1c1e1f202122232425262d2e2f38414a030c151b1c1d1f2021222327282930313239424b040d161b1c1d1e202122232728293031323a434c050e171b1c1d1e1f2122232728293031323b444d060f181b1c1d1e1f2022232a2b2c3334353c454e0710191b1c1d1e1f2021232a2b2c3334353d464f08111a1b1c1d1e1f2021222a2b2c3334353e47500009121b1c1d25262728292a2b2c2d2e2f363f48010a131b1c1d24262728292a2b2c2d2e2f374049020b141b1c1d24252728292a2b2c2d2e2f38414a030c151e1f2024252628292a2b2c30313239424b040d161e1f2024252627292a2b2c3031323a434c050e171e1f2024252627282a2b2c3031323b444d060f182122232425262728292b2c3334353c454e0710192122232425262728292a2c3334353d464f08111a2122232425262728292a2b3334353e47500009121b1c1d2425262e2f303132333435363f48010a131b1c1d2425262d2f303132333435374049020b141b1c1d2425262d2e30313233343538414a030c151e1f202728292d2e2f313233343539424b040d161e1f202728292d2e2f30323334353a434c050e171e1f202728292d2e2f30313334353b444d060f182122232a2b2c2d2e2f30313234353c454e0710192122232a2b2c2d2e2f30313233353d464f08111a2122232a2b2c2d2e2f30313233343e47500009121b242d3738393a3b3c3d3e3f404148494a010a131c252e3638393a3b3c3d3e3f404148494a020b141d262f3637393a3b3c3d3e3f404148494a030c151e27303637383a3b3c3d3e4243444b4c4d040d161f2831363738393b3c3d3e4243444b4c4d050e17202932363738393a3c3d3e4243444b4c4d060f18212a33363738393a3b3d3e4546474e4f50071019222b34363738393a3b3c3e4546474e4f5008111a232c35363738393a3b3c3d4546474e4f500009121b242d363738404142434445464748494a010a131c252e3637383f4142434445464748494a020b141d262f3637383f4042434445464748494a030c151e2730393a3b3f404143444546474b4c4d040d161f2831393a3b3f404142444546474b4c4d050e17202932393a3b3f404142434546474b4c4d060f18212a333c3d3e3f404142434446474e4f50071019222b343c3d3e3f404142434445474e4f5008111a232c353c3d3e3f404142434445464e4f500009121b242d3637383f4041494a4b4c4d4e4f50010a131c252e3637383f4041484a4b4c4d4e4f50020b141d262f3637383f404148494b4c4d4e4f50030c151e2730393a3b42434448494a4c4d4e4f50040d161f2831393a3b42434448494a4b4d4e4f50050e17202932393a3b42434448494a4b4c4e4f50060f18212a333c3d3e45464748494a4b4c4d4f50071019222b343c3d3e45464748494a4b4c4d4e5008111a232c353c3d3e45464748494a4b4c4d4e4f'
@@ -0,0 +1,254 @@
+import random
+from functools import lru_cache
+
+from sudoku_solver import ConstraintEngine, SudokuSolver, get_solver
+
+# Variant rule sets, all on 9x9 boards
+VARIANTS = ('diagonal', 'windoku', 'jigsaw', 'killer')
+SIZE = 9
+
+# Jigsaw region layouts, 81 region numbers each row by row, from
+# random_jigsaw_regions() and checked to have solutions (regenerate with
+# `python sudoku_variants.py --new-layouts 8`). Each is also dealt in its
+# eight rotations and reflections.
+JIGSAW_LAYOUTS = (
+    '001111122000012222330114225300414255333444555633748855663744885677777788666667888',
+    '000111222000133222040133252044113255644113557664333557644488577688888577666688777',
+    '001111122001311222001333242000532244555534444666533744665537777666588887688888777',
+    '000000011022220113444211133444255113422253333445555563775786666777788886778888666',
+    '000001222011001322011111332444455322445556323744566333745556888777666688777768888',
+    '001111122001013222400013222444013323454453333455555556477778886778888886777666666',
+    '000000011222020111222223331444445311444545331655555333657777778667788788666668888',
+    '000011122001111222003114222053334424655533444655553347658873747666877777666888888',
+)
+
+# Top-left corners of the four extra windoku boxes
+WINDOWS = ((1, 1), (1, 5), (5, 1), (5, 5))
+
+# Node cap per attempt when filling an empty board
+FILL_MAX_NODES = 400
+
+
+def variant_units(name, regions=None):
+    """
+    The units of a variant: rows, columns and boxes (or jigsaw regions),
+    plus diagonals or windows
+    Returns: list of (kind, cells)
+    """
+    units = [('row', [(r, c) for c in range(SIZE)]) for r in range(SIZE)]
+    units += [('column', [(r, c) for r in range(SIZE)]) for c in range(SIZE)]
+
+    if name == 'jigsaw':
+        cells = {}
+        for r in range(SIZE):
+            for c in range(SIZE):
+                cells.setdefault(regions[r][c], []).append((r, c))
+        units += [('region', cells[region]) for region in sorted(cells)]
+    else:
+        units += [('box', [(r, c) for r in range(br, br + 3) for c in range(bc, bc + 3)])
+                  for br in range(0, SIZE, 3) for bc in range(0, SIZE, 3)]
+
+    if name == 'diagonal':
+        units.append(('diagonal', [(i, i) for i in range(SIZE)]))
+        units.append(('diagonal', [(i, SIZE - 1 - i) for i in range(SIZE)]))
+    elif name == 'windoku':
+        units += [('window', [(r, c) for r in range(wr, wr + 3) for c in range(wc, wc + 3)])
+                  for wr, wc in WINDOWS]
+    return units
+
+
+def variant_key(variant):
+    """Hashable form of a variant spec"""
+    regions = variant.get('regions')
+    cages = variant.get('cages')
+    return (
+        variant['name'],
+        tuple(tuple(row) for row in regions) if regions else None,
+        tuple((tuple(tuple(cell) for cell in cage['cells']), cage['sum']) for cage in cages) if cages else None
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compile(key):
+    name, regions, cages = key
+    return VariantSolver(name, ConstraintEngine(SIZE, variant_units(name, regions), cages or ()))
+
+
+def get_variant_solver(variant):
+    """
+    Get the solver for a game's variant spec, compiled once per distinct
+    spec (jigsaw layouts and killer cages differ between puzzles)
+    Returns: VariantSolver
+    """
+    return _compile(variant_key(variant))
+
+
+class VariantSolver(SudokuSolver):
+    """
+    Solver for one compiled variant. Checks and solving already go through
+    the engine; only filling a new board differs, since the classic fill
+    relies on the box structure.
+    """
+
+    def __init__(self, name, engine):
+        super().__init__(3, engine)
+        self.name = name
+
+    def _create_solved_board(self, rng=random):
+        """Fill an empty board under the variant's rules in random order"""
+        # Short fresh attempts: one unlucky early branch on an empty jigsaw
+        # board can otherwise take seconds to search out of
+        while True:
+            board = [[0] * SIZE for _ in range(SIZE)]
+            if self.engine.search(board, max_nodes=FILL_MAX_NODES, rng=rng):
+                return board
+
+
+def random_jigsaw_regions(rng=random, swaps=400, max_nodes=20000):
+    """
+    Grow a jigsaw layout from the 3x3 boxes by swapping cells between
+    neighbouring regions while both stay connected, until the layout both
+    looks irregular and can be filled
+    Returns: 9x9 list of region numbers
+    """
+    neighbours = lambda r, c: [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                               if 0 <= r + dr < SIZE and 0 <= c + dc < SIZE]
+
+    def connected(regions, region):
+        cells = [(r, c) for r in range(SIZE) for c in range(SIZE) if regions[r][c] == region]
+        seen, stack = {cells[0]}, [cells[0]]
+        while stack:
+            for cell in neighbours(*stack.pop()):
+                if cell not in seen and regions[cell[0]][cell[1]] == region:
+                    seen.add(cell)
+                    stack.append(cell)
+        return len(seen) == len(cells)
+
+    while True:
+        regions = [[(r // 3) * 3 + c // 3 for c in range(SIZE)] for r in range(SIZE)]
+        for _ in range(swaps):
+            # Move a border cell of region a into b, and a border cell of b into a
+            r, c = rng.randrange(SIZE), rng.randrange(SIZE)
+            a = regions[r][c]
+            options = [regions[i][j] for i, j in neighbours(r, c) if regions[i][j] != a]
+            if not options:
+                continue
+            b = rng.choice(options)
+            back = [(i, j) for i in range(SIZE) for j in range(SIZE)
+                    if regions[i][j] == b and (i, j) != (r, c)
+                    and any(regions[x][y] == a and (x, y) != (r, c) for x, y in neighbours(i, j))]
+            if not back:
+                continue
+            i, j = rng.choice(back)
+            regions[r][c], regions[i][j] = b, a
+            if not (connected(regions, a) and connected(regions, b)):
+                regions[r][c], regions[i][j] = a, b
+
+        engine = ConstraintEngine(SIZE, variant_units('jigsaw', regions))
+        board = [[0] * SIZE for _ in range(SIZE)]
+        if engine.search(board, max_nodes=max_nodes, rng=rng):
+            return _renumber(regions)
+
+
+def _renumber(regions):
+    """Number regions in order of first appearance"""
+    numbers = {}
+    return [[numbers.setdefault(region, len(numbers)) for region in row] for row in regions]
+
+
+def _jigsaw_regions(rng=random):
+    """One of the frozen layouts, rotated and/or reflected at random"""
+    layout = rng.choice(JIGSAW_LAYOUTS)
+    regions = [[int(layout[r * SIZE + c]) for c in range(SIZE)] for r in range(SIZE)]
+    for _ in range(rng.randrange(4)):
+        regions = [list(row) for row in zip(*regions[::-1])]  # Rotate 90 degrees
+    if rng.random() < 0.5:
+        regions = [list(row) for row in zip(*regions)]
+    return _renumber(regions)
+
+
+def _killer_cages(solution, rng=random):
+    """
+    Cut a solution into cages of 2-5 connected cells with no repeated
+    number; a cell left on its own joins a neighbouring cage if it can
+    Returns: list of {'cells': [[row, col], ...], 'sum': total}
+    """
+    neighbours = lambda r, c: [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                               if 0 <= r + dr < SIZE and 0 <= c + dc < SIZE]
+    cells = [(r, c) for r in range(SIZE) for c in range(SIZE)]
+    rng.shuffle(cells)
+    cage_of = {}
+    cages = []
+
+    for start in cells:
+        if start in cage_of:
+            continue
+        cage = [start]
+        cage_of[start] = len(cages)
+        target = rng.choice((2, 2, 3, 3, 3, 4, 4, 5))
+        while len(cage) < target:
+            digits = {solution[r][c] for r, c in cage}
+            frontier = [cell for r, c in cage for cell in neighbours(r, c)
+                        if cell not in cage_of and solution[cell[0]][cell[1]] not in digits]
+            if not frontier:
+                break
+            cell = rng.choice(frontier)
+            cage_of[cell] = len(cages)
+            cage.append(cell)
+        cages.append(cage)
+
+    for index, cage in enumerate(cages):
+        if len(cage) != 1:
+            continue
+        r, c = cage[0]
+        for cell in neighbours(r, c):
+            other = cages[cage_of[cell]]
+            if len(other) > 1 and solution[r][c] not in {solution[i][j] for i, j in other}:
+                other.append((r, c))
+                cage_of[(r, c)] = cage_of[cell]
+                cages[index] = []
+                break
+
+    cages = sorted(sorted(cage) for cage in cages if cage)
+    return [{'cells': [[r, c] for r, c in cage], 'sum': sum(solution[r][c] for r, c in cage)}
+            for cage in cages]
+
+
+def generate_variant_puzzle(name, difficulty='medium', rng=random):
+    """
+    Generate a puzzle of a variant, drawing randomness from rng
+    Returns: (puzzle, solution, variant) where variant is the JSON-ready
+    spec clients need to draw it (jigsaw regions, killer cages)
+    """
+    if name == 'killer':
+        # Cages are cut from a classic solution, so every puzzle has its own
+        puzzle, solution = get_solver(SIZE).generate_puzzle(difficulty, rng)
+        return puzzle, solution, {'name': name, 'cages': _killer_cages(solution, rng)}
+
+    variant = {'name': name}
+    if name == 'jigsaw':
+        variant['regions'] = _jigsaw_regions(rng)
+    puzzle, solution = get_variant_solver(variant).generate_puzzle(difficulty, rng)
+    return puzzle, solution, variant
+
+
+def generate_variant_puzzle_with_seed(name, seed, difficulty='medium'):
+    """
+    Generate a variant puzzle with a specific seed for reproducibility
+    Returns: (puzzle, solution, variant)
+    """
+    import hashlib  # Only needed for seeded puzzles
+
+    seed_hash = int(hashlib.md5(f'{name}:{seed}'.encode()).hexdigest(), 16)
+    return generate_variant_puzzle(name, difficulty, random.Random(seed_hash))
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--new-layouts' in sys.argv:
+        count = int(sys.argv[sys.argv.index('--new-layouts') + 1])
+        rng = random.Random()
+        for _ in range(count):
+            regions = random_jigsaw_regions(rng)
+            print(f"    {''.join(str(region) for row in regions for region in row)!r},")
@@ -5,9 +5,10 @@ Optimized for serverless deployment
 """
 
 import os
-import sys
 from flask import Flask, render_template, request, jsonify
-from sudoku_solver import SudokuSolver
+from sudoku_solver import SudokuSolver, SearchLimitReached
+from solve_cache import SolveCache
+from static_assets import StaticAssets
 
 # Create Flask app
 app = Flask(__name__)
@@ -16,9 +17,19 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['FLASK_ENV'] = os.environ.get('FLASK_ENV', 'production')
 
+# Vercel routes static files through the app too: serve the fingerprinted,
+# precompressed build with immutable caching
+static_assets = StaticAssets(app)
+
 # Initialize Sudoku solver
 solver = SudokuSolver()
 
+# Warm instances reuse solutions of equivalent (relabelled, permuted) puzzles
+solve_cache = SolveCache(max_entries=1024)
+
+# Search cap for client-supplied puzzles, as in app.py
+SOLVE_MAX_NODES = int(os.environ.get('SOLVE_MAX_NODES', 50000))
+
 @app.route('/')
 def index():
     """Main game page"""
@@ -84,7 +95,14 @@ def solve_puzzle():
             return jsonify({'success': False, 'error': 'Puzzle data required'}), 400
         
         puzzle = data['puzzle']
-        solution = solver.solve(puzzle)
+        try:
+            solution = solve_cache.solve(solver, puzzle, max_nodes=SOLVE_MAX_NODES)
+        except SearchLimitReached:
+            return jsonify({
+                'success': False,
+                'gave_up': True,
+                'error': 'Gave up before finding a solution'
+            }), 422
         
         if solution:
             return jsonify({
@@ -118,7 +136,7 @@ def get_hint():
             for j in range(9):
                 if board[i][j] == 0:  # Empty cell
                     # Get the solution for this cell
-                    solution = solver.solve(puzzle)
+                    solution = solve_cache.solve(solver, puzzle, max_nodes=SOLVE_MAX_NODES)
                     if solution and solution[i][j] != 0:
                         return jsonify({
                             'success': True,